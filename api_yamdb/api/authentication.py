@@ -0,0 +1,82 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+
+from users.tokens import (VERSION_CLAIM, has_user_claims, token_version,
+                          user_from_claims)
+
+
+class VerifiedTokenCache:
+    """Проверенные токены процесса с вытеснением давно не нужных (LRU).
+
+    Ключ — SHA-256 токена, чтобы не держать в памяти сами токены. Запись
+    действует до времени exp токена.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key, now):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            expires, token = entry
+            if expires <= now:
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return token
+
+    def put(self, key, expires, token):
+        if self.size < 1:
+            return
+        with self.lock:
+            self.entries[key] = (expires, token)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.size:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """JWT-аутентификация без запроса пользователя из базы.
+
+    Пользователь собирается из утверждений токена users.tokens, а отзыв
+    проверяется по версии токенов в кеше. Токены без этих утверждений
+    (например, выданные AccessToken.for_user) проверяются как обычно, с
+    загрузкой пользователя из базы. Подпись и срок действия токена
+    проверяются один раз, дальше токен берётся из verified_tokens; отзыв
+    по версии проверяется при каждом запросе.
+    """
+
+    verified_tokens = VerifiedTokenCache(settings.JWT_VERIFIED_TOKENS_SIZE)
+
+    def get_validated_token(self, raw_token):
+        key = hashlib.sha256(raw_token).digest()
+        token = self.verified_tokens.get(key, time.time())
+        if token is None:
+            token = super().get_validated_token(raw_token)
+            self.verified_tokens.put(key, token['exp'], token)
+        return token
+
+    def get_user(self, validated_token):
+        if not has_user_claims(validated_token):
+            return super().get_user(validated_token)
+        user_id = validated_token[api_settings.USER_ID_CLAIM]
+        if validated_token[VERSION_CLAIM] != token_version(user_id):
+            raise AuthenticationFailed(
+                'Токен отозван.', code='token_revoked'
+            )
+        return user_from_claims(validated_token)
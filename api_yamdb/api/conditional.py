@@ -0,0 +1,53 @@
+"""Условные GET-запросы по версиям данных (см. reviews.cache).
+
+ETag и Last-Modified вычисляются по версиям наборов данных, из которых
+собирается ответ, до обращения к базе. Если клиент прислал совпадающий
+If-None-Match или не устаревший If-Modified-Since, возвращается 304 без
+выборки и сериализации данных.
+"""
+import hashlib
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+from reviews.cache import versions
+
+NANOSECONDS = 10 ** 9
+
+
+class ConditionalMixin:
+    """Условная обработка GET-запросов.
+
+    Представление перечисляет версии, от которых зависит ответ, в
+    get_version_names; None отключает условную обработку запроса.
+    """
+
+    def get_version_names(self):
+        raise NotImplementedError
+
+    def conditional(self, handler, request, *args, **kwargs):
+        names = self.get_version_names()
+        if names is None:
+            return handler(request, *args, **kwargs)
+        tokens = versions(names)
+        # Ответ зависит и от адреса с параметрами, и от формата вывода.
+        etag = quote_etag(hashlib.md5('|'.join((
+            request.build_absolute_uri(), request.accepted_renderer.format,
+            *map(str, tokens),
+        )).encode('utf-8')).hexdigest())
+        last_modified = max(tokens) // NANOSECONDS
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            response = handler(request, *args, **kwargs)
+        if response.status_code in (200, 304):
+            response['ETag'] = etag
+            response['Last-Modified'] = http_date(last_modified)
+        return response
+
+
+class ConditionalListMixin(ConditionalMixin):
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional(super().list, request, *args, **kwargs)
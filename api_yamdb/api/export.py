@@ -0,0 +1,125 @@
+"""Выгрузка каталога в NDJSON: по объекту JSON на строку.
+
+Строки читаются пачками по первичному ключу (WHERE id > последний
+LIMIT n), поэтому память не растёт с размером каталога. Вся выгрузка
+идёт в одной транзакции и видит одно состояние базы: в PostgreSQL —
+уровень изоляции REPEATABLE READ, в SQLite — одна читающая транзакция
+(в режиме журнала WAL она не мешает записи, в режиме по умолчанию
+запись ждёт окончания выгрузки).
+"""
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from rest_framework.fields import DateTimeField
+
+from api.renderers import FastJSONRenderer
+from reviews.models import Category, Genre, GenreTitle, Review, Title
+
+CONTENT_TYPE = 'application/x-ndjson'
+
+
+@contextmanager
+def snapshot(using=DEFAULT_DB_ALIAS):
+    """Транзакция только для чтения, все запросы которой видят один снимок
+    базы."""
+    with transaction.atomic(using=using):
+        connection = connections[using]
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    'SET TRANSACTION ISOLATION LEVEL REPEATABLE READ, '
+                    'READ ONLY'
+                )
+        yield
+
+
+def batches(queryset, size):
+    """Строки queryset.values() пачками по возрастанию первичного ключа."""
+    queryset = queryset.order_by('pk')
+    batch = list(queryset[:size])
+    while batch:
+        yield batch
+        batch = list(queryset.filter(pk__gt=batch[-1]['id'])[:size])
+
+
+def name_slug(instance):
+    return {'name': instance.name, 'slug': instance.slug}
+
+
+def title_records(size):
+    # Категории и жанры читаются в том же снимке, что и произведения, а
+    # не из справочников процесса.
+    categories = {
+        category.pk: name_slug(category) for category in Category.objects.all()
+    }
+    genres = {genre.pk: genre for genre in Genre.objects.all()}
+    fields = (
+        'id', 'name', 'year', 'description', 'category_id', 'score_sum',
+        'score_count',
+    )
+    for batch in batches(Title.objects.values(*fields), size):
+        title_genres = {}
+        for title_id, genre_id in GenreTitle.objects.filter(
+            title_id__in=[title['id'] for title in batch]
+        ).values_list('title_id', 'genre_id'):
+            title_genres.setdefault(title_id, []).append(genres[genre_id])
+        for title in batch:
+            count = title['score_count']
+            yield {
+                'type': 'title',
+                'id': title['id'],
+                'name': title['name'],
+                'year': title['year'],
+                'rating': int(title['score_sum'] / count) if count else None,
+                'description': title['description'],
+                'genre': [
+                    name_slug(genre) for genre in sorted(
+                        title_genres.get(title['id'], ()),
+                        key=lambda genre: genre.name,
+                    )
+                ],
+                'category': categories.get(title['category_id']),
+            }
+
+
+def review_records(size):
+    pub_date = DateTimeField()
+    reviews = Review.objects.values(
+        'id', 'title_id', 'text', 'author__username', 'score', 'pub_date'
+    )
+    for batch in batches(reviews, size):
+        for review in batch:
+            yield {
+                'type': 'review',
+                'id': review['id'],
+                'title': review['title_id'],
+                'text': review['text'],
+                'author': review['author__username'],
+                'score': review['score'],
+                'pub_date': pub_date.to_representation(review['pub_date']),
+            }
+
+
+def export_catalogue(include_reviews=False):
+    """Произведения, затем (по запросу) отзывы — байтовые куски NDJSON.
+
+    Каждый кусок — строки одной пачки; транзакция открывается при чтении
+    первого куска и закрывается после последнего или при закрытии
+    генератора.
+    """
+    size = settings.EXPORT_BATCH_SIZE
+    renderer = FastJSONRenderer()
+    sources = [title_records]
+    if include_reviews:
+        sources.append(review_records)
+    with snapshot():
+        for source in sources:
+            chunk = []
+            for record in source(size):
+                chunk.append(renderer.render(record) + b'\n')
+                if len(chunk) == size:
+                    yield b''.join(chunk)
+                    chunk = []
+            if chunk:
+                yield b''.join(chunk)
@@ -0,0 +1,83 @@
+"""Выборочные поля ответа по параметру ?fields=id,name,rating.
+
+Сериализатор выводит только запрошенные поля, а запрос к базе читает
+только нужные для них колонки и загружает только нужные связи.
+"""
+from rest_framework.exceptions import ValidationError
+
+FIELDS_PARAM = 'fields'
+
+
+class SparseFieldsSerializerMixin:
+    """Сериализатор, оставляющий только поля из аргумента fields."""
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+
+class SparseFieldsMixin:
+    """Поддержка ?fields= в list и retrieve.
+
+    sparse_sources сопоставляет полю ответа колонки модели (связанные —
+    через __, они загружаются select_related); по умолчанию поле
+    читается из одноимённой колонки. sparse_prefetches — связи для
+    prefetch_related, нужные полю. Колонки сортировки загружаются всегда:
+    по ним строится курсор пагинации. Запрос сужается в filter_queryset,
+    чтобы не зависеть от get_queryset представления.
+    """
+
+    sparse_actions = ('list', 'retrieve')
+    sparse_sources = {}
+    sparse_prefetches = {}
+
+    def get_requested_fields(self):
+        value = self.request.query_params.get(FIELDS_PARAM)
+        if self.action not in ('list', 'retrieve') or not value:
+            return None
+        requested = {name.strip() for name in value.split(',')} - {''}
+        available = self.get_serializer_class().Meta.fields
+        unknown = requested - set(available)
+        if unknown:
+            raise ValidationError({FIELDS_PARAM: [
+                f'Неизвестные поля: {", ".join(sorted(unknown))}. '
+                f'Доступны: {", ".join(available)}.'
+            ]})
+        return tuple(name for name in available if name in requested)
+
+    def get_sparse_fields(self):
+        if self.action not in self.sparse_actions:
+            return None
+        return self.get_requested_fields()
+
+    def get_serializer(self, *args, **kwargs):
+        fields = self.get_sparse_fields()
+        if fields is not None:
+            kwargs['fields'] = fields
+        return super().get_serializer(*args, **kwargs)
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        fields = self.get_sparse_fields()
+        if fields is None:
+            return queryset
+        columns = {'pk'}
+        for name in fields:
+            columns.update(self.sparse_sources.get(name, (name,)))
+        ordering = queryset.query.order_by or queryset.model._meta.ordering
+        columns.update(
+            field.lstrip('-') for field in ordering
+            if isinstance(field, str) and '__' not in field
+        )
+        related = {
+            column.rsplit('__', 1)[0] for column in columns if '__' in column
+        }
+        prefetches = [
+            self.sparse_prefetches[name] for name in fields
+            if name in self.sparse_prefetches
+        ]
+        return queryset.select_related(None).select_related(
+            *related
+        ).prefetch_related(None).prefetch_related(*prefetches).only(*columns)
@@ -0,0 +1,21 @@
+from django_filters import rest_framework as filters
+
+from reviews.models import Title
+
+
+class TitleFilter(filters.FilterSet):
+    category = filters.CharFilter(field_name='category__slug')
+    genre = filters.CharFilter(field_name='genre__slug')
+    name = filters.CharFilter(field_name='name', lookup_expr='icontains')
+    # Поиск по подстроке не использует индексы, по началу названия — да.
+    name_prefix = filters.CharFilter(
+        field_name='name', lookup_expr='istartswith'
+    )
+    search = filters.CharFilter(method='search_titles')
+
+    class Meta:
+        model = Title
+        fields = ('category', 'genre', 'name', 'name_prefix', 'year', 'search')
+
+    def search_titles(self, queryset, name, value):
+        return queryset.search(value)
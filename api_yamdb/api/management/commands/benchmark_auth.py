@@ -0,0 +1,75 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test import RequestFactory
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from api.authentication import ClaimsJWTAuthentication, VerifiedTokenCache
+from users.models import User
+from users.tokens import UserAccessToken, user_from_claims
+
+
+def best_time(authentication, request, requests, repeat):
+    """Лучшее среднее время разбора токена на запрос, в микросекундах.
+
+    Замеряются разбор заголовка, проверка токена и сборка пользователя из
+    утверждений; версия токенов и база не участвуют.
+    """
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(requests):
+            raw_token = authentication.get_raw_token(
+                authentication.get_header(request)
+            )
+            user_from_claims(authentication.get_validated_token(raw_token))
+        timings.append((time.perf_counter() - started) / requests)
+    return min(timings) * 10 ** 6
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает время проверки JWT на запрос с кешем проверенных '
+        'токенов и без него.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=10000,
+            help='Сколько запросов с одним токеном обработать за проход.',
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=5,
+            help='Сколько проходов сделать; берётся лучшее время.',
+        )
+
+    def handle(self, *args, **options):
+        if options['requests'] < 1 or options['repeat'] < 1:
+            raise CommandError('--requests и --repeat должны быть больше 0.')
+        user = User(id=1, username='benchmark', role=User.USER)
+        request = RequestFactory().get(
+            '/', HTTP_AUTHORIZATION=f'Bearer {UserAccessToken.for_user(user)}'
+        )
+        caching = ClaimsJWTAuthentication()
+        # Свой кеш, чтобы не трогать общий кеш процесса.
+        caching.verified_tokens = VerifiedTokenCache(1)
+        timings = {
+            name: best_time(
+                authentication, request, options['requests'],
+                options['repeat'],
+            )
+            for name, authentication in (
+                ('Проверка подписи на каждый запрос', JWTAuthentication()),
+                ('Кеш проверенных токенов', caching),
+            )
+        }
+        for name, microseconds in timings.items():
+            self.stdout.write(f'{name}: {microseconds:.1f} мкс на запрос')
+        uncached, cached = timings.values()
+        self.stdout.write(self.style.SUCCESS(
+            f'Ускорение: {uncached / cached:.1f}x'
+        ))
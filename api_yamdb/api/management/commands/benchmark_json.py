@@ -0,0 +1,101 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+
+from api.renderers import FastJSONRenderer
+
+WORDS = (
+    'война', 'мир', 'ночь', 'город', 'река', 'время', 'последний', 'белый',
+    'дорога', 'солнце', 'тайна', 'дом', 'звезда', 'красный', 'осень',
+)
+CATEGORIES = ({'name': 'Фильм', 'slug': 'movie'},
+              {'name': 'Книга', 'slug': 'book'})
+GENRES = tuple(
+    {'name': f'Жанр {number}', 'slug': f'genre-{number}'}
+    for number in range(14)
+)
+
+
+def title_page(size, seed):
+    """Страница ответа /api/v1/titles/ из size произведений."""
+    rnd = random.Random(seed)
+
+    def text(words):
+        return ' '.join(rnd.choices(WORDS, k=words)).capitalize()
+
+    return {
+        'count': size * 100,
+        'next': 'http://testserver/api/v1/titles/?page=3',
+        'previous': 'http://testserver/api/v1/titles/',
+        'results': [
+            {
+                'id': title_id,
+                'name': text(rnd.randint(1, 4)),
+                'year': rnd.randint(1900, 2021),
+                'rating': rnd.choice((None, rnd.randint(1, 10))),
+                'description': text(rnd.randint(10, 60)),
+                'genre': rnd.sample(GENRES, rnd.randint(1, 3)),
+                'category': rnd.choice(CATEGORIES),
+            }
+            for title_id in range(1, size + 1)
+        ],
+    }
+
+
+def best_time(renderer, data, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        renderer.render(data)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает скорость стандартного JSONRenderer и FastJSONRenderer '
+        'на большой странице произведений.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--titles',
+            type=int,
+            default=1000,
+            help='Число произведений на странице.',
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=20,
+            help='Сколько раз рендерить страницу; берётся лучшее время.',
+        )
+        parser.add_argument(
+            '--seed', type=int, default=0, help='Зерно генератора данных.'
+        )
+
+    def handle(self, *args, **options):
+        if options['titles'] < 1 or options['repeat'] < 1:
+            raise CommandError('--titles и --repeat должны быть больше 0.')
+        data = title_page(options['titles'], options['seed'])
+        standard, fast = JSONRenderer(), FastJSONRenderer()
+        body = standard.render(data)
+        if fast.render(data) != body:
+            raise CommandError('Ответы рендереров различаются.')
+        timings = {
+            name: best_time(renderer, data, options['repeat'])
+            for name, renderer in (('JSONRenderer', standard),
+                                   ('FastJSONRenderer', fast))
+        }
+        self.stdout.write(
+            f'Страница: {options["titles"]} произведений, '
+            f'{len(body)} байт.'
+        )
+        for name, seconds in timings.items():
+            self.stdout.write(f'{name}: {seconds * 1000:.2f} мс')
+        self.stdout.write(self.style.SUCCESS(
+            f'Ускорение: '
+            f'{timings["JSONRenderer"] / timings["FastJSONRenderer"]:.1f}x'
+        ))
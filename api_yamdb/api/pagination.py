@@ -0,0 +1,117 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+
+CURSOR_PAGINATION = 'cursor'
+EXACT_COUNT = 'exact'
+CACHED_COUNT = 'cached'
+ESTIMATED_COUNT = 'estimated'
+
+
+def cached_count(queryset):
+    """Точное число строк, закешированное по SQL запроса на короткое время.
+
+    SQL вместе с параметрами однозначно задаёт набор фильтров, поэтому
+    у каждой комбинации фильтров своя запись в кеше.
+    """
+    sql, params = queryset.query.sql_with_params()
+    key = 'pagination-count:' + hashlib.md5(
+        f'{sql}{params!r}'.encode('utf-8')
+    ).hexdigest()
+    count = cache.get(key)
+    if count is None:
+        count = queryset.count()
+        cache.set(key, count, settings.PAGINATION_COUNT_CACHE_TIMEOUT)
+    return count
+
+
+def planner_estimate(queryset):
+    """Оценка числа строк из статистики планировщика PostgreSQL.
+
+    Для остальных СУБД возвращает None.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+def estimated_count(queryset):
+    """Точное число строк до порога, выше порога — оценка.
+
+    Подсчёт до порога идёт по подзапросу с LIMIT и не дороже порога строк.
+    Там, где оценки планировщика нет, используется закешированное точное
+    значение.
+    """
+    threshold = settings.PAGINATION_COUNT_ESTIMATE_THRESHOLD
+    count = queryset.order_by()[:threshold + 1].count()
+    if count <= threshold:
+        return count
+    estimate = planner_estimate(queryset)
+    if estimate is None:
+        return cached_count(queryset)
+    return max(estimate, count)
+
+
+COUNT_STRATEGIES = {
+    EXACT_COUNT: lambda queryset: queryset.count(),
+    CACHED_COUNT: cached_count,
+    ESTIMATED_COUNT: estimated_count,
+}
+
+
+class CountingPaginator(Paginator):
+    """Paginator, считающий строки способом из PAGINATION_COUNT_STRATEGY."""
+
+    @cached_property
+    def count(self):
+        if not hasattr(self.object_list, 'query'):
+            return super().count
+        strategy = COUNT_STRATEGIES[settings.PAGINATION_COUNT_STRATEGY]
+        # Для подсчёта не нужны ни сортировка, ни вычисляемые поля вроде
+        # фрагментов текста в результатах поиска.
+        return strategy(self.object_list.order_by().values('pk'))
+
+
+class CountingPageNumberPagination(PageNumberPagination):
+    django_paginator_class = CountingPaginator
+
+
+class IdCursorPagination(CursorPagination):
+    ordering = 'pk'
+
+
+class PubDateCursorPagination(CursorPagination):
+    ordering = '-pub_date'
+
+
+class CursorPaginationMixin:
+    """Включает курсорную пагинацию по параметру ?pagination=cursor.
+
+    По умолчанию остаётся пагинация из настроек с полями count, next,
+    previous и results. Курсорная страница выбирается по индексу без
+    OFFSET и COUNT(*), поэтому время ответа не зависит от глубины
+    страницы; поля count в ответе нет. Ссылки next и previous сохраняют
+    параметр pagination.
+    """
+
+    cursor_pagination_class = IdCursorPagination
+
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator') and (
+            self.request.query_params.get('pagination') == CURSOR_PAGINATION
+            or IdCursorPagination.cursor_query_param
+            in self.request.query_params
+        ):
+            self._paginator = self.cursor_pagination_class()
+        return super().paginator
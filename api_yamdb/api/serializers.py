@@ -0,0 +1,218 @@
+from django.contrib.auth import get_user_model
+from django.utils.html import escape
+from rest_framework import serializers
+
+from api.fieldsets import SparseFieldsSerializerMixin
+from reviews.dictionaries import categories, genres
+from reviews.models import (Category, Comment, Genre, GenreTitle, Review,
+                            Title)
+from reviews.search import SNIPPET_END, SNIPPET_START
+from users.validators import validate_username
+
+User = get_user_model()
+
+
+class UserSerializer(SparseFieldsSerializerMixin,
+                     serializers.ModelSerializer):
+
+    class Meta:
+        model = User
+        fields = (
+            'username', 'email', 'first_name', 'last_name', 'bio', 'role'
+        )
+
+
+class MeSerializer(UserSerializer):
+
+    class Meta(UserSerializer.Meta):
+        read_only_fields = ('role',)
+
+
+class SignUpSerializer(serializers.Serializer):
+    username = serializers.CharField(
+        max_length=150, validators=(validate_username,)
+    )
+    email = serializers.EmailField(max_length=254)
+
+    def validate(self, data):
+        username, email = data['username'], data['email']
+        if User.objects.filter(username=username).exclude(
+            email=email
+        ).exists():
+            raise serializers.ValidationError(
+                {'username': 'Пользователь с таким username уже существует.'}
+            )
+        if User.objects.filter(email=email).exclude(
+            username=username
+        ).exists():
+            raise serializers.ValidationError(
+                {'email': 'Пользователь с таким email уже существует.'}
+            )
+        return data
+
+
+class TokenSerializer(serializers.Serializer):
+    username = serializers.CharField(max_length=150)
+    confirmation_code = serializers.CharField()
+
+
+class CategorySerializer(serializers.ModelSerializer):
+
+    class Meta:
+        model = Category
+        fields = ('name', 'slug')
+
+
+class GenreSerializer(serializers.ModelSerializer):
+
+    class Meta:
+        model = Genre
+        fields = ('name', 'slug')
+
+
+class TitleReadSerializer(SparseFieldsSerializerMixin,
+                          serializers.ModelSerializer):
+    """Произведение с категорией и жанрами из справочников процесса.
+
+    Из базы читаются только id категории и жанров произведения; жанры
+    лучше загружать через prefetch_related('genretitle_set').
+    """
+
+    genre = serializers.SerializerMethodField()
+    category = serializers.SerializerMethodField()
+    rating = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = Title
+        fields = (
+            'id', 'name', 'year', 'rating', 'description', 'genre', 'category'
+        )
+
+    def get_genre(self, title):
+        by_pk = genres.for_context(self.context).by_pk
+        title_genres = filter(None, (
+            by_pk.get(link.genre_id) for link in title.genretitle_set.all()
+        ))
+        return GenreSerializer(
+            sorted(title_genres, key=lambda genre: genre.name), many=True
+        ).data
+
+    def get_category(self, title):
+        category = categories.for_context(self.context).by_pk.get(
+            title.category_id
+        )
+        if category is None:
+            return None
+        return CategorySerializer(category).data
+
+
+class DictionarySlugField(serializers.SlugRelatedField):
+    """Слаг категории или жанра, который ищется в справочнике процесса."""
+
+    def __init__(self, dictionary, **kwargs):
+        self.dictionary = dictionary
+        super().__init__(
+            slug_field='slug', queryset=dictionary.model.objects.all(),
+            **kwargs
+        )
+
+    def to_internal_value(self, data):
+        if not isinstance(data, str):
+            self.fail('invalid')
+        obj = self.dictionary.for_context(self.context).by_slug.get(data)
+        if obj is None:
+            self.fail('does_not_exist', slug_name=self.slug_field, value=data)
+        return obj
+
+
+class TitleWriteSerializer(serializers.ModelSerializer):
+    genre = DictionarySlugField(genres, many=True)
+    category = DictionarySlugField(categories)
+
+    class Meta:
+        model = Title
+        fields = ('id', 'name', 'year', 'description', 'genre', 'category')
+
+    def create(self, validated_data):
+        # Связи нового произведения вставляются одним запросом, без
+        # чтения текущих жанров, как в genre.set().
+        title_genres = validated_data.pop('genre')
+        title = Title.objects.create(**validated_data)
+        GenreTitle.objects.bulk_create(
+            GenreTitle(title=title, genre=genre) for genre in title_genres
+        )
+        return title
+
+    def to_representation(self, instance):
+        return TitleReadSerializer(instance, context=self.context).data
+
+
+class ReviewSerializer(SparseFieldsSerializerMixin,
+                       serializers.ModelSerializer):
+    author = serializers.SlugRelatedField(
+        slug_field='username', read_only=True
+    )
+
+    class Meta:
+        model = Review
+        fields = ('id', 'text', 'author', 'score', 'pub_date')
+        read_only_fields = ('pub_date',)
+
+    def validate(self, data):
+        request = self.context['request']
+        if request.method != 'POST':
+            return data
+        title_id = self.context['view'].kwargs.get('title_id')
+        if Review.objects.filter(
+            author=request.user, title_id=title_id
+        ).exists():
+            raise serializers.ValidationError(
+                'Вы уже оставили отзыв на это произведение.'
+            )
+        return data
+
+
+class CommentSerializer(serializers.ModelSerializer):
+    author = serializers.SlugRelatedField(
+        slug_field='username', read_only=True
+    )
+
+    class Meta:
+        model = Comment
+        fields = ('id', 'text', 'author', 'pub_date')
+        read_only_fields = ('pub_date',)
+
+
+class SnippetField(serializers.CharField):
+    """Фрагмент текста, где найденные слова обрамлены тегами <mark>.
+
+    Остальной текст экранирован, поэтому фрагмент можно вставлять в HTML.
+    """
+
+    def to_representation(self, value):
+        return escape(value).replace(SNIPPET_START, '<mark>').replace(
+            SNIPPET_END, '</mark>'
+        )
+
+
+class ReviewSearchSerializer(serializers.ModelSerializer):
+    author = serializers.SlugRelatedField(
+        slug_field='username', read_only=True
+    )
+    snippet = SnippetField(read_only=True)
+
+    class Meta:
+        model = Review
+        fields = ('id', 'title', 'author', 'score', 'pub_date', 'snippet')
+
+
+class CommentSearchSerializer(serializers.ModelSerializer):
+    title = serializers.IntegerField(source='review.title_id', read_only=True)
+    author = serializers.SlugRelatedField(
+        slug_field='username', read_only=True
+    )
+    snippet = SnippetField(read_only=True)
+
+    class Meta:
+        model = Comment
+        fields = ('id', 'title', 'review', 'author', 'pub_date', 'snippet')
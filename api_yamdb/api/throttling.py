@@ -0,0 +1,173 @@
+"""Ограничение частоты запросов к /auth/ по алгоритму token bucket.
+
+Ставка 'N/период' из AUTH_THROTTLE_RATES задаёт корзину на N токенов,
+которая наполняется со скоростью N токенов за период. Каждый запрос
+забирает токен; когда корзина пуста, DRF отвечает 429 с заголовком
+Retry-After ещё до вызова представления, то есть до запросов к базе и
+отправки писем; аутентификация у этих представлений отключена, чтобы и
+она не читала пользователя из базы. Корзины заводятся на IP-адрес клиента
+(REMOTE_ADDR, а X-Forwarded-For — только за NUM_PROXIES доверенными
+прокси) и на имя пользователя из тела запроса.
+
+Корзины хранятся в памяти процесса, а если задан AUTH_THROTTLE_CACHE — в
+этом кеше Django, общем для всех процессов. В общем кеше чтение и запись
+корзины не атомарны, и при одновременных запросах с одного ключа могут
+пройти несколько лишних. Число отклонённых запросов по каждой корзине
+отдаёт rejected_counts().
+"""
+import hashlib
+import threading
+import time
+from collections import Counter, OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.throttling import BaseThrottle
+
+DURATIONS = {'s': 1, 'm': 60, 'h': 60 * 60, 'd': 24 * 60 * 60}
+
+
+def parse_rate(rate):
+    """Ёмкость корзины и число токенов в секунду из ставки вида '5/min'."""
+    count, period = rate.split('/')
+    capacity = int(count)
+    return capacity, capacity / DURATIONS[period[0]]
+
+
+def refill(bucket, capacity, per_second, now):
+    """Забирает токен из корзины (tokens, updated).
+
+    Возвращает новое состояние корзины и сколько секунд ждать токена;
+    0 — запрос разрешён.
+    """
+    tokens, updated = bucket or (capacity, now)
+    tokens = min(capacity, tokens + (now - updated) * per_second)
+    if tokens < 1:
+        return (tokens, now), (1 - tokens) / per_second
+    return (tokens - 1, now), 0
+
+
+class LocalBuckets:
+    """Корзины процесса с вытеснением давно не нужных (LRU)."""
+
+    def __init__(self, size):
+        self.size = size
+        self.buckets = OrderedDict()
+        self.rejected = Counter()
+        self.lock = threading.Lock()
+
+    def take(self, key, capacity, per_second, now):
+        with self.lock:
+            bucket, wait = refill(
+                self.buckets.get(key), capacity, per_second, now
+            )
+            self.buckets[key] = bucket
+            self.buckets.move_to_end(key)
+            while len(self.buckets) > self.size:
+                self.buckets.popitem(last=False)
+        return wait
+
+    def reject(self, scope):
+        with self.lock:
+            self.rejected[scope] += 1
+
+    def rejected_count(self, scope):
+        return self.rejected[scope]
+
+    def clear(self):
+        with self.lock:
+            self.buckets.clear()
+            self.rejected.clear()
+
+
+class CacheBuckets:
+    """Корзины в кеше Django, общие для процессов."""
+
+    def __init__(self, cache):
+        self.cache = cache
+
+    def take(self, key, capacity, per_second, now):
+        key = f'throttle:{key}'
+        bucket, wait = refill(self.cache.get(key), capacity, per_second, now)
+        # Полная корзина не отличается от отсутствующей.
+        self.cache.set(key, bucket, int(capacity / per_second) + 1)
+        return wait
+
+    def reject(self, scope):
+        key = f'throttle-rejected:{scope}'
+        self.cache.add(key, 0, None)
+        try:
+            self.cache.incr(key)
+        except ValueError:
+            # Ключ вытеснен между add и incr.
+            self.cache.add(key, 1, None)
+
+    def rejected_count(self, scope):
+        return self.cache.get(f'throttle-rejected:{scope}', 0)
+
+
+local_buckets = LocalBuckets(settings.AUTH_THROTTLE_BUCKETS)
+
+
+def get_buckets():
+    if settings.AUTH_THROTTLE_CACHE is None:
+        return local_buckets
+    return CacheBuckets(caches[settings.AUTH_THROTTLE_CACHE])
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """Корзина токенов на ключ из get_key; ставка — AUTH_THROTTLE_RATES."""
+
+    scope = None
+
+    def get_key(self, request):
+        raise NotImplementedError
+
+    def allow_request(self, request, view):
+        self.delay = 0
+        rate = settings.AUTH_THROTTLE_RATES.get(self.scope)
+        key = self.get_key(request)
+        if rate is None or key is None:
+            return True
+        buckets = get_buckets()
+        self.delay = buckets.take(
+            f'{self.scope}:{key}', *parse_rate(rate), time.time()
+        )
+        if self.delay:
+            buckets.reject(self.scope)
+            return False
+        return True
+
+    def wait(self):
+        return self.delay
+
+
+class AuthIPThrottle(TokenBucketThrottle):
+    scope = 'ip'
+
+    def get_key(self, request):
+        return self.get_ident(request)
+
+
+class AuthUsernameThrottle(TokenBucketThrottle):
+    scope = 'username'
+
+    def get_key(self, request):
+        data = request.data
+        username = data.get('username') if hasattr(data, 'get') else None
+        if not isinstance(username, str) or not username:
+            return None
+        # Имя может быть любой длины, а ключ кеша ограничен.
+        return hashlib.sha256(username.encode()).hexdigest()
+
+
+AUTH_THROTTLES = (AuthIPThrottle, AuthUsernameThrottle)
+
+
+def rejected_counts():
+    """Число отклонённых запросов по корзинам: {'ip': ..., 'username': ...}."""
+    buckets = get_buckets()
+    return {
+        throttle.scope: buckets.rejected_count(throttle.scope)
+        for throttle in AUTH_THROTTLES
+    }
@@ -0,0 +1,41 @@
+from django.urls import include, path
+from rest_framework.routers import DefaultRouter
+
+from api.views import (CategoryViewSet, CommentSearchViewSet, CommentViewSet,
+                       GenreViewSet, ReviewSearchViewSet, ReviewViewSet,
+                       TitleViewSet, UserViewSet, export, signup,
+                       throttling, token)
+
+router_v1 = DefaultRouter()
+router_v1.register('users', UserViewSet, basename='users')
+router_v1.register('categories', CategoryViewSet, basename='categories')
+router_v1.register('genres', GenreViewSet, basename='genres')
+router_v1.register('titles', TitleViewSet, basename='titles')
+router_v1.register(
+    r'titles/(?P<title_id>\d+)/reviews',
+    ReviewViewSet,
+    basename='reviews',
+)
+router_v1.register(
+    r'titles/(?P<title_id>\d+)/reviews/(?P<review_id>\d+)/comments',
+    CommentViewSet,
+    basename='comments',
+)
+router_v1.register(
+    'search/reviews', ReviewSearchViewSet, basename='search-reviews'
+)
+router_v1.register(
+    'search/comments', CommentSearchViewSet, basename='search-comments'
+)
+
+auth_urls = [
+    path('signup/', signup, name='signup'),
+    path('token/', token, name='token'),
+    path('throttling/', throttling, name='throttling'),
+]
+
+urlpatterns = [
+    path('v1/auth/', include(auth_urls)),
+    path('v1/export/', export, name='export'),
+    path('v1/', include(router_v1.urls)),
+]
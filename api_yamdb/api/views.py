@@ -0,0 +1,273 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.http import StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework import filters, mixins, status, viewsets
+from rest_framework.decorators import (action, api_view,
+                                       authentication_classes,
+                                       permission_classes, throttle_classes)
+from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.response import Response
+
+from api.conditional import ConditionalListMixin
+from api.export import CONTENT_TYPE, export_catalogue
+from api.fieldsets import SparseFieldsMixin
+from api.filters import TitleFilter
+from api.pagination import CursorPaginationMixin, PubDateCursorPagination
+from api.permissions import (IsAdmin, IsAdminOrReadOnly,
+                             IsAuthorModeratorAdminOrReadOnly)
+from api.serializers import (CategorySerializer, CommentSearchSerializer,
+                             CommentSerializer, GenreSerializer, MeSerializer,
+                             ReviewSearchSerializer, ReviewSerializer,
+                             SignUpSerializer, TitleReadSerializer,
+                             TitleWriteSerializer, TokenSerializer,
+                             UserSerializer)
+from api.throttling import AUTH_THROTTLES, rejected_counts
+from reviews.cache import (ALL, CATEGORIES, GENRES, TITLES, USERS,
+                           cached_title, comments_version, reviews_version,
+                           title_versions)
+from reviews.models import Category, Comment, Genre, Review, Title
+from users.confirmation import confirmation_codes
+from users.outbox import enqueue_email
+from users.tokens import UserAccessToken
+
+User = get_user_model()
+
+
+@api_view(['POST'])
+@authentication_classes(())
+@permission_classes((AllowAny,))
+@throttle_classes(AUTH_THROTTLES)
+def signup(request):
+    serializer = SignUpSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    with transaction.atomic():
+        user, _ = User.objects.get_or_create(**serializer.validated_data)
+        enqueue_email(
+            'Код подтверждения YaMDb',
+            'Код подтверждения: '
+            f'{confirmation_codes.make_code(user)}',
+            user.email,
+        )
+    return Response(serializer.data, status=status.HTTP_200_OK)
+
+
+@api_view(['POST'])
+@authentication_classes(())
+@permission_classes((AllowAny,))
+@throttle_classes(AUTH_THROTTLES)
+def token(request):
+    serializer = TokenSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    user = get_object_or_404(
+        User, username=serializer.validated_data['username']
+    )
+    if not confirmation_codes.check_code(
+        user, serializer.validated_data['confirmation_code']
+    ):
+        return Response(
+            {'confirmation_code': ['Неверный код подтверждения.']},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    return Response({'token': str(UserAccessToken.for_user(user))})
+
+
+@api_view(['GET'])
+@permission_classes((IsAdmin,))
+def throttling(request):
+    return Response({'rejected': rejected_counts()})
+
+
+@api_view(['GET'])
+@permission_classes((IsAdmin,))
+def export(request):
+    include_reviews = request.query_params.get('reviews', '').lower() in (
+        '1', 'true', 'yes'
+    )
+    response = StreamingHttpResponse(
+        export_catalogue(include_reviews), content_type=CONTENT_TYPE
+    )
+    response['Content-Disposition'] = 'attachment; filename="yamdb.ndjson"'
+    return response
+
+
+class UserViewSet(SparseFieldsMixin, viewsets.ModelViewSet):
+    queryset = User.objects.all()
+    serializer_class = UserSerializer
+    permission_classes = (IsAdmin,)
+    lookup_field = 'username'
+    filter_backends = (filters.SearchFilter,)
+    search_fields = ('username',)
+    http_method_names = ('get', 'post', 'patch', 'delete')
+
+    @action(
+        detail=False,
+        methods=('get', 'patch'),
+        permission_classes=(IsAuthenticated,),
+    )
+    def me(self, request):
+        user = request.user
+        if user.get_deferred_fields():
+            # Пользователь из токена содержит не все поля профиля.
+            user = get_object_or_404(User, pk=user.pk)
+        if request.method == 'GET':
+            return Response(MeSerializer(user).data)
+        serializer = MeSerializer(user, data=request.data, partial=True)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return Response(serializer.data)
+
+
+class NameSlugViewSet(
+    ConditionalListMixin,
+    mixins.ListModelMixin,
+    mixins.CreateModelMixin,
+    mixins.DestroyModelMixin,
+    viewsets.GenericViewSet,
+):
+    permission_classes = (IsAdminOrReadOnly,)
+    lookup_field = 'slug'
+    filter_backends = (filters.SearchFilter,)
+    search_fields = ('name',)
+    version_name = None
+
+    def get_version_names(self):
+        return (ALL, self.version_name)
+
+
+class CategoryViewSet(NameSlugViewSet):
+    queryset = Category.objects.all()
+    serializer_class = CategorySerializer
+    version_name = CATEGORIES
+
+
+class GenreViewSet(NameSlugViewSet):
+    queryset = Genre.objects.all()
+    serializer_class = GenreSerializer
+    version_name = GENRES
+
+
+class TitleViewSet(
+    CursorPaginationMixin,
+    ConditionalListMixin,
+    SparseFieldsMixin,
+    viewsets.ModelViewSet,
+):
+    # Категории и жанры берутся из справочников процесса (см.
+    # reviews.dictionaries), из базы читаются только связи с жанрами.
+    queryset = Title.objects.prefetch_related('genretitle_set')
+    permission_classes = (IsAdminOrReadOnly,)
+    filter_backends = (DjangoFilterBackend,)
+    filterset_class = TitleFilter
+    http_method_names = ('get', 'post', 'patch', 'delete')
+    # Произведение целиком берётся из кеша, поля выбираются из него.
+    sparse_actions = ('list',)
+    sparse_sources = {
+        'rating': ('score_sum', 'score_count'),
+        'genre': (),
+    }
+    sparse_prefetches = {'genre': 'genretitle_set'}
+
+    def get_serializer_class(self):
+        if self.action in ('list', 'retrieve'):
+            return TitleReadSerializer
+        return TitleWriteSerializer
+
+    def get_title_pk(self):
+        try:
+            return int(self.kwargs[self.lookup_field])
+        except ValueError:
+            return None
+
+    def get_version_names(self):
+        if self.action == 'list':
+            return (ALL, CATEGORIES, GENRES, TITLES)
+        pk = self.get_title_pk()
+        return None if pk is None else title_versions(pk)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional(
+            self.retrieve_cached, request, *args, **kwargs
+        )
+
+    def retrieve_cached(self, request, *args, **kwargs):
+        pk = self.get_title_pk()
+        if pk is None:
+            return super().retrieve(request, *args, **kwargs)
+        data = cached_title(
+            pk, lambda: self.get_serializer(self.get_object()).data
+        )
+        fields = self.get_requested_fields()
+        if fields is not None:
+            data = {name: data[name] for name in fields}
+        return Response(data)
+
+
+class ReviewViewSet(
+    CursorPaginationMixin,
+    ConditionalListMixin,
+    SparseFieldsMixin,
+    viewsets.ModelViewSet,
+):
+    serializer_class = ReviewSerializer
+    cursor_pagination_class = PubDateCursorPagination
+    permission_classes = (IsAuthorModeratorAdminOrReadOnly,)
+    http_method_names = ('get', 'post', 'patch', 'delete')
+    sparse_sources = {'author': ('author__username',)}
+
+    def get_title(self):
+        return get_object_or_404(Title, pk=self.kwargs.get('title_id'))
+
+    def get_version_names(self):
+        return (ALL, USERS, reviews_version(int(self.kwargs['title_id'])))
+
+    def get_queryset(self):
+        return self.get_title().reviews.select_related('author')
+
+    def perform_create(self, serializer):
+        serializer.save(author=self.request.user, title=self.get_title())
+
+
+class CommentViewSet(
+    CursorPaginationMixin, ConditionalListMixin, viewsets.ModelViewSet
+):
+    serializer_class = CommentSerializer
+    cursor_pagination_class = PubDateCursorPagination
+    permission_classes = (IsAuthorModeratorAdminOrReadOnly,)
+    http_method_names = ('get', 'post', 'patch', 'delete')
+
+    def get_review(self):
+        return get_object_or_404(
+            Review,
+            pk=self.kwargs.get('review_id'),
+            title_id=self.kwargs.get('title_id'),
+        )
+
+    def get_version_names(self):
+        return (ALL, USERS, comments_version(int(self.kwargs['review_id'])))
+
+    def get_queryset(self):
+        return self.get_review().comments.all()
+
+    def perform_create(self, serializer):
+        serializer.save(author=self.request.user, review=self.get_review())
+
+
+class TextSearchViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
+    """Полнотекстовый поиск по параметру ?search= с фрагментами текста."""
+
+    def get_queryset(self):
+        return self.queryset.search(
+            self.request.query_params.get('search', '')
+        ).with_snippets()
+
+
+class ReviewSearchViewSet(TextSearchViewSet):
+    queryset = Review.objects.select_related('author')
+    serializer_class = ReviewSearchSerializer
+
+
+class CommentSearchViewSet(TextSearchViewSet):
+    queryset = Comment.objects.select_related('author', 'review')
+    serializer_class = CommentSearchSerializer
@@ -1,3 +1,4 @@
+from datetime import timedelta
 from pathlib import Path
 
 
@@ -21,6 +22,11 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'rest_framework',
+    'django_filters',
+    'users.apps.UsersConfig',
+    'reviews.apps.ReviewsConfig',
+    'api.apps.ApiConfig',
 ]
 
 MIDDLEWARE = [
@@ -64,6 +70,35 @@ DATABASES = {
     }
 }
 
+# Локальный кеш процесса вытесняет давно не читавшиеся записи (LRU). Если
+# приложение запущено в нескольких процессах, кеш версий данных должен
+# быть общим (например, Redis или Memcached), иначе изменение данных в
+# одном процессе не дойдёт до остальных.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    }
+}
+
+# Версии данных для ETag и ключей кеша (см. reviews.cache) и кеш
+# представлений /api/v1/titles/{id}/.
+VERSIONS_CACHE = 'default'
+
+# Сколько секунд версии данных и версии токенов пользователей (см.
+# users.tokens) хранятся в VERSIONS_CACHE. С кешем процесса это предел,
+# через который изменения из других процессов становятся видны: ETag и
+# ключи кеша произведений сменятся, а отозванный токен перестанет
+# приниматься. С общим кешем можно указать None (`check --deploy`
+# требует общий кеш, если таймаут не задан).
+VERSIONS_TIMEOUT = 60
+
+TOKEN_VERSION_TIMEOUT = 5
+
+TITLE_CACHE = 'default'
+
+TITLE_CACHE_TIMEOUT = 60 * 60
+
 
 # Password validation
 
@@ -101,3 +136,103 @@ USE_TZ = True
 STATIC_URL = '/static/'
 
 STATICFILES_DIRS = ((BASE_DIR / 'static/'),)
+
+DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+AUTH_USER_MODEL = 'users.User'
+
+
+# Django REST framework
+
+REST_FRAMEWORK = {
+    'DEFAULT_AUTHENTICATION_CLASSES': (
+        'api.authentication.ClaimsJWTAuthentication',
+    ),
+    'DEFAULT_PERMISSION_CLASSES': (
+        'rest_framework.permissions.IsAuthenticatedOrReadOnly',
+    ),
+    'DEFAULT_PAGINATION_CLASS': (
+        'api.pagination.CountingPageNumberPagination'
+    ),
+    'PAGE_SIZE': 10,
+    # Число доверенных прокси перед приложением: IP клиента для
+    # ограничения частоты берётся из X-Forwarded-For только за ними. При 0
+    # заголовок, который подделает любой клиент, не учитывается.
+    'NUM_PROXIES': 0,
+    # JSON на orjson с тем же выводом, что у стандартных JSONRenderer и
+    # JSONParser DRF (см. api.renderers); их можно вернуть здесь же.
+    'DEFAULT_RENDERER_CLASSES': (
+        'api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'api.renderers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
+}
+
+# Способ подсчёта `count` в постраничных ответах: 'exact' — COUNT(*) на
+# каждый запрос, 'cached' — точное значение в кеше на
+# PAGINATION_COUNT_CACHE_TIMEOUT секунд, 'estimated' — точное значение до
+# PAGINATION_COUNT_ESTIMATE_THRESHOLD строк, выше — оценка планировщика.
+PAGINATION_COUNT_STRATEGY = 'estimated'
+
+PAGINATION_COUNT_CACHE_TIMEOUT = 30
+
+PAGINATION_COUNT_ESTIMATE_THRESHOLD = 10000
+
+# Размер пачки строк при выгрузке каталога /api/v1/export/.
+EXPORT_BATCH_SIZE = 1000
+
+SIMPLE_JWT = {
+    'ACCESS_TOKEN_LIFETIME': timedelta(days=1),
+    'AUTH_HEADER_TYPES': ('Bearer',),
+}
+
+# Сколько проверенных JWT держит каждый процесс (см. api.authentication);
+# 0 — проверять подпись при каждом запросе.
+JWT_VERIFIED_TOKENS_SIZE = 10000
+
+# Коды подтверждения (см. users.confirmation): длина интервала, в котором
+# выдаётся один и тот же код, и сколько секунд после него код принимается.
+CONFIRMATION_CODE_INTERVAL = 15 * 60
+
+CONFIRMATION_CODE_TIMEOUT = 24 * 60 * 60
+
+# Ограничение частоты /auth/signup/ и /auth/token/ (см. api.throttling):
+# корзина на IP-адрес и на имя пользователя, None отключает корзину.
+AUTH_THROTTLE_RATES = {
+    'ip': '20/min',
+    'username': '5/min',
+}
+
+# Имя кеша из CACHES для корзин, общих для всех процессов; None — корзины
+# в памяти процесса, не больше AUTH_THROTTLE_BUCKETS штук.
+AUTH_THROTTLE_CACHE = None
+
+AUTH_THROTTLE_BUCKETS = 100000
+
+
+# Email
+
+EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
+
+EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
+
+DEFAULT_FROM_EMAIL = 'noreply@yamdb.fake'
+
+# Очередь исходящих писем (см. users.outbox). Письма отправляет процесс
+# `manage.py send_outbox`. False — отправлять сразу после коммита в самом
+# запросе, без повторов при ошибке; только для тестов и отладки.
+EMAIL_OUTBOX_WORKER = True
+
+EMAIL_OUTBOX_BATCH_SIZE = 100
+
+EMAIL_OUTBOX_MAX_ATTEMPTS = 5
+
+# Задержка первой повторной попытки в секундах, далее удваивается.
+EMAIL_OUTBOX_RETRY_DELAY = 60
+
+# На сколько секунд пачка закрепляется за отправляющим процессом.
+EMAIL_OUTBOX_LEASE = 300
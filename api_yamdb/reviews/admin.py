@@ -0,0 +1,36 @@
+from django.contrib import admin
+
+from reviews.models import Category, Comment, Genre, GenreTitle, Review, Title
+
+
+@admin.register(Category, Genre)
+class NameSlugAdmin(admin.ModelAdmin):
+    list_display = ('name', 'slug')
+    search_fields = ('name', 'slug')
+    prepopulated_fields = {'slug': ('name',)}
+
+
+class GenreTitleInline(admin.TabularInline):
+    model = GenreTitle
+    extra = 1
+
+
+@admin.register(Title)
+class TitleAdmin(admin.ModelAdmin):
+    list_display = ('name', 'year', 'category')
+    list_filter = ('category', 'genre', 'year')
+    search_fields = ('name',)
+    inlines = (GenreTitleInline,)
+
+
+@admin.register(Review)
+class ReviewAdmin(admin.ModelAdmin):
+    list_display = ('title', 'author', 'score', 'pub_date')
+    list_filter = ('score',)
+    search_fields = ('text',)
+
+
+@admin.register(Comment)
+class CommentAdmin(admin.ModelAdmin):
+    list_display = ('review', 'author', 'pub_date')
+    search_fields = ('text',)
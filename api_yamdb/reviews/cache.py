@@ -0,0 +1,105 @@
+"""Версии данных и кеш представлений произведений.
+
+Версия набора данных — время его последнего изменения в наносекундах,
+которое хранится в бэкенде кеша VERSIONS_CACHE. Сигналы из reviews.signals
+обновляют версии после фиксации транзакции, изменившей данные. По версиям
+строятся ETag и Last-Modified ответов API и ключи кеша представлений
+произведений: после изменения данных старые записи просто перестают
+читаться и со временем вытесняются.
+
+Если версия пропала из кеша (вытеснена, истёк VERSIONS_TIMEOUT или кеш
+перезапущен), она создаётся заново с текущим временем, поэтому совпасть
+со старой не может. Так изменения из других процессов доходят и до
+процесса с локальным кешем — не позже чем через VERSIONS_TIMEOUT.
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+# Меняется при массовых операциях в обход сигналов — импорте CSV и
+# пересчёте рейтингов.
+ALL = 'all'
+CATEGORIES = 'categories'
+GENRES = 'genres'
+# Меняется при изменении любого произведения, включая его рейтинг.
+TITLES = 'titles'
+# Меняется при изменении пользователей, чьи имена выводятся как авторы.
+USERS = 'users'
+
+
+def title_version(pk):
+    return f'title:{pk}'
+
+
+def reviews_version(title_id):
+    return f'reviews:{title_id}'
+
+
+def comments_version(review_id):
+    return f'comments:{review_id}'
+
+
+def title_versions(pk):
+    """Версии, от которых зависит представление произведения."""
+    return (ALL, CATEGORIES, GENRES, title_version(pk))
+
+
+def _version_key(name):
+    return f'version:{name}'
+
+
+def versions(names):
+    """Текущие версии наборов данных names в том же порядке."""
+    cache = caches[settings.VERSIONS_CACHE]
+    keys = [_version_key(name) for name in names]
+    found = cache.get_many(keys)
+    missing = {key: time.time_ns() for key in keys if key not in found}
+    if missing:
+        cache.set_many(missing, settings.VERSIONS_TIMEOUT)
+        found.update(missing)
+    return [found[key] for key in keys]
+
+
+def touch(*names):
+    """Обновляет версии наборов данных после фиксации транзакции.
+
+    Иначе параллельный запрос мог бы успеть закешировать ещё не
+    изменённые данные под новой версией.
+    """
+    keys = {_version_key(name) for name in names}
+    if keys:
+        transaction.on_commit(lambda: _set_versions(keys))
+
+
+def _set_versions(keys):
+    caches[settings.VERSIONS_CACHE].set_many(
+        dict.fromkeys(keys, time.time_ns()), settings.VERSIONS_TIMEOUT
+    )
+
+
+def touch_titles(ids):
+    names = [title_version(pk) for pk in ids]
+    if names:
+        touch(TITLES, *names)
+
+
+def touch_all():
+    touch(ALL)
+
+
+def cached_title(pk, load):
+    """Представление произведения из кеша, а при промахе — из load().
+
+    Ключ вычисляется до обращения к базе: если данные изменятся во время
+    загрузки, они сохранятся под уже устаревшим ключом.
+    """
+    cache = caches[settings.TITLE_CACHE]
+    tokens = '.'.join(map(str, versions(title_versions(pk))))
+    key = f'title-cache:{pk}:{tokens}'
+    data = cache.get(key)
+    if data is None:
+        data = load()
+        cache.set(key, data, settings.TITLE_CACHE_TIMEOUT)
+    return data
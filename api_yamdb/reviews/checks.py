@@ -0,0 +1,35 @@
+from django.conf import settings
+from django.core.checks import Error, Tags, Warning, register
+
+# Бэкенды, данные которых видны только своему процессу.
+PROCESS_LOCAL_BACKENDS = (
+    'django.core.cache.backends.locmem.LocMemCache',
+)
+
+
+@register(Tags.caches, deploy=True)
+def check_versions_cache(app_configs, **kwargs):
+    """Кеш версий в памяти процесса не видит изменений других процессов.
+
+    Без таймаутов версии и отзыв токенов в нём не обновятся никогда, с
+    таймаутами — с задержкой до VERSIONS_TIMEOUT и TOKEN_VERSION_TIMEOUT.
+    """
+    backend = settings.CACHES[settings.VERSIONS_CACHE]['BACKEND']
+    if backend not in PROCESS_LOCAL_BACKENDS:
+        return []
+    if None in (settings.VERSIONS_TIMEOUT, settings.TOKEN_VERSION_TIMEOUT):
+        return [Error(
+            f'VERSIONS_CACHE ({backend}) хранит версии в памяти процесса, а '
+            'VERSIONS_TIMEOUT или TOKEN_VERSION_TIMEOUT не задан: другие '
+            'процессы не увидят изменений данных и отзыва токенов.',
+            hint='Укажите общий кеш (Redis, Memcached) или таймауты.',
+            id='reviews.E001',
+        )]
+    return [Warning(
+        f'VERSIONS_CACHE ({backend}) хранит версии в памяти процесса: при '
+        'нескольких процессах изменения данных видны в остальных через '
+        f'{settings.VERSIONS_TIMEOUT} с, отзыв токенов — через '
+        f'{settings.TOKEN_VERSION_TIMEOUT} с.',
+        hint='Укажите общий кеш (Redis, Memcached).',
+        id='reviews.W001',
+    )]
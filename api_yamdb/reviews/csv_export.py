@@ -0,0 +1,195 @@
+"""Выгрузка базы в CSV-файлы в форматах static/data.
+
+Колонки каждого файла берутся из заголовка исходного файла, а имена
+колонок сопоставляются с полями модели так же, как при загрузке
+(reviews.csv_import.CSV_FILES). Поэтому выгрузку можно сразу загрузить
+командой import_csv.
+
+Строки читаются курсором пачками по chunk_size (в PostgreSQL — серверным
+курсором) и сразу пишутся в файл, в памяти находится не больше одной
+пачки. Файлы выгружаются в одной транзакции или, при workers > 1,
+параллельно в пуле процессов, по частям с диапазонами id. В PostgreSQL
+процессы читают общий снимок базы (pg_export_snapshot); в остальных СУБД
+каждая часть читается в своей транзакции, и выгрузка согласована, только
+если в это время в базу не пишут.
+"""
+import csv
+import multiprocessing
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+import django
+from django.db import connection, connections, models, transaction
+
+from reviews.csv_import import CSV_FILES, FILE_MODELS, header
+
+
+def csv_value(value):
+    """Значение поля в записи, как в файлах static/data."""
+    if value is None:
+        return ''
+    if isinstance(value, datetime):
+        value = value.astimezone(timezone.utc)
+        # Даты в исходных файлах — с миллисекундами; более точные даты
+        # выгружаются с микросекундами, чтобы не терять точность.
+        timespec = 'microseconds' if value.microsecond % 1000 else (
+            'milliseconds'
+        )
+        return value.replace(tzinfo=None).isoformat(timespec=timespec) + 'Z'
+    return value
+
+
+def table_rows(filename, columns, chunk_size, bounds=None):
+    """Строки таблицы файла по возрастанию id, с id из [start, end)."""
+    model, renames = FILE_MODELS[filename]
+    queryset = model.objects.order_by('pk')
+    if bounds is not None:
+        queryset = queryset.filter(pk__gte=bounds[0], pk__lt=bounds[1])
+    return queryset.values_list(
+        *[renames.get(column, column) for column in columns]
+    ).iterator(chunk_size=chunk_size)
+
+
+def write_rows(path, rows, columns=None):
+    """Записывает строки в файл (с заголовком, если передан columns).
+
+    Возвращает число записанных строк.
+    """
+    count = 0
+    with open(path, 'w', encoding='utf-8', newline='') as csv_file:
+        writer = csv.writer(csv_file)
+        if columns is not None:
+            writer.writerow(columns)
+        for row in rows:
+            writer.writerow([csv_value(value) for value in row])
+            count += 1
+    return count
+
+
+def export_file(path, columns, chunk_size):
+    """Записывает таблицу файла path.name в path, возвращает число строк."""
+    return write_rows(
+        path, table_rows(path.name, columns, chunk_size), columns
+    )
+
+
+def pk_bounds(filename, chunks):
+    """Делит диапазон id таблицы на chunks полуинтервалов [start, end)."""
+    model, _ = FILE_MODELS[filename]
+    bounds = model.objects.aggregate(
+        start=models.Min('pk'), end=models.Max('pk')
+    )
+    if bounds['start'] is None:
+        return [(0, 1)]
+    start, end = bounds['start'], bounds['end'] + 1
+    step = -(-(end - start) // chunks)
+    return [
+        (low, min(low + step, end)) for low in range(start, end, step)
+    ]
+
+
+@contextmanager
+def snapshot(snapshot_id=None):
+    """Транзакция с повторяемым чтением.
+
+    В PostgreSQL возвращает идентификатор снимка, который другие
+    соединения передают в snapshot_id, чтобы читать те же данные. Для
+    остальных СУБД возвращает None.
+    """
+    with transaction.atomic():
+        if connection.vendor != 'postgresql':
+            yield None
+            return
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SET TRANSACTION ISOLATION LEVEL REPEATABLE READ, READ ONLY'
+            )
+            if snapshot_id is not None:
+                cursor.execute('SET TRANSACTION SNAPSHOT %s', [snapshot_id])
+                yield snapshot_id
+                return
+            cursor.execute('SELECT pg_export_snapshot()')
+            snapshot_id = cursor.fetchone()[0]
+        yield snapshot_id
+
+
+def export_sequential(source_dir, output_dir, chunk_size, report):
+    """Выгружает все файлы по очереди в одной транзакции."""
+    totals = {}
+    with snapshot():
+        for filename, _, _ in CSV_FILES:
+            started = time.monotonic()
+            totals[filename] = export_file(
+                output_dir / filename, header(source_dir / filename),
+                chunk_size,
+            )
+            report(
+                f'{filename}: {totals[filename]} строк за '
+                f'{time.monotonic() - started:.1f} с'
+            )
+    return totals
+
+
+def _export_part(filename, path, columns, chunk_size, bounds,
+                 snapshot_id, database):
+    # Процесс пула читает ту же базу, что и родитель, даже если она не из
+    # модуля настроек, как тестовая.
+    connection.settings_dict.update(database)
+    try:
+        with snapshot(snapshot_id):
+            return write_rows(
+                path, table_rows(filename, columns, chunk_size, bounds)
+            )
+    finally:
+        connections.close_all()
+
+
+def join_parts(path, columns, parts):
+    """Собирает файл из заголовка и частей, части удаляются."""
+    with open(path, 'w', encoding='utf-8', newline='') as csv_file:
+        csv.writer(csv_file).writerow(columns)
+    with open(path, 'ab') as csv_file:
+        for part in parts:
+            with open(part, 'rb') as part_file:
+                shutil.copyfileobj(part_file, csv_file)
+            part.unlink()
+
+
+def export_parallel(source_dir, output_dir, chunk_size, workers, chunks,
+                    report):
+    """Выгружает файлы в пуле из workers процессов.
+
+    Каждая таблица делится на chunks диапазонов id; части одновременно
+    пишутся во временные файлы, которые затем склеиваются по порядку.
+    Процессы запускаются методом spawn: им не достаются соединения с БД
+    родителя, транзакция которого держит общий снимок, пока процессы не
+    закончат.
+    """
+    totals = {}
+    context = multiprocessing.get_context('spawn')
+    with snapshot() as snapshot_id, ProcessPoolExecutor(
+        workers, mp_context=context, initializer=django.setup
+    ) as pool:
+        started = time.monotonic()
+        jobs = []
+        for filename, _, _ in CSV_FILES:
+            columns = header(source_dir / filename)
+            parts, futures = [], []
+            for number, bounds in enumerate(pk_bounds(filename, chunks)):
+                parts.append(output_dir / f'{filename}.part{number}')
+                futures.append(pool.submit(
+                    _export_part, filename, parts[-1], columns, chunk_size,
+                    bounds, snapshot_id, connection.settings_dict,
+                ))
+            jobs.append((filename, columns, parts, futures))
+        for filename, columns, parts, futures in jobs:
+            totals[filename] = sum(future.result() for future in futures)
+            join_parts(output_dir / filename, columns, parts)
+            report(
+                f'{filename}: {totals[filename]} строк за '
+                f'{time.monotonic() - started:.1f} с'
+            )
+    return totals
@@ -0,0 +1,184 @@
+"""Генерация синтетических CSV в форматах static/data.
+
+Объём данных масштабируется от размеров исходных файлов, а отзывы и
+комментарии распределяются по закону Ципфа: несколько популярных
+произведений собирают большую часть отзывов, остальные образуют длинный
+хвост. При одинаковом seed результат побайтно совпадает.
+"""
+import bisect
+import csv
+import random
+import re
+import shutil
+from datetime import datetime, timedelta, timezone
+from itertools import accumulate
+
+from reviews.csv_import import header, read_rows
+
+# Таблицы-справочники переносятся без изменений.
+DICTIONARY_FILES = ('category.csv', 'genre.csv')
+ZIPF_EXPONENT = 1.1
+MAX_GENRES_PER_TITLE = 3
+SCORE_WEIGHTS = (1, 1, 2, 3, 5, 8, 12, 16, 14, 10)
+MODERATOR_SHARE = 0.01
+YEARS = (1900, 2021)
+PUB_DATES = (
+    datetime(2015, 1, 1, tzinfo=timezone.utc),
+    datetime(2021, 1, 1, tzinfo=timezone.utc),
+)
+WORD_PATTERN = re.compile(r'\w+')
+
+
+def rows_count(path):
+    return sum(1 for _ in read_rows(path))
+
+
+def vocabulary(path):
+    """Слова из текстов исходного файла, в детерминированном порядке."""
+    words = set()
+    for row in read_rows(path):
+        words.update(WORD_PATTERN.findall(row['text'].lower()))
+    return sorted(words)
+
+
+def zipf_counts(total, size, exponent=ZIPF_EXPONENT):
+    """Раскладывает total элементов на size корзин по закону Ципфа."""
+    weights = [1 / rank ** exponent for rank in range(1, size + 1)]
+    scale = total / sum(weights)
+    counts = [int(weight * scale) for weight in weights]
+    for rank in range(total - sum(counts)):
+        counts[rank % size] += 1
+    return counts
+
+
+class DataGenerator:
+
+    def __init__(self, source_dir, output_dir, scale, seed):
+        self.source_dir = source_dir
+        self.output_dir = output_dir
+        self.scale = scale
+        self.random = random.Random(seed)
+        self.words = vocabulary(source_dir / 'review.csv')
+        self.category_ids = [
+            int(row['id']) for row in read_rows(source_dir / 'category.csv')
+        ]
+        self.genre_ids = [
+            int(row['id']) for row in read_rows(source_dir / 'genre.csv')
+        ]
+
+    def scaled(self, filename):
+        return max(1, rows_count(self.source_dir / filename) * self.scale)
+
+    def generate(self):
+        """Создаёт все файлы и возвращает число строк по каждому."""
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        totals = {}
+        for filename in DICTIONARY_FILES:
+            shutil.copyfile(
+                self.source_dir / filename, self.output_dir / filename
+            )
+            totals[filename] = rows_count(self.source_dir / filename)
+        titles = self.scaled('titles.csv')
+        reviews_per_title = zipf_counts(self.scaled('review.csv'), titles)
+        # Самые популярные произведения не должны идти подряд с id = 1.
+        self.random.shuffle(reviews_per_title)
+        # Один пользователь пишет не больше одного отзыва на произведение.
+        users = max(self.scaled('users.csv'), max(reviews_per_title))
+        totals['users.csv'] = self.write('users.csv', self.users(users))
+        totals['titles.csv'] = self.write('titles.csv', self.titles(titles))
+        totals['genre_title.csv'] = self.write(
+            'genre_title.csv', self.genre_titles(titles)
+        )
+        totals['review.csv'] = self.write(
+            'review.csv', self.reviews(reviews_per_title, users)
+        )
+        totals['comments.csv'] = self.write(
+            'comments.csv',
+            self.comments(
+                self.scaled('comments.csv'), totals['review.csv'], users
+            ),
+        )
+        return totals
+
+    def write(self, filename, rows):
+        count = 0
+        with open(self.output_dir / filename, 'w', encoding='utf-8',
+                  newline='') as csv_file:
+            writer = csv.writer(csv_file)
+            writer.writerow(header(self.source_dir / filename))
+            for row in rows:
+                writer.writerow(row)
+                count += 1
+        return count
+
+    def text(self, low, high):
+        words = self.random.choices(
+            self.words, k=self.random.randint(low, high)
+        )
+        return ' '.join(words).capitalize()
+
+    def pub_date(self):
+        start, end = PUB_DATES
+        moment = start + timedelta(
+            seconds=self.random.randrange(int((end - start).total_seconds()))
+        )
+        return moment.strftime('%Y-%m-%dT%H:%M:%S.000Z')
+
+    def users(self, count):
+        for user_id in range(1, count + 1):
+            role = (
+                'moderator' if self.random.random() < MODERATOR_SHARE
+                else 'user'
+            )
+            yield (
+                user_id, f'user{user_id}', f'user{user_id}@yamdb.fake', role,
+                '', '', '',
+            )
+
+    def titles(self, count):
+        for title_id in range(1, count + 1):
+            yield (
+                title_id, self.text(1, 4), self.random.randint(*YEARS),
+                self.random.choice(self.category_ids),
+            )
+
+    def genre_titles(self, titles):
+        row_id = 0
+        for title_id in range(1, titles + 1):
+            genres = self.random.sample(
+                self.genre_ids,
+                self.random.randint(1, MAX_GENRES_PER_TITLE),
+            )
+            for genre_id in sorted(genres):
+                row_id += 1
+                yield row_id, title_id, genre_id
+
+    def reviews(self, reviews_per_title, users):
+        review_id = 0
+        for title_id, count in enumerate(reviews_per_title, 1):
+            for author in self.random.sample(range(1, users + 1), count):
+                review_id += 1
+                yield (
+                    review_id, title_id, self.text(5, 60), author,
+                    self.random.choices(
+                        range(1, len(SCORE_WEIGHTS) + 1), SCORE_WEIGHTS
+                    )[0],
+                    self.pub_date(),
+                )
+
+    def comments(self, count, reviews, users):
+        # Комментарии тоже скапливаются под немногими отзывами.
+        cum_weights = list(accumulate(
+            1 / rank ** ZIPF_EXPONENT for rank in range(1, reviews + 1)
+        ))
+        order = list(range(1, reviews + 1))
+        self.random.shuffle(order)
+        for comment_id in range(1, count + 1):
+            position = bisect.bisect(
+                cum_weights, self.random.random() * cum_weights[-1]
+            )
+            yield (
+                comment_id, order[min(position, reviews - 1)],
+                self.text(3, 30), self.random.randint(1, users),
+                self.pub_date(),
+            )
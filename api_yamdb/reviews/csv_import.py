@@ -0,0 +1,360 @@
+"""Потоковая загрузка CSV-файлов из static/data.
+
+Строки проходят по цепочке генераторов: чтение файла, построение объектов
+модели, нарезка на пачки. В памяти одновременно находится не больше одной
+пачки, поэтому размер файла на потребление памяти не влияет.
+
+Для параллельной загрузки файлы образуют граф зависимостей по внешним
+ключам моделей, а каждый файл можно разбить на части по границам записей:
+части разбирают процессы пула, а записывает их в базу один процесс.
+"""
+import csv
+import hashlib
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+import django
+from django.db import connections, models, reset_queries, transaction
+
+from reviews.models import (Category, Comment, Genre, GenreTitle, ImportedRow,
+                            Review, Title)
+from users.models import User
+from users.tokens import set_token_version
+
+# Файлы перечислены в порядке зависимостей: каждая таблица загружается
+# после тех, на которые ссылаются её внешние ключи.
+CSV_FILES = (
+    ('users.csv', User, {}),
+    ('category.csv', Category, {}),
+    ('genre.csv', Genre, {}),
+    ('titles.csv', Title, {'category': 'category_id'}),
+    ('genre_title.csv', GenreTitle, {}),
+    ('review.csv', Review, {'author': 'author_id'}),
+    ('comments.csv', Comment, {'author': 'author_id'}),
+)
+
+# Тексты отзывов в выгрузках бывают длиннее стандартного лимита модуля csv
+# в 128 КБ на поле.
+csv.field_size_limit(min(sys.maxsize, 2 ** 31 - 1))
+
+
+FILE_MODELS = {filename: (model, renames)
+               for filename, model, renames in CSV_FILES}
+
+
+def header(path):
+    """Названия колонок CSV-файла."""
+    with open(path, encoding='utf-8', newline='') as csv_file:
+        return next(csv.reader(csv_file))
+
+
+def dependencies(filename):
+    """Файлы, на модели которых ссылаются внешние ключи модели файла."""
+    model, _ = FILE_MODELS[filename]
+    related = {
+        field.related_model for field in model._meta.concrete_fields
+        if field.many_to_one
+    }
+    return {
+        other for other, (other_model, _) in FILE_MODELS.items()
+        if other_model in related and other != filename
+    }
+
+
+def dependency_levels(filenames):
+    """Раскладывает файлы по уровням графа зависимостей.
+
+    Файлы одного уровня друг от друга не зависят и загружаются
+    одновременно; каждый уровень зависит только от предыдущих.
+    """
+    pending = {name: dependencies(name) & set(filenames) for name in filenames}
+    levels = []
+    while pending:
+        ready = sorted(name for name, deps in pending.items() if not deps)
+        if not ready:
+            raise ValueError(f'Циклическая зависимость: {sorted(pending)}.')
+        levels.append(ready)
+        for name in ready:
+            del pending[name]
+        for deps in pending.values():
+            deps.difference_update(ready)
+    return levels
+
+
+def split_file(path, chunks):
+    """Делит файл на части по байтовым смещениям границ записей.
+
+    Граница ставится только после перевода строки вне кавычек, поэтому
+    многострочные поля не разрываются. Возвращает список пар (start, end).
+    """
+    targets = [path.stat().st_size * part // chunks
+               for part in range(1, chunks)]
+    with open(path, 'rb') as csv_file:
+        position = len(csv_file.readline())
+        bounds = [position]
+        in_quotes = False
+        for line in csv_file:
+            position += len(line)
+            in_quotes ^= line.count(b'"') % 2 == 1
+            if in_quotes or not targets or position < targets[0]:
+                continue
+            bounds.append(position)
+            while targets and position >= targets[0]:
+                targets.pop(0)
+    if bounds[-1] != position:
+        bounds.append(position)
+    return list(zip(bounds, bounds[1:]))
+
+
+def _read_lines(csv_file, start, end):
+    csv_file.seek(start)
+    position = start
+    for line in csv_file:
+        if position >= end:
+            return
+        position += len(line)
+        yield line.decode('utf-8')
+
+
+def read_rows(path, chunk=None):
+    """Построчно читает CSV, включая многострочные поля в кавычках.
+
+    Если передан chunk — пара байтовых смещений из split_file, — читаются
+    только записи этой части файла.
+    """
+    if chunk is None:
+        with open(path, encoding='utf-8', newline='') as csv_file:
+            yield from csv.DictReader(csv_file)
+        return
+    with open(path, 'rb') as csv_file:
+        columns = next(csv.reader([csv_file.readline().decode('utf-8')]))
+        yield from csv.DictReader(
+            _read_lines(csv_file, *chunk), fieldnames=columns
+        )
+
+
+def build_objects(rows, model, renames):
+    for row in rows:
+        yield model(**{
+            renames.get(column, column): value
+            for column, value in row.items()
+        })
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+class Progress:
+    """Сообщает о числе загруженных строк и скорости загрузки."""
+
+    def __init__(self, name, report, every):
+        self.name = name
+        self.report = report
+        self.every = every
+        self.count = 0
+        self.started = time.monotonic()
+        self.next_report = every
+
+    @property
+    def rate(self):
+        elapsed = time.monotonic() - self.started
+        return self.count / elapsed if elapsed else 0
+
+    def advance(self, rows):
+        self.count += rows
+        if self.report and self.every and self.count >= self.next_report:
+            self.next_report = (self.count // self.every + 1) * self.every
+            self.report(
+                f'{self.name}: {self.count} строк, '
+                f'{self.rate:.0f} строк/с'
+            )
+
+
+def import_file(path, model, renames, batch_size, report=None,
+                report_every=None):
+    """Загружает файл или его часть пачками в одной транзакции.
+
+    Возвращает объект Progress с итоговым числом строк и скоростью.
+    """
+    progress = Progress(path.name, report, report_every)
+    objects = build_objects(read_rows(path), model, renames)
+    with transaction.atomic():
+        for batch in batched(objects, batch_size):
+            model.objects.bulk_create(batch)
+            progress.advance(len(batch))
+            # При DEBUG=True Django копит тексты запросов, а у bulk INSERT
+            # они размером с саму пачку.
+            reset_queries()
+    return progress
+
+
+def row_digest(row):
+    content = '\x1f'.join(row.values()).encode('utf-8')
+    return hashlib.blake2b(content, digest_size=16).hexdigest()
+
+
+def revoke_tokens(model, objects, fields):
+    """Отзывает токены пользователей, у которых меняются поля токена.
+
+    bulk_update не вызывает User.save, поэтому версия токенов увеличивается
+    здесь, до обновления objects, а в кеш попадает после коммита.
+    """
+    fields = [
+        field for field in fields
+        if field in getattr(model, 'TOKEN_FIELDS', ())
+    ]
+    if not fields:
+        return
+    stored = {
+        pk: values for pk, *values in model.objects.filter(
+            pk__in=[obj.pk for obj in objects]
+        ).values_list('pk', *fields)
+    }
+    revoked = model.objects.filter(pk__in=[
+        obj.pk for obj in objects
+        if [getattr(obj, field) for field in fields] != stored[obj.pk]
+    ])
+    if not revoked.update(token_version=models.F('token_version') + 1):
+        return
+    versions = list(revoked.values_list('pk', 'token_version'))
+
+    def publish():
+        for pk, version in versions:
+            set_token_version(pk, version)
+
+    transaction.on_commit(publish)
+
+
+def sync_file(path, model, renames, batch_size):
+    """Приводит таблицу к содержимому файла, не трогая неизменные строки.
+
+    Строки сопоставляются по колонке id, для каждой хранится хеш
+    содержимого в ImportedRow. Новые строки вставляются, строки с
+    изменившимся хешем обновляются, а ранее загруженные из этого файла и
+    исчезнувшие из него — удаляются. Объекты, созданные не импортом
+    (например, пользователи из API), не удаляются.
+    Возвращает Counter с числом строк created, updated, unchanged и deleted.
+    """
+    stats = Counter()
+    seen = set()
+    with transaction.atomic():
+        for rows in batched(read_rows(path), batch_size):
+            digests = {int(row['id']): row_digest(row) for row in rows}
+            seen.update(digests)
+            stored = dict(ImportedRow.objects.filter(
+                source=path.name, object_id__in=digests
+            ).values_list('object_id', 'digest'))
+            changed = [
+                row for row in rows
+                if stored.get(int(row['id'])) != digests[int(row['id'])]
+            ]
+            stats['unchanged'] += len(rows) - len(changed)
+            if not changed:
+                continue
+            objects = list(build_objects(changed, model, renames))
+            for obj in objects:
+                obj.pk = int(obj.pk)
+            ids = [obj.pk for obj in objects]
+            existing = set(model.objects.filter(
+                pk__in=ids
+            ).values_list('pk', flat=True))
+            to_update = [obj for obj in objects if obj.pk in existing]
+            model.objects.bulk_create(
+                [obj for obj in objects if obj.pk not in existing]
+            )
+            if to_update:
+                fields = [
+                    renames.get(column, column) for column in changed[0]
+                    if column != 'id'
+                ]
+                revoke_tokens(model, to_update, fields)
+                model.objects.bulk_update(to_update, fields)
+            ImportedRow.objects.filter(
+                source=path.name, object_id__in=ids
+            ).delete()
+            ImportedRow.objects.bulk_create(
+                ImportedRow(source=path.name, object_id=pk, digest=digests[pk])
+                for pk in ids
+            )
+            stats['created'] += len(objects) - len(to_update)
+            stats['updated'] += len(to_update)
+            reset_queries()
+        stored_ids = ImportedRow.objects.filter(
+            source=path.name
+        ).values_list('object_id', flat=True)
+        gone = [pk for pk in stored_ids.iterator() if pk not in seen]
+        for ids in batched(gone, batch_size):
+            model.objects.filter(pk__in=ids).delete()
+            ImportedRow.objects.filter(
+                source=path.name, object_id__in=ids
+            ).delete()
+            stats['deleted'] += len(ids)
+    return stats
+
+
+def _init_worker():
+    django.setup()
+    connections.close_all()
+
+
+def parse_chunk(path, chunk):
+    """Объекты модели из части файла; выполняется в процессе пула."""
+    model, renames = FILE_MODELS[path.name]
+    return list(build_objects(read_rows(path, chunk), model, renames))
+
+
+def import_parallel(data_dir, batch_size, workers, chunks, report):
+    """Разбирает файлы в пуле процессов и записывает их одним соединением.
+
+    Процессы читают и разбирают части файлов, а основной процесс вставляет
+    готовые объекты файл за файлом в порядке графа зависимостей, каждый
+    файл в одной транзакции, как при последовательной загрузке. Поэтому
+    импорт работает и на SQLite с единственным пишущим соединением, а
+    ошибка откатывает файл целиком. Пока пишется один файл, пул разбирает
+    следующий; в памяти держатся части не больше чем двух файлов.
+    Возвращает число загруженных строк по файлам.
+    """
+    totals = {}
+    filenames = [
+        filename
+        for level in dependency_levels(list(FILE_MODELS))
+        for filename in level
+    ]
+    # Дочерние процессы не должны наследовать открытые соединения с БД.
+    connections.close_all()
+    with ProcessPoolExecutor(workers, initializer=_init_worker) as pool:
+
+        def submit(filename):
+            path = data_dir / filename
+            return [
+                pool.submit(parse_chunk, path, chunk)
+                for chunk in split_file(path, chunks)
+            ]
+
+        upcoming = submit(filenames[0])
+        for number, filename in enumerate(filenames):
+            futures = upcoming
+            if number + 1 < len(filenames):
+                upcoming = submit(filenames[number + 1])
+            started = time.monotonic()
+            model, _ = FILE_MODELS[filename]
+            count = 0
+            with transaction.atomic():
+                for future in futures:
+                    for batch in batched(future.result(), batch_size):
+                        model.objects.bulk_create(batch)
+                        count += len(batch)
+                        reset_queries()
+            totals[filename] = count
+            elapsed = time.monotonic() - started
+            report(f'{filename}: {count} строк за {elapsed:.1f} с')
+    return totals
@@ -0,0 +1,70 @@
+"""Категории и жанры в памяти процесса.
+
+Таблицы-справочники маленькие и меняются редко, а нужны при каждом чтении
+и записи произведения. Справочник загружается целиком и перечитывается,
+только когда меняется его версия или версия ALL (см. reviews.cache):
+процесс, изменивший категорию или жанр, перечитывает справочник сразу
+после фиксации транзакции, остальные — при первом обращении после смены
+версии. Импорт CSV меняет только ALL, и справочники перечитываются тоже.
+
+Версия берётся из кеша версий, который может быть общим и сетевым, поэтому
+сериализаторы сверяют её один раз на запрос через for_context().
+"""
+from collections import namedtuple
+
+from reviews.cache import ALL, CATEGORIES, GENRES, versions
+from reviews.models import Category, Genre
+
+DictionaryState = namedtuple(
+    'DictionaryState', ('version', 'by_pk', 'by_slug')
+)
+
+
+class Dictionary:
+
+    def __init__(self, model, version_name):
+        self.model = model
+        self.version_name = version_name
+        # Версия и оба индекса заменяются одним присваиванием, поэтому
+        # параллельные потоки не увидят их рассогласованными.
+        self.state = DictionaryState(None, {}, {})
+
+    def version(self):
+        return tuple(versions((ALL, self.version_name)))
+
+    def reload(self):
+        version = self.version()
+        objects = list(self.model.objects.all())
+        self.state = DictionaryState(
+            version,
+            {obj.pk: obj for obj in objects},
+            {obj.slug: obj for obj in objects},
+        )
+        return self.state
+
+    def current(self):
+        state = self.state
+        if state.version != self.version():
+            state = self.reload()
+        return state
+
+    def for_context(self, context):
+        """Состояние справочника, сверенное с версией один раз на context.
+
+        context — словарь контекста сериализатора, общий для всех объектов
+        и полей одного ответа.
+        """
+        states = context.setdefault('dictionaries', {})
+        if self.version_name not in states:
+            states[self.version_name] = self.current()
+        return states[self.version_name]
+
+    def get(self, pk):
+        return self.current().by_pk.get(pk)
+
+    def get_by_slug(self, slug):
+        return self.current().by_slug.get(slug)
+
+
+categories = Dictionary(Category, CATEGORIES)
+genres = Dictionary(Genre, GENRES)
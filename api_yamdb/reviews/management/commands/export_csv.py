@@ -0,0 +1,83 @@
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from reviews.csv_export import export_parallel, export_sequential
+from reviews.csv_import import CSV_FILES
+
+DEFAULT_SOURCE_DIR = settings.BASE_DIR / 'static' / 'data'
+DEFAULT_CHUNK_SIZE = 2000
+
+
+class Command(BaseCommand):
+    help = (
+        'Выгружает базу данных в CSV-файлы с колонками файлов static/data, '
+        'которые загружаются командой import_csv.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'output',
+            type=Path,
+            help='Каталог, в который будут записаны CSV-файлы.',
+        )
+        parser.add_argument(
+            '--source',
+            type=Path,
+            default=DEFAULT_SOURCE_DIR,
+            help='Каталог с файлами, из которых берутся заголовки колонок.',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=DEFAULT_CHUNK_SIZE,
+            help='Сколько строк читать из курсора за раз.',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help=(
+                'Число процессов. Больше одного — файлы выгружаются '
+                'параллельно.'
+            ),
+        )
+        parser.add_argument(
+            '--chunks',
+            type=int,
+            default=1,
+            help=(
+                'На сколько частей по диапазонам id делить каждую таблицу '
+                'при --workers > 1.'
+            ),
+        )
+
+    def handle(self, *args, **options):
+        source_dir, output_dir = options['source'], options['output']
+        for option in ('chunk_size', 'workers', 'chunks'):
+            if options[option] < 1:
+                raise CommandError(
+                    f'--{option.replace("_", "-")} должен быть '
+                    'положительным.'
+                )
+        if output_dir.resolve() == source_dir.resolve():
+            raise CommandError('Нельзя перезаписывать исходные файлы.')
+        for filename, _, _ in CSV_FILES:
+            if not (source_dir / filename).exists():
+                raise CommandError(f'Файл {source_dir / filename} не найден.')
+        output_dir.mkdir(parents=True, exist_ok=True)
+        if options['workers'] > 1:
+            export_parallel(
+                source_dir, output_dir, options['chunk_size'],
+                options['workers'], options['chunks'],
+                report=self.stdout.write,
+            )
+        else:
+            export_sequential(
+                source_dir, output_dir, options['chunk_size'],
+                report=self.stdout.write,
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f'Данные записаны в {output_dir}.'
+        ))
@@ -0,0 +1,55 @@
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from reviews.csv_generator import DataGenerator
+
+DEFAULT_SOURCE_DIR = settings.BASE_DIR / 'static' / 'data'
+
+
+class Command(BaseCommand):
+    help = (
+        'Генерирует синтетические CSV в форматах static/data, '
+        'увеличенные в --scale раз.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'output',
+            type=Path,
+            help='Каталог, в который будут записаны CSV-файлы.',
+        )
+        parser.add_argument(
+            '--scale',
+            type=int,
+            default=10,
+            help='Во сколько раз увеличить объём исходных файлов.',
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            help='Зерно генератора случайных чисел.',
+        )
+        parser.add_argument(
+            '--source',
+            type=Path,
+            default=DEFAULT_SOURCE_DIR,
+            help='Каталог с исходными CSV-файлами.',
+        )
+
+    def handle(self, *args, **options):
+        if options['scale'] < 1:
+            raise CommandError('--scale должен быть положительным.')
+        if options['output'].resolve() == options['source'].resolve():
+            raise CommandError('Нельзя перезаписывать исходные файлы.')
+        totals = DataGenerator(
+            options['source'], options['output'], options['scale'],
+            options['seed'],
+        ).generate()
+        for filename, count in totals.items():
+            self.stdout.write(f'{filename}: строк — {count}.')
+        self.stdout.write(self.style.SUCCESS(
+            f'Данные записаны в {options["output"]}.'
+        ))
@@ -0,0 +1,125 @@
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection
+
+from reviews.csv_import import (CSV_FILES, import_file, import_parallel,
+                                sync_file)
+from reviews.models import Title
+
+DEFAULT_DATA_DIR = settings.BASE_DIR / 'static' / 'data'
+DEFAULT_BATCH_SIZE = 1000
+DEFAULT_REPORT_EVERY = 100000
+
+
+class Command(BaseCommand):
+    help = 'Загружает CSV-файлы из static/data в базу данных.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path',
+            type=Path,
+            default=DEFAULT_DATA_DIR,
+            help='Каталог с CSV-файлами.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help='Количество строк в одном INSERT.',
+        )
+        parser.add_argument(
+            '--report-every',
+            type=int,
+            default=DEFAULT_REPORT_EVERY,
+            help='Выводить прогресс каждые N строк (0 — не выводить).',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help=(
+                'Число процессов. Больше одного — части файлов разбираются '
+                'параллельно, а записываются одним соединением.'
+            ),
+        )
+        parser.add_argument(
+            '--chunks',
+            type=int,
+            default=1,
+            help='На сколько частей делить каждый файл при --workers > 1.',
+        )
+        parser.add_argument(
+            '--incremental',
+            action='store_true',
+            help=(
+                'Обновить только изменившиеся строки и удалить исчезнувшие '
+                'вместо загрузки в пустые таблицы.'
+            ),
+        )
+
+    def handle(self, *args, **options):
+        data_dir = options['path']
+        batch_size = options['batch_size']
+        for option in ('batch_size', 'workers', 'chunks'):
+            if options[option] < 1:
+                raise CommandError(
+                    f'--{option.replace("_", "-")} должен быть '
+                    'положительным.'
+                )
+        for filename, _, _ in CSV_FILES:
+            if not (data_dir / filename).exists():
+                raise CommandError(f'Файл {data_dir / filename} не найден.')
+        if options['incremental'] and options['workers'] > 1:
+            raise CommandError('--incremental несовместим с --workers.')
+        if options['incremental']:
+            self.import_incremental(data_dir, batch_size)
+        elif options['workers'] > 1:
+            totals = import_parallel(
+                data_dir, batch_size, options['workers'], options['chunks'],
+                report=self.stdout.write,
+            )
+            for filename, count in totals.items():
+                self.stdout.write(f'{filename}: загружено строк — {count}.')
+        else:
+            self.import_sequential(data_dir, batch_size, options)
+        self.reset_sequences([model for _, model, _ in CSV_FILES])
+        # bulk_create и bulk_update не вызывают сигналы, обновляющие
+        # рейтинг, поэтому он пересчитывается одним запросом в конце.
+        Title.objects.refresh_ratings()
+        self.stdout.write(self.style.SUCCESS('Импорт завершён.'))
+
+    def import_sequential(self, data_dir, batch_size, options):
+        for filename, model, renames in CSV_FILES:
+            path = data_dir / filename
+            progress = import_file(
+                path, model, renames, batch_size,
+                report=self.stdout.write,
+                report_every=options['report_every'],
+            )
+            self.stdout.write(
+                f'{filename}: загружено строк — {progress.count} '
+                f'({progress.rate:.0f} строк/с).'
+            )
+
+    def import_incremental(self, data_dir, batch_size):
+        for filename, model, renames in CSV_FILES:
+            stats = sync_file(data_dir / filename, model, renames, batch_size)
+            self.stdout.write(
+                f'{filename}: добавлено — {stats["created"]}, '
+                f'обновлено — {stats["updated"]}, '
+                f'без изменений — {stats["unchanged"]}, '
+                f'удалено — {stats["deleted"]}.'
+            )
+
+    @staticmethod
+    def reset_sequences(models):
+        """Сдвигает счётчики id после вставки строк с явными ключами."""
+        statements = connection.ops.sequence_reset_sql(no_style(), models)
+        if not statements:
+            return
+        with connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
@@ -0,0 +1,57 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from reviews.models import Title
+
+DRIFT_SAMPLE_SIZE = 10
+
+
+class Command(BaseCommand):
+    help = (
+        'Сверяет сохранённые суммы и числа оценок произведений с отзывами '
+        'и исправляет расхождения.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--from-id', type=int, help='Минимальный id произведения.'
+        )
+        parser.add_argument(
+            '--to-id', type=int, help='Максимальный id произведения.'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Только вывести расхождения, ничего не исправляя.',
+        )
+
+    def handle(self, *args, **options):
+        if (
+            options['from_id'] is not None and options['to_id'] is not None
+            and options['from_id'] > options['to_id']
+        ):
+            raise CommandError('--from-id больше --to-id.')
+        titles = Title.objects.order_by('pk')
+        if options['from_id'] is not None:
+            titles = titles.filter(pk__gte=options['from_id'])
+        if options['to_id'] is not None:
+            titles = titles.filter(pk__lte=options['to_id'])
+        drifted = titles.drifted()
+        count = drifted.count()
+        for title in drifted[:DRIFT_SAMPLE_SIZE]:
+            self.stdout.write(
+                f'id={title.pk}: сумма {title.score_sum} -> '
+                f'{title.actual_sum}, число {title.score_count} -> '
+                f'{title.actual_count}'
+            )
+        if count > DRIFT_SAMPLE_SIZE:
+            self.stdout.write(f'… и ещё {count - DRIFT_SAMPLE_SIZE}.')
+        if not count:
+            self.stdout.write(self.style.SUCCESS('Расхождений нет.'))
+            return
+        if options['dry_run']:
+            self.stdout.write(f'Найдено расхождений: {count}.')
+            return
+        fixed = Title.objects.filter(
+            pk__in=drifted.values('pk')
+        ).refresh_ratings()
+        self.stdout.write(self.style.SUCCESS(f'Исправлено: {fixed}.'))
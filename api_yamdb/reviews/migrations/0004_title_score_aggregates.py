@@ -0,0 +1,46 @@
+# Generated by Django 3.2 on 2026-10-18 19:12
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def fill_score_aggregates(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    Review = apps.get_model('reviews', 'Review')
+    reviews = Review.objects.filter(title=OuterRef('pk')).order_by()
+    Title.objects.update(
+        score_sum=Coalesce(Subquery(
+            reviews.values('title').annotate(total=Sum('score'))
+            .values('total'),
+            output_field=IntegerField(),
+        ), 0),
+        score_count=Coalesce(Subquery(
+            reviews.values('title').annotate(total=Count('pk'))
+            .values('total'),
+            output_field=IntegerField(),
+        ), 0),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0003_importedrow'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='title',
+            name='score_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Число оценок'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='score_sum',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Сумма оценок'),
+        ),
+        migrations.RunPython(
+            fill_score_aggregates, migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,345 @@
+from django.conf import settings
+from django.core.validators import MaxValueValidator, MinValueValidator
+from django.db import connections, models, router, transaction
+from django.db.models.functions import Coalesce, Collate
+from django.utils import timezone
+
+from reviews.cache import touch_all
+from reviews.search import SearchField, SearchQuerySet
+from reviews.validators import validate_year
+
+MIN_SCORE = 1
+MAX_SCORE = 10
+
+
+class NameSlugModel(models.Model):
+    name = models.CharField('Название', max_length=256)
+    slug = models.SlugField('Слаг', max_length=50, unique=True)
+
+    class Meta:
+        abstract = True
+        ordering = ('name',)
+
+    def __str__(self):
+        return self.name
+
+
+class Category(NameSlugModel):
+
+    class Meta(NameSlugModel.Meta):
+        verbose_name = 'Категория'
+        verbose_name_plural = 'Категории'
+
+
+class Genre(NameSlugModel):
+
+    class Meta(NameSlugModel.Meta):
+        verbose_name = 'Жанр'
+        verbose_name_plural = 'Жанры'
+
+
+def review_score_totals():
+    """Подзапросы суммы и числа оценок по отзывам внешнего произведения."""
+    reviews = Review.objects.filter(title=models.OuterRef('pk')).order_by()
+    return {
+        'score_sum': Coalesce(models.Subquery(
+            reviews.values('title').annotate(total=models.Sum('score'))
+            .values('total'),
+            output_field=models.IntegerField(),
+        ), 0),
+        'score_count': Coalesce(models.Subquery(
+            reviews.values('title').annotate(total=models.Count('pk'))
+            .values('total'),
+            output_field=models.IntegerField(),
+        ), 0),
+    }
+
+
+class TitleQuerySet(SearchQuerySet):
+
+    def refresh_ratings(self):
+        """Пересчитывает сумму и число оценок одним UPDATE по отзывам."""
+        touch_all()
+        return self.update(**review_score_totals())
+
+    def drifted(self):
+        """Произведения, у которых сохранённые оценки разошлись с отзывами.
+
+        Фактические значения доступны как actual_sum и actual_count.
+        """
+        totals = review_score_totals()
+        return self.annotate(
+            actual_sum=totals['score_sum'],
+            actual_count=totals['score_count'],
+        ).exclude(
+            score_sum=models.F('actual_sum'),
+            score_count=models.F('actual_count'),
+        )
+
+
+class Title(models.Model):
+    name = models.CharField('Название', max_length=256)
+    year = models.PositiveSmallIntegerField(
+        'Год выпуска', validators=(validate_year,)
+    )
+    description = models.TextField('Описание', blank=True)
+    genre = models.ManyToManyField(
+        Genre,
+        through='GenreTitle',
+        related_name='titles',
+        verbose_name='Жанр',
+    )
+    category = models.ForeignKey(
+        Category,
+        on_delete=models.SET_NULL,
+        null=True,
+        # Поиск по категории обслуживает составной индекс title_category_year.
+        db_index=False,
+        related_name='titles',
+        verbose_name='Категория',
+    )
+    # Сумма и число оценок хранятся в самой таблице и обновляются при
+    # изменении отзывов (см. reviews.signals), чтобы чтение рейтинга
+    # не требовало агрегации по таблице отзывов.
+    score_sum = models.PositiveIntegerField(
+        'Сумма оценок', default=0, editable=False
+    )
+    score_count = models.PositiveIntegerField(
+        'Число оценок', default=0, editable=False
+    )
+
+    objects = TitleQuerySet.as_manager()
+
+    class Meta:
+        ordering = ('name',)
+        verbose_name = 'Произведение'
+        verbose_name_plural = 'Произведения'
+        # Индексы под фильтры /titles/ (см. api.filters.TitleFilter).
+        # Поиск по началу названия в SQLite идёт через LIKE, который
+        # использует индекс только с регистронезависимым сравнением NOCASE.
+        indexes = (
+            models.Index(
+                fields=('category', 'year'), name='title_category_year'
+            ),
+            models.Index(fields=('year',), name='title_year'),
+            models.Index(
+                Collate('name', 'NOCASE'), name='title_name_nocase'
+            ),
+        )
+
+    def __str__(self):
+        return self.name
+
+    @property
+    def rating(self):
+        if not self.score_count:
+            return None
+        return self.score_sum / self.score_count
+
+
+class TitleSearch(models.Model):
+    """Запись поискового индекса FTS5 по названию и описанию."""
+
+    title = models.OneToOneField(
+        Title,
+        on_delete=models.DO_NOTHING,
+        primary_key=True,
+        db_column='rowid',
+        db_constraint=False,
+        related_name='search_entry',
+    )
+    document = SearchField(db_column='reviews_title_fts')
+    rank = models.FloatField()
+
+    indexed_fields = ('name', 'description')
+
+    class Meta:
+        managed = False
+        db_table = 'reviews_title_fts'
+
+
+class GenreTitle(models.Model):
+    title = models.ForeignKey(Title, on_delete=models.CASCADE)
+    # Поиск по жанру обслуживает составной индекс genre_title_genre.
+    genre = models.ForeignKey(Genre, on_delete=models.CASCADE, db_index=False)
+
+    class Meta:
+        verbose_name = 'Жанр произведения'
+        verbose_name_plural = 'Жанры произведений'
+        indexes = (
+            models.Index(
+                fields=('genre', 'title'), name='genre_title_genre'
+            ),
+        )
+        constraints = (
+            models.UniqueConstraint(
+                fields=('title', 'genre'), name='unique_genre_title'
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.title} — {self.genre}'
+
+
+class AuthoredText(models.Model):
+    text = models.TextField('Текст')
+    author = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        verbose_name='Автор',
+    )
+    pub_date = models.DateTimeField(
+        'Дата публикации', default=timezone.now, db_index=True
+    )
+
+    class Meta:
+        abstract = True
+        ordering = ('-pub_date',)
+        default_related_name = '%(class)ss'
+
+    objects = SearchQuerySet.as_manager()
+
+    def __str__(self):
+        return self.text[:30]
+
+
+class Review(AuthoredText):
+    title = models.ForeignKey(
+        Title, on_delete=models.CASCADE, verbose_name='Произведение'
+    )
+    score = models.PositiveSmallIntegerField(
+        'Оценка',
+        validators=(
+            MinValueValidator(MIN_SCORE),
+            MaxValueValidator(MAX_SCORE),
+        ),
+    )
+
+    class Meta(AuthoredText.Meta):
+        verbose_name = 'Отзыв'
+        verbose_name_plural = 'Отзывы'
+        # Для курсорной пагинации отзывов произведения по дате.
+        indexes = (
+            models.Index(
+                fields=('title', 'pub_date'), name='review_title_pub_date'
+            ),
+        )
+        constraints = (
+            models.UniqueConstraint(
+                fields=('author', 'title'), name='unique_review_author'
+            ),
+        )
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        review = super().from_db(db, field_names, values)
+        review.remember_score()
+        return review
+
+    def remember_score(self):
+        """Запоминает сохранённые в БД оценку и произведение."""
+        self.saved_score = self.__dict__.get('score')
+        self.saved_title_id = self.__dict__.get('title_id')
+
+    def lock_saved_score(self, using):
+        """Блокирует строку отзыва и перечитывает сохранённую оценку.
+
+        Оценка, запомненная при загрузке объекта, могла устареть, пока
+        параллельный запрос менял тот же отзыв, и рейтинг разошёлся бы.
+        """
+        queryset = Review.objects.using(using).filter(pk=self.pk)
+        if connections[using].features.has_select_for_update:
+            queryset = queryset.select_for_update()
+        else:
+            # SQLite блокирует базу на запись только при первой записи.
+            queryset.update(score=models.F('score'))
+        saved = queryset.values_list('score', 'title_id').first()
+        if saved is not None:
+            self.saved_score, self.saved_title_id = saved
+
+    def save(self, *args, **kwargs):
+        using = kwargs.get('using') or router.db_for_write(
+            Review, instance=self
+        )
+        # Рейтинг произведения обновляется в post_save, в той же транзакции.
+        with transaction.atomic(using=using):
+            if not self._state.adding and self.pk is not None:
+                self.lock_saved_score(using)
+            super().save(*args, **kwargs)
+
+
+class Comment(AuthoredText):
+    review = models.ForeignKey(
+        Review, on_delete=models.CASCADE, verbose_name='Отзыв'
+    )
+
+    class Meta(AuthoredText.Meta):
+        verbose_name = 'Комментарий'
+        verbose_name_plural = 'Комментарии'
+        indexes = (
+            models.Index(
+                fields=('review', 'pub_date'), name='comment_review_pub_date'
+            ),
+        )
+
+
+class ReviewSearch(models.Model):
+    """Запись поискового индекса FTS5 по тексту отзыва."""
+
+    review = models.OneToOneField(
+        Review,
+        on_delete=models.DO_NOTHING,
+        primary_key=True,
+        db_column='rowid',
+        db_constraint=False,
+        related_name='search_entry',
+    )
+    document = SearchField(db_column='reviews_review_fts')
+    rank = models.FloatField()
+
+    indexed_fields = ('text',)
+
+    class Meta:
+        managed = False
+        db_table = 'reviews_review_fts'
+
+
+class CommentSearch(models.Model):
+    """Запись поискового индекса FTS5 по тексту комментария."""
+
+    comment = models.OneToOneField(
+        Comment,
+        on_delete=models.DO_NOTHING,
+        primary_key=True,
+        db_column='rowid',
+        db_constraint=False,
+        related_name='search_entry',
+    )
+    document = SearchField(db_column='reviews_comment_fts')
+    rank = models.FloatField()
+
+    indexed_fields = ('text',)
+
+    class Meta:
+        managed = False
+        db_table = 'reviews_comment_fts'
+
+
+class ImportedRow(models.Model):
+    """Хеш содержимого строки CSV, загруженной в инкрементальном режиме."""
+
+    source = models.CharField('Файл', max_length=50)
+    object_id = models.BigIntegerField('id строки')
+    digest = models.CharField('Хеш содержимого', max_length=32)
+
+    class Meta:
+        verbose_name = 'Импортированная строка'
+        verbose_name_plural = 'Импортированные строки'
+        constraints = (
+            models.UniqueConstraint(
+                fields=('source', 'object_id'), name='unique_imported_row'
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.source}:{self.object_id}'
@@ -0,0 +1,189 @@
+"""Полнотекстовый поиск на SQLite FTS5.
+
+Поисковый индекс таблицы — виртуальная таблица FTS5 с внешним содержимым
+(content=): тексты хранятся только в самой таблице модели, в индексе —
+лишь обратные списки слов. Индекс обновляют триггеры, поэтому он остаётся
+актуальным при любой записи, включая bulk_create при импорте CSV. На
+других СУБД индексы не создаются, и поиск идёт по подстрокам колонок
+indexed_fields модели индекса, без ранжирования.
+"""
+import operator
+import re
+from functools import reduce
+
+from django.db import connections, migrations, models
+from django.db.models.functions import Substr
+
+TOKEN_PATTERN = re.compile(r'\w+')
+# Префиксные индексы FTS5 для запросов из двух и трёх первых букв слова:
+# поиск идёт на каждое нажатие клавиши, и короткие префиксы — самые
+# частые и самые дорогие.
+PREFIX_LENGTHS = '2 3'
+TOKENIZER = 'unicode61 remove_diacritics 2'
+# Границы найденных слов во фрагментах — управляющие символы, которых нет
+# в текстах: при выводе их можно заменить на разметку, экранировав текст.
+SNIPPET_START = '\x02'
+SNIPPET_END = '\x03'
+SNIPPET_ELLIPSIS = '…'
+SNIPPET_TOKENS = 16
+# Без индекса фрагмент — начало текста такой длины, без выделения слов.
+SNIPPET_FALLBACK_LENGTH = 200
+
+
+def fts_query(text):
+    """Запрос FTS5, которому соответствуют тексты со всеми словами text.
+
+    Каждое слово ищется как префикс, а кавычки экранируют синтаксис FTS5,
+    поэтому пользовательский ввод не может сломать запрос.
+    """
+    return ' '.join(
+        f'"{token}"*' for token in TOKEN_PATTERN.findall(text)
+    )
+
+
+def index_table(table):
+    return f'{table}_fts'
+
+
+def create_index_sql(table, columns):
+    """SQL создания индекса FTS5 над table, его триггеров и наполнения."""
+    index = index_table(table)
+    names = ', '.join(columns)
+    new = ', '.join(f'new.{column}' for column in columns)
+    old = ', '.join(f'old.{column}' for column in columns)
+    insert = (
+        f'INSERT INTO {index}(rowid, {names}) VALUES (new.id, {new});'
+    )
+    delete = (
+        f'INSERT INTO {index}({index}, rowid, {names}) '
+        f"VALUES ('delete', old.id, {old});"
+    )
+    return (
+        f'CREATE VIRTUAL TABLE {index} USING fts5({names}, '
+        f"content='{table}', content_rowid='id', "
+        f"tokenize='{TOKENIZER}', prefix='{PREFIX_LENGTHS}')",
+        f'CREATE TRIGGER {index}_insert AFTER INSERT ON {table} '
+        f'BEGIN {insert} END',
+        f'CREATE TRIGGER {index}_delete AFTER DELETE ON {table} '
+        f'BEGIN {delete} END',
+        # Триггер срабатывает только при изменении индексируемых колонок:
+        # пересчёт рейтинга и прочие обновления индекс не трогают.
+        f'CREATE TRIGGER {index}_update AFTER UPDATE OF {names} '
+        f'ON {table} BEGIN {delete} {insert} END',
+        f"INSERT INTO {index}({index}) VALUES ('rebuild')",
+    )
+
+
+def drop_index_sql(table):
+    index = index_table(table)
+    return tuple(
+        f'DROP TRIGGER {index}_{event}'
+        for event in ('insert', 'delete', 'update')
+    ) + (f'DROP TABLE {index}',)
+
+
+def _execute(schema_editor, statements):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def search_index_operation(table, columns):
+    """Операция миграции, создающая индекс FTS5 над колонками таблицы."""
+    return migrations.RunPython(
+        lambda apps, schema_editor: _execute(
+            schema_editor, create_index_sql(table, columns)
+        ),
+        lambda apps, schema_editor: _execute(
+            schema_editor, drop_index_sql(table)
+        ),
+    )
+
+
+class SearchQuerySet(models.QuerySet):
+    """Поиск по индексу FTS5 модели.
+
+    Модель индекса связана с моделью OneToOneField с related_name
+    search_entry, у неё есть поля document и rank и атрибут indexed_fields —
+    проиндексированные поля модели.
+    """
+
+    def search_index(self):
+        return self.model.search_entry.related.related_model
+
+    def has_search_index(self):
+        return connections[self.db].vendor == 'sqlite'
+
+    def search(self, text):
+        """Объекты, в тексте которых есть все слова text, по релевантности.
+
+        Слова ищутся как префиксы. Без индекса FTS5 слова ищутся как
+        подстроки без учёта регистра, а порядок остаётся прежним.
+        """
+        tokens = TOKEN_PATTERN.findall(text)
+        if not tokens:
+            return self.none()
+        if not self.has_search_index():
+            fields = self.search_index().indexed_fields
+            return self.filter(*(
+                reduce(operator.or_, (
+                    models.Q(**{f'{field}__icontains': token})
+                    for field in fields
+                ))
+                for token in tokens
+            ))
+        return self.filter(
+            search_entry__document__match=fts_query(text)
+        ).order_by('search_entry__rank')
+
+    def with_snippets(self, tokens=SNIPPET_TOKENS):
+        """Добавляет фрагмент текста с найденными словами как snippet.
+
+        Найденные слова обрамлены SNIPPET_START и SNIPPET_END. Применяется
+        только к результату search. Без индекса FTS5 фрагмент — начало
+        первого проиндексированного поля.
+        """
+        index = self.search_index()
+        if not self.has_search_index():
+            return self.annotate(snippet=Substr(
+                index.indexed_fields[0], 1, SNIPPET_FALLBACK_LENGTH
+            ))
+        return self.annotate(
+            snippet=Snippet(index._meta.db_table, tokens)
+        )
+
+
+class Snippet(models.Func):
+    """Функция snippet() FTS5 по индексу, участвующему в MATCH запроса."""
+
+    function = 'snippet'
+    template = '%(function)s(%(index)s, -1, %(expressions)s)'
+    output_field = models.TextField()
+
+    def __init__(self, index, tokens):
+        self.index = index
+        super().__init__(
+            models.Value(SNIPPET_START), models.Value(SNIPPET_END),
+            models.Value(SNIPPET_ELLIPSIS), models.Value(tokens),
+        )
+
+    def as_sql(self, compiler, connection, **extra_context):
+        return super().as_sql(
+            compiler, connection,
+            index=connection.ops.quote_name(self.index), **extra_context
+        )
+
+
+class SearchField(models.TextField):
+    """Скрытая колонка FTS5 с именем индекса, по которой выполняется MATCH."""
+
+
+@SearchField.register_lookup
+class Match(models.Lookup):
+    lookup_name = 'match'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs} MATCH {rhs}', lhs_params + rhs_params
@@ -0,0 +1,105 @@
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import (m2m_changed, post_delete, post_save,
+                                      pre_delete)
+from django.dispatch import receiver
+
+from reviews.cache import (CATEGORIES, GENRES, USERS, comments_version,
+                           reviews_version, touch, touch_titles)
+from reviews.dictionaries import categories, genres
+from reviews.models import (Category, Comment, Genre, GenreTitle, Review,
+                            Title)
+
+
+def change_rating(title_id, score_delta, count_delta):
+    Title.objects.filter(pk=title_id).update(
+        score_sum=F('score_sum') + score_delta,
+        score_count=F('score_count') + count_delta,
+    )
+
+
+@receiver(post_save, sender=Review)
+def review_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    old_score = getattr(instance, 'saved_score', None)
+    old_title_id = getattr(instance, 'saved_title_id', None)
+    if created:
+        change_rating(instance.title_id, instance.score, 1)
+    elif old_score is None:
+        # Объект не загружался из БД, прежняя оценка неизвестна.
+        Title.objects.filter(pk=instance.title_id).refresh_ratings()
+    elif old_title_id != instance.title_id:
+        change_rating(old_title_id, -old_score, -1)
+        change_rating(instance.title_id, instance.score, 1)
+    elif old_score != instance.score:
+        change_rating(instance.title_id, instance.score - old_score, 0)
+    title_ids = {
+        pk for pk in (old_title_id, instance.title_id) if pk is not None
+    }
+    touch_titles(title_ids)
+    touch(*map(reviews_version, title_ids))
+    instance.remember_score()
+
+
+@receiver(post_delete, sender=Review)
+def review_deleted(sender, instance, **kwargs):
+    change_rating(instance.title_id, -instance.score, -1)
+    touch_titles((instance.title_id,))
+    touch(reviews_version(instance.title_id))
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def comment_changed(sender, instance, **kwargs):
+    touch(comments_version(instance.review_id))
+
+
+@receiver(post_save, sender=Title)
+@receiver(post_delete, sender=Title)
+def title_changed(sender, instance, **kwargs):
+    touch_titles((instance.pk,))
+
+
+@receiver(post_save, sender=GenreTitle)
+@receiver(post_delete, sender=GenreTitle)
+def genre_title_changed(sender, instance, **kwargs):
+    touch_titles((instance.title_id,))
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def title_genres_changed(sender, instance, action, reverse, pk_set,
+                         **kwargs):
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+    if not reverse:
+        touch_titles((instance.pk,))
+    elif pk_set is not None:
+        touch_titles(pk_set)
+    else:
+        touch_titles(instance.titles.values_list('pk', flat=True))
+
+
+# Категории и жанры меняются редко, а произведений у них может быть много,
+# поэтому их версии входят в версии всех произведений, а не обновляются
+# у каждого затронутого произведения. Справочники процесса перечитываются
+# сразу, чтобы не делать этого при следующем запросе.
+@receiver(post_save, sender=Category)
+@receiver(pre_delete, sender=Category)
+def category_changed(sender, **kwargs):
+    touch(CATEGORIES)
+    transaction.on_commit(categories.reload)
+
+
+@receiver(post_save, sender=Genre)
+@receiver(pre_delete, sender=Genre)
+def genre_changed(sender, **kwargs):
+    touch(GENRES)
+    transaction.on_commit(genres.reload)
+
+
+@receiver(post_save, sender='users.User')
+def user_changed(sender, created, **kwargs):
+    # У нового пользователя ещё нет отзывов и комментариев.
+    if not created:
+        touch(USERS)
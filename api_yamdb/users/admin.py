@@ -0,0 +1,22 @@
+from django.contrib import admin
+from django.contrib.auth.admin import UserAdmin
+
+from users.models import OutgoingEmail, User
+
+
+@admin.register(User)
+class CustomUserAdmin(UserAdmin):
+    list_display = ('username', 'email', 'role', 'is_superuser')
+    list_editable = ('role',)
+    search_fields = ('username', 'email')
+    list_filter = ('role',)
+    fieldsets = UserAdmin.fieldsets + (
+        ('Профиль YaMDb', {'fields': ('role', 'bio')}),
+    )
+
+
+@admin.register(OutgoingEmail)
+class OutgoingEmailAdmin(admin.ModelAdmin):
+    list_display = ('recipient', 'subject', 'attempts', 'next_attempt')
+    search_fields = ('recipient',)
+    readonly_fields = ('created', 'last_error')
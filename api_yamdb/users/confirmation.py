@@ -0,0 +1,51 @@
+"""Коды подтверждения без хранения в базе.
+
+Код — усечённый HMAC-SHA256 на SECRET_KEY от id пользователя, номера
+временного интервала длиной CONFIRMATION_CODE_INTERVAL секунд и
+«соли» пользователя: хеша пароля и версии токенов. Поэтому выдача кода
+ничего не пишет в базу, повторная регистрация в том же интервале
+присылает тот же код, а смена пароля, имени или роли делает выданные
+коды недействительными. Код принимается в течение
+CONFIRMATION_CODE_TIMEOUT секунд после интервала, в котором он выдан.
+"""
+import time
+
+from django.conf import settings
+from django.utils.crypto import constant_time_compare, salted_hmac
+
+KEY_SALT = 'users.confirmation.ConfirmationCodeGenerator'
+# 20 шестнадцатеричных символов — 80 бит HMAC.
+CODE_LENGTH = 20
+
+
+class ConfirmationCodeGenerator:
+
+    def __init__(self, secret=None):
+        self.secret = secret
+
+    def interval(self, now=None):
+        return int(now or time.time()) // settings.CONFIRMATION_CODE_INTERVAL
+
+    def make_code(self, user, interval=None):
+        if interval is None:
+            interval = self.interval()
+        value = f'{user.pk}:{interval}:{user.password}:{user.token_version}'
+        return salted_hmac(
+            KEY_SALT, value, secret=self.secret, algorithm='sha256'
+        ).hexdigest()[:CODE_LENGTH]
+
+    def check_code(self, user, code):
+        if not isinstance(code, str) or len(code) != CODE_LENGTH:
+            return False
+        current = self.interval()
+        intervals = -(
+            -settings.CONFIRMATION_CODE_TIMEOUT
+            // settings.CONFIRMATION_CODE_INTERVAL
+        )
+        return any(
+            constant_time_compare(self.make_code(user, interval), code)
+            for interval in range(current, current - intervals - 1, -1)
+        )
+
+
+confirmation_codes = ConfirmationCodeGenerator()
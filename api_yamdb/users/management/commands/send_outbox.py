@@ -0,0 +1,55 @@
+import time
+
+from django.conf import settings
+from django.core.mail import get_connection
+from django.core.management.base import BaseCommand, CommandError
+
+from users.outbox import due_emails, send_emails
+
+
+class Command(BaseCommand):
+    help = (
+        'Отправляет письма из очереди OutgoingEmail пачками через одно '
+        'соединение с почтовым сервером.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=settings.EMAIL_OUTBOX_BATCH_SIZE,
+            help='Сколько писем отправлять за раз.',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=5,
+            help='Пауза в секундах, когда очередь пуста.',
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Отправить письма, которые пора отправить, и завершиться.',
+        )
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size должен быть положительным.')
+        connection = get_connection()
+        try:
+            while True:
+                sent, failed = send_emails(
+                    due_emails(), options['batch_size'], connection
+                )
+                if sent or failed:
+                    self.stdout.write(
+                        f'Отправлено — {sent}, отложено — {failed}.'
+                    )
+                    continue
+                if options['once']:
+                    break
+                # Соединение не держится открытым, пока писем нет.
+                connection.close()
+                time.sleep(options['interval'])
+        finally:
+            connection.close()
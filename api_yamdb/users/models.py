@@ -0,0 +1,116 @@
+from django.contrib.auth.models import AbstractUser
+from django.db import models, transaction
+from django.utils import timezone
+
+from users.validators import validate_username
+
+
+class User(AbstractUser):
+    """Пользователь YaMDb.
+
+    Имя, роль и флаги администратора передаются в утверждениях JWT (см.
+    users.tokens). При изменении любого из них или блокировке
+    увеличивается token_version, и выданные раньше токены отзываются.
+    """
+
+    USER = 'user'
+    MODERATOR = 'moderator'
+    ADMIN = 'admin'
+    ROLES = (
+        (USER, 'Пользователь'),
+        (MODERATOR, 'Модератор'),
+        (ADMIN, 'Администратор'),
+    )
+
+    username = models.CharField(
+        'Имя пользователя',
+        max_length=150,
+        unique=True,
+        validators=(validate_username,),
+    )
+    email = models.EmailField('Электронная почта', max_length=254, unique=True)
+    bio = models.TextField('Биография', blank=True)
+    role = models.CharField(
+        'Роль',
+        max_length=max(len(role) for role, _ in ROLES),
+        choices=ROLES,
+        default=USER,
+    )
+    token_version = models.PositiveIntegerField(
+        'Версия токенов', default=0, editable=False
+    )
+
+    TOKEN_FIELDS = ('username', 'role', 'is_staff', 'is_superuser',
+                    'is_active')
+
+    class Meta:
+        ordering = ('username',)
+        verbose_name = 'Пользователь'
+        verbose_name_plural = 'Пользователи'
+
+    def __str__(self):
+        return self.username
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.saved_token_fields = instance.token_fields()
+        return instance
+
+    def token_fields(self):
+        deferred = self.get_deferred_fields()
+        return {
+            name: getattr(self, name) for name in self.TOKEN_FIELDS
+            if name not in deferred
+        }
+
+    def save(self, *args, **kwargs):
+        saved = getattr(self, 'saved_token_fields', None)
+        revoke = saved is not None and self.token_fields() != saved
+        if revoke:
+            self.token_version += 1
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'token_version'}
+        super().save(*args, **kwargs)
+        self.saved_token_fields = self.token_fields()
+        if revoke:
+            from users.tokens import set_token_version
+
+            version, pk = self.token_version, self.pk
+            transaction.on_commit(lambda: set_token_version(pk, version))
+
+    @property
+    def is_admin(self):
+        return self.role == self.ADMIN or self.is_superuser or self.is_staff
+
+    @property
+    def is_moderator(self):
+        return self.role == self.MODERATOR
+
+
+class OutgoingEmail(models.Model):
+    """Письмо, ожидающее отправки (см. users.outbox).
+
+    Отправленные письма удаляются; письма, которые не удалось отправить
+    за EMAIL_OUTBOX_MAX_ATTEMPTS попыток, остаются с текстом последней
+    ошибки.
+    """
+
+    recipient = models.EmailField('Получатель', max_length=254)
+    subject = models.CharField('Тема', max_length=255)
+    body = models.TextField('Текст')
+    created = models.DateTimeField('Создано', auto_now_add=True)
+    attempts = models.PositiveSmallIntegerField('Попытки', default=0)
+    next_attempt = models.DateTimeField(
+        'Следующая попытка', default=timezone.now, db_index=True
+    )
+    last_error = models.TextField('Последняя ошибка', blank=True)
+
+    class Meta:
+        ordering = ('next_attempt', 'id')
+        verbose_name = 'Исходящее письмо'
+        verbose_name_plural = 'Исходящие письма'
+
+    def __str__(self):
+        return f'{self.recipient}: {self.subject}'
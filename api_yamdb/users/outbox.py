@@ -0,0 +1,110 @@
+"""Очередь исходящих писем в базе данных (outbox).
+
+Письмо записывается в таблицу OutgoingEmail в транзакции запроса, поэтому
+пропадает вместе с её откатом и не задерживает ответ. Отправляет письма
+процесс `manage.py send_outbox` пачками через одно соединение с почтовым
+сервером. Если EMAIL_OUTBOX_WORKER выключен (тесты), письмо отправляется
+сразу после фиксации транзакции тем же процессом, ещё до ответа; неудачное
+письмо остаётся в очереди до запуска send_outbox.
+
+Перед отправкой пачка «арендуется»: следующая попытка переносится на
+EMAIL_OUTBOX_LEASE секунд вперёд, чтобы её не взял другой процесс. Если
+процесс упал, после аренды письма отправятся снова. Неудачная попытка
+откладывается с удвоением задержки, начиная с EMAIL_OUTBOX_RETRY_DELAY.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import connection as db_connection
+from django.db import transaction
+from django.utils import timezone
+
+from users.models import OutgoingEmail
+
+
+def enqueue_email(subject, body, recipient):
+    """Ставит письмо в очередь в текущей транзакции."""
+    email = OutgoingEmail.objects.create(
+        subject=subject, body=body, recipient=recipient
+    )
+    if not settings.EMAIL_OUTBOX_WORKER:
+        transaction.on_commit(lambda: send_emails(
+            OutgoingEmail.objects.filter(pk=email.pk)
+        ))
+    return email
+
+
+def due_emails(now=None):
+    return OutgoingEmail.objects.filter(
+        attempts__lt=settings.EMAIL_OUTBOX_MAX_ATTEMPTS,
+        next_attempt__lte=now or timezone.now(),
+    )
+
+
+def claim(queryset, batch_size):
+    """Арендует до batch_size писем из queryset и возвращает их."""
+    now = timezone.now()
+    with transaction.atomic():
+        if db_connection.features.has_select_for_update_skip_locked:
+            queryset = queryset.select_for_update(skip_locked=True)
+        emails = list(queryset.order_by('next_attempt', 'id')[:batch_size])
+        OutgoingEmail.objects.filter(
+            pk__in=[email.pk for email in emails]
+        ).update(
+            next_attempt=now + timedelta(seconds=settings.EMAIL_OUTBOX_LEASE)
+        )
+    return emails
+
+
+def retry_delay(attempts):
+    return timedelta(
+        seconds=settings.EMAIL_OUTBOX_RETRY_DELAY * 2 ** (attempts - 1)
+    )
+
+
+def send_emails(queryset, batch_size=None, connection=None):
+    """Отправляет пачку писем из queryset через одно соединение.
+
+    Соединение открывается перед первым письмом и после ошибки: иначе
+    бэкенд соединялся бы с сервером для каждого письма. Переданное
+    connection остаётся открытым для следующих пачек, своё закрывается.
+    Возвращает пару (отправлено, не отправлено).
+    """
+    emails = claim(queryset, batch_size or settings.EMAIL_OUTBOX_BATCH_SIZE)
+    if not emails:
+        return 0, 0
+    own_connection = connection is None
+    connection = connection or get_connection()
+    sent, failed = [], []
+    try:
+        for email in emails:
+            message = EmailMessage(
+                email.subject, email.body, settings.DEFAULT_FROM_EMAIL,
+                (email.recipient,), connection=connection,
+            )
+            try:
+                # Уже открытое соединение open не трогает.
+                connection.open()
+                message.send()
+            # Ошибка одного письма не должна останавливать отправку
+            # остальных, а бэкенды бросают самые разные исключения.
+            except Exception as error:
+                email.attempts += 1
+                email.last_error = f'{type(error).__name__}: {error}'
+                email.next_attempt = (
+                    timezone.now() + retry_delay(email.attempts)
+                )
+                failed.append(email)
+                # Соединение после ошибки может быть испорчено.
+                connection.close()
+            else:
+                sent.append(email.pk)
+    finally:
+        if own_connection:
+            connection.close()
+    OutgoingEmail.objects.filter(pk__in=sent).delete()
+    OutgoingEmail.objects.bulk_update(
+        failed, ('attempts', 'last_error', 'next_attempt')
+    )
+    return len(sent), len(failed)
@@ -0,0 +1,92 @@
+"""JWT с данными пользователя в утверждениях (claims).
+
+Токен из UserAccessToken.for_user содержит имя, роль, флаги
+администратора и версию токенов пользователя. По ним собирается
+пользователь без запроса к базе (user_from_claims), а отзыв проверяется
+по текущей версии из кеша VERSIONS_CACHE. Версия в кеше меняется после
+коммита изменения роли, имени, флагов или удаления пользователя; при
+промахе кеша она читается из базы. Запись живёт TOKEN_VERSION_TIMEOUT
+секунд, поэтому процессы с локальным кешем видят отзыв из другого
+процесса не позже чем через этот срок.
+"""
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+VERSION_CLAIM = 'ver'
+# Поля пользователя, которые переносятся в утверждения токена.
+CLAIM_FIELDS = ('username', 'role', 'is_staff', 'is_superuser')
+# Версия удалённого или заблокированного пользователя: не совпадает ни с
+# одной выданной.
+REVOKED = -1
+
+
+def version_key(user_id):
+    return f'token-version:{user_id}'
+
+
+def token_version(user_id):
+    """Текущая версия токенов пользователя, REVOKED — если входить нельзя."""
+    cache = caches[settings.VERSIONS_CACHE]
+    version = cache.get(version_key(user_id))
+    if version is None:
+        version = get_user_model().objects.filter(
+            pk=user_id, is_active=True
+        ).values_list('token_version', flat=True).first()
+        if version is None:
+            version = REVOKED
+        # add не перезапишет версию, записанную после коммита изменения,
+        # пока значение читалось из базы.
+        cache.add(
+            version_key(user_id), version, settings.TOKEN_VERSION_TIMEOUT
+        )
+    return version
+
+
+def set_token_version(user_id, version):
+    caches[settings.VERSIONS_CACHE].set(
+        version_key(user_id), version, settings.TOKEN_VERSION_TIMEOUT
+    )
+
+
+class UserAccessToken(AccessToken):
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        for name in CLAIM_FIELDS:
+            token[name] = getattr(user, name)
+        token[VERSION_CLAIM] = user.token_version
+        return token
+
+
+def has_user_claims(token):
+    return all(
+        name in token.payload for name in (*CLAIM_FIELDS, VERSION_CLAIM)
+    )
+
+
+def user_from_claims(token):
+    """Пользователь из утверждений токена, без запроса к базе.
+
+    Остальные поля отложены (как после only()) и загружаются из базы при
+    первом обращении; save() записывает только загруженные поля.
+    """
+    claims = {
+        'id': token[api_settings.USER_ID_CLAIM],
+        **{name: token[name] for name in CLAIM_FIELDS},
+        'is_active': True,
+        'token_version': token[VERSION_CLAIM],
+    }
+    model = get_user_model()
+    # from_db ждёт значения в порядке полей модели.
+    fields = [
+        field.attname for field in model._meta.concrete_fields
+        if field.attname in claims
+    ]
+    return model.from_db(
+        DEFAULT_DB_ALIAS, fields, [claims[name] for name in fields]
+    )
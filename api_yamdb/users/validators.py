@@ -0,0 +1,18 @@
+import re
+
+from django.core.exceptions import ValidationError
+
+USERNAME_PATTERN = re.compile(r'^[\w.@+-]+\Z')
+FORBIDDEN_USERNAMES = ('me',)
+
+
+def validate_username(value):
+    if value in FORBIDDEN_USERNAMES:
+        raise ValidationError(
+            f'Использовать имя `{value}` в качестве username запрещено.'
+        )
+    if not USERNAME_PATTERN.match(value):
+        raise ValidationError(
+            'Username может содержать только буквы, цифры и символы @.+-_'
+        )
+    return value
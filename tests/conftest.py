@@ -1,6 +1,7 @@
 import os
 import sys
 
+import pytest
 from django.utils.version import get_version
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -33,3 +34,74 @@ assert get_version() < '4.0.0', 'Пожалуйста, используйте в
 pytest_plugins = [
     'tests.fixtures.fixture_user',
 ]
+
+
+def clear_caches():
+    from django.core.cache import cache
+
+    from api.authentication import ClaimsJWTAuthentication
+    from api.throttling import local_buckets
+
+    cache.clear()
+    ClaimsJWTAuthentication.verified_tokens.clear()
+    local_buckets.clear()
+
+
+@pytest.fixture(autouse=True)
+def isolated_caches():
+    """Кеши и корзины ограничения частоты не переходят из теста в тест."""
+    clear_caches()
+    yield
+    clear_caches()
+
+
+@pytest.fixture(autouse=True)
+def inline_email_outbox(settings):
+    """Письма отправляются в запросе, чтобы тесты видели mail.outbox."""
+    settings.EMAIL_OUTBOX_WORKER = False
+
+
+@pytest.fixture
+def claims_client():
+    """Клиент с токеном, в утверждениях которого записан пользователь."""
+    from rest_framework.test import APIClient
+
+    from users.tokens import UserAccessToken
+
+    def make_client(user):
+        client = APIClient()
+        client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {UserAccessToken.for_user(user)}'
+        )
+        return client
+
+    return make_client
+
+
+@pytest.fixture
+def make_titles():
+    """Создаёт count произведений с категориями и разным числом жанров.
+
+    Произведения получают названия name.format(номер) и годы из years по
+    кругу, категории и жанры назначаются по остатку от номера.
+    """
+    from reviews.models import Category, Genre, Title
+
+    categories = [
+        Category.objects.create(name=f'Категория {number}',
+                                slug=f'category-{number}')
+        for number in range(3)
+    ]
+    genres = [
+        Genre.objects.create(name=f'Жанр {number}', slug=f'genre-{number}')
+        for number in range(4)
+    ]
+
+    def make(count, name='Произведение {}', years=(2000,)):
+        for number in range(count):
+            title = Title.objects.create(
+                name=name.format(number), year=years[number % len(years)],
+                category=categories[number % len(categories)],
+            )
+            title.genre.set(genres[:number % len(genres) + 1])
+    return make
@@ -0,0 +1,266 @@
+import csv
+import os
+import shutil
+from io import StringIO
+from pathlib import Path
+
+import pytest
+from django.core.management import call_command
+
+from tests.conftest import MANAGE_PATH
+
+DATA_DIR = os.path.join(MANAGE_PATH, 'static', 'data')
+
+
+def csv_rows_count(filename):
+    with open(os.path.join(DATA_DIR, filename), encoding='utf-8',
+              newline='') as csv_file:
+        return sum(1 for _ in csv.DictReader(csv_file))
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08ImportCSV:
+
+    def test_01_import_all_files(self, django_user_model):
+        from reviews.models import (Category, Comment, Genre, GenreTitle,
+                                    Review, Title)
+
+        call_command('import_csv', batch_size=10, stdout=StringIO())
+
+        expected = (
+            ('users.csv', django_user_model),
+            ('category.csv', Category),
+            ('genre.csv', Genre),
+            ('titles.csv', Title),
+            ('genre_title.csv', GenreTitle),
+            ('review.csv', Review),
+            ('comments.csv', Comment),
+        )
+        for filename, model in expected:
+            assert model.objects.count() == csv_rows_count(filename), (
+                'Проверьте, что команда `import_csv` загружает все строки '
+                f'из файла `{filename}`.'
+            )
+
+    def test_02_import_keeps_multiline_text(self):
+        from reviews.models import Review
+
+        call_command('import_csv', stdout=StringIO())
+
+        review = Review.objects.get(pk=1)
+        assert '\n' in review.text and review.score == 10, (
+            'Проверьте, что команда `import_csv` сохраняет многострочные '
+            'тексты отзывов из `review.csv`.'
+        )
+
+    def test_03_sequences_reset_after_import(self, admin_client):
+        call_command('import_csv', stdout=StringIO())
+
+        response = admin_client.post(
+            '/api/v1/categories/', data={'name': 'Игры', 'slug': 'games'}
+        )
+        assert response.status_code == 201, (
+            'Проверьте, что после выполнения `import_csv` новые объекты '
+            'создаются без конфликта первичных ключей.'
+        )
+
+    def test_04_import_reports_progress(self):
+        out = StringIO()
+        call_command(
+            'import_csv', batch_size=10, report_every=20, stdout=out
+        )
+        output = out.getvalue()
+        assert 'review.csv: 20 строк' in output, (
+            'Проверьте, что команда `import_csv` выводит прогресс загрузки '
+            'каждые `--report-every` строк.'
+        )
+        assert 'строк/с' in output, (
+            'Проверьте, что команда `import_csv` выводит скорость загрузки '
+            'в строках в секунду.'
+        )
+
+    def test_05_incremental_import_touches_only_delta(self, tmp_path):
+        from reviews.models import Review, Title
+
+        data_dir = tmp_path / 'data'
+        shutil.copytree(DATA_DIR, data_dir)
+        call_command('import_csv', incremental=True, path=data_dir,
+                     stdout=StringIO())
+
+        titles_path = data_dir / 'titles.csv'
+        titles = titles_path.read_text(encoding='utf-8')
+        titles_path.write_text(
+            titles.replace('Побег из Шоушенка', 'Побег', 1), encoding='utf-8'
+        )
+        with open(data_dir / 'review.csv', encoding='utf-8',
+                  newline='') as csv_file:
+            reader = csv.DictReader(csv_file)
+            fieldnames, reviews = reader.fieldnames, list(reader)
+        with open(data_dir / 'review.csv', 'w', encoding='utf-8',
+                  newline='') as csv_file:
+            writer = csv.DictWriter(csv_file, fieldnames=fieldnames)
+            writer.writeheader()
+            writer.writerows(reviews[1:])
+
+        out = StringIO()
+        call_command('import_csv', incremental=True, path=data_dir,
+                     stdout=out)
+        output = out.getvalue()
+
+        assert Title.objects.get(pk=1).name == 'Побег', (
+            'Проверьте, что инкрементальный импорт обновляет изменённые '
+            'строки.'
+        )
+        assert not Review.objects.filter(pk=reviews[0]['id']).exists(), (
+            'Проверьте, что инкрементальный импорт удаляет строки, '
+            'исчезнувшие из файла.'
+        )
+        assert 'titles.csv: добавлено — 0, обновлено — 1' in output, (
+            'Проверьте, что инкрементальный импорт не обновляет строки, '
+            'содержимое которых не изменилось.'
+        )
+        assert f'без изменений — {len(reviews) - 1}, удалено — 1' in output
+
+    def test_06_incremental_import_keeps_api_users(self, user,
+                                                   django_user_model):
+        call_command('import_csv', incremental=True, stdout=StringIO())
+        call_command('import_csv', incremental=True, stdout=StringIO())
+        assert django_user_model.objects.filter(pk=user.pk).exists(), (
+            'Проверьте, что инкрементальный импорт удаляет только строки, '
+            'ранее загруженные из CSV.'
+        )
+
+    def test_07_parallel_import(self, django_user_model):
+        from reviews.models import (Category, Comment, Genre, GenreTitle,
+                                    Review, Title)
+
+        output = StringIO()
+        call_command('import_csv', workers=2, chunks=2, stdout=output)
+        for filename, model in (
+            ('users.csv', django_user_model),
+            ('category.csv', Category),
+            ('genre.csv', Genre),
+            ('titles.csv', Title),
+            ('genre_title.csv', GenreTitle),
+            ('review.csv', Review),
+            ('comments.csv', Comment),
+        ):
+            assert model.objects.count() == csv_rows_count(filename), (
+                'Проверьте, что `import_csv --workers 2 --chunks 2` '
+                f'загружает все строки из `{filename}`.'
+            )
+        assert '\n' in Review.objects.get(pk=1).text
+        assert 'Импорт завершён.' in output.getvalue()
+
+    def test_08_parallel_import_rolls_back_file(self, tmp_path,
+                                                django_user_model):
+        from reviews.models import Title
+
+        data_dir = tmp_path / 'data'
+        shutil.copytree(DATA_DIR, data_dir)
+        titles_path = data_dir / 'titles.csv'
+        titles = titles_path.read_text(encoding='utf-8').rstrip('\n')
+        titles_path.write_text(
+            f'{titles}\n9999,Без года,неизвестно,1\n', encoding='utf-8'
+        )
+        with pytest.raises(ValueError):
+            call_command('import_csv', workers=2, chunks=2, path=data_dir,
+                         batch_size=5, stdout=StringIO())
+        assert not Title.objects.exists(), (
+            'Проверьте, что ошибка в файле откатывает его загрузку целиком.'
+        )
+        assert django_user_model.objects.count() == csv_rows_count(
+            'users.csv'
+        )
+
+    def test_09_incremental_import_revokes_tokens(self, tmp_path,
+                                                  claims_client,
+                                                  django_user_model):
+        data_dir = tmp_path / 'data'
+        shutil.copytree(DATA_DIR, data_dir)
+        call_command('import_csv', incremental=True, path=data_dir,
+                     stdout=StringIO())
+        admin_client = claims_client(
+            django_user_model.objects.get(username='capt_obvious')
+        )
+        user_client = claims_client(
+            django_user_model.objects.get(username='bingobongo')
+        )
+        assert admin_client.get('/api/v1/users/').status_code == 200
+
+        users_path = data_dir / 'users.csv'
+        users = users_path.read_text(encoding='utf-8')
+        users_path.write_text(users.replace(
+            'capt_obvious@yamdb.fake,admin', 'capt_obvious@yamdb.fake,user'
+        ), encoding='utf-8')
+        call_command('import_csv', incremental=True, path=data_dir,
+                     stdout=StringIO())
+
+        assert admin_client.get('/api/v1/users/').status_code == 401, (
+            'Проверьте, что инкрементальный импорт, меняющий роль '
+            'пользователя, отзывает его токены.'
+        )
+        assert user_client.get('/api/v1/users/me/').status_code == 200, (
+            'Проверьте, что токены пользователей, чьи строки не изменились, '
+            'остаются действительными.'
+        )
+
+
+def test_batched_is_lazy():
+    from reviews.csv_import import batched
+
+    consumed = []
+
+    def rows():
+        for number in range(25):
+            consumed.append(number)
+            yield number
+
+    batches = batched(rows(), 10)
+    assert next(batches) == list(range(10))
+    assert len(consumed) == 10, (
+        'Проверьте, что `batched` читает источник по одной пачке, '
+        'а не целиком.'
+    )
+    assert [len(batch) for batch in batches] == [10, 5]
+
+
+def test_dependency_levels():
+    from reviews.csv_import import CSV_FILES, dependency_levels
+
+    levels = dependency_levels([filename for filename, _, _ in CSV_FILES])
+    assert levels[0] == ['category.csv', 'genre.csv', 'users.csv'], (
+        'Проверьте, что независимые файлы попадают в первый уровень '
+        'графа зависимостей.'
+    )
+    position = {
+        filename: number
+        for number, level in enumerate(levels) for filename in level
+    }
+    for dependent, dependency in (
+            ('titles.csv', 'category.csv'),
+            ('genre_title.csv', 'titles.csv'),
+            ('review.csv', 'titles.csv'),
+            ('review.csv', 'users.csv'),
+            ('comments.csv', 'review.csv'),
+    ):
+        assert position[dependent] > position[dependency], (
+            f'Проверьте, что `{dependent}` загружается после '
+            f'`{dependency}`.'
+        )
+
+
+@pytest.mark.parametrize('chunks', (1, 2, 5, 50))
+def test_split_file_keeps_multiline_records(chunks):
+    from reviews.csv_import import read_rows, split_file
+
+    path = Path(DATA_DIR) / 'review.csv'
+    rows = list(read_rows(path))
+    chunked_rows = [
+        row for chunk in split_file(path, chunks)
+        for row in read_rows(path, chunk)
+    ]
+    assert chunked_rows == rows, (
+        'Проверьте, что части файла из `split_file` вместе содержат все '
+        'записи и не разрывают многострочные поля.'
+    )
@@ -0,0 +1,64 @@
+import csv
+from collections import Counter
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+GENERATED_FILES = (
+    'users.csv', 'category.csv', 'genre.csv', 'titles.csv',
+    'genre_title.csv', 'review.csv', 'comments.csv',
+)
+
+
+def generate(output, scale=3, seed=7):
+    call_command(
+        'generate_csv', str(output), scale=scale, seed=seed,
+        stdout=StringIO()
+    )
+
+
+class Test09GenerateCSV:
+
+    def test_01_generation_is_deterministic(self, tmp_path):
+        generate(tmp_path / 'first')
+        generate(tmp_path / 'second')
+        generate(tmp_path / 'other', seed=8)
+        for filename in GENERATED_FILES:
+            first = (tmp_path / 'first' / filename).read_bytes()
+            assert first == (tmp_path / 'second' / filename).read_bytes(), (
+                'Проверьте, что при одинаковом `--seed` команда '
+                f'`generate_csv` создаёт одинаковый `{filename}`.'
+            )
+        assert (
+            (tmp_path / 'first' / 'review.csv').read_bytes()
+            != (tmp_path / 'other' / 'review.csv').read_bytes()
+        ), 'Проверьте, что `--seed` влияет на сгенерированные данные.'
+
+    def test_02_reviews_are_skewed(self, tmp_path):
+        generate(tmp_path, scale=20)
+        with open(tmp_path / 'review.csv', encoding='utf-8',
+                  newline='') as csv_file:
+            rows = list(csv.DictReader(csv_file))
+        per_title = Counter(row['title_id'] for row in rows)
+        assert per_title.most_common(1)[0][1] > 5 * len(rows) / 640, (
+            'Проверьте, что отзывы распределены неравномерно: у самых '
+            'популярных произведений должно быть намного больше отзывов.'
+        )
+        pairs = Counter((row['title_id'], row['author']) for row in rows)
+        assert max(pairs.values()) == 1, (
+            'Проверьте, что один автор не пишет два отзыва на одно '
+            'произведение.'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_generated_data_can_be_imported(self, tmp_path):
+        from reviews.models import Comment, Review, Title
+
+        generate(tmp_path)
+        call_command('import_csv', path=tmp_path, stdout=StringIO())
+        for model, source_rows in ((Title, 32), (Review, 72), (Comment, 3)):
+            assert model.objects.count() == source_rows * 3, (
+                'Проверьте, что файлы `generate_csv` загружаются командой '
+                '`import_csv` и объём данных увеличен в `--scale` раз.'
+            )
@@ -0,0 +1,140 @@
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10StoredRating:
+
+    def get_title(self, client, title_id):
+        response = client.get(f'/api/v1/titles/{title_id}/')
+        assert response.status_code == HTTPStatus.OK
+        return response.json()
+
+    def test_01_rating_follows_review_changes(self, admin_client,
+                                              user_client, moderator_client):
+        from reviews.models import Title
+
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        url = f'/api/v1/titles/{title_id}/reviews/'
+
+        review = create_single_review(user_client, title_id, 'Хорошо', 8)
+        create_single_review(moderator_client, title_id, 'Так себе', 4)
+        title = Title.objects.get(pk=title_id)
+        assert (title.score_sum, title.score_count) == (12, 2), (
+            'Проверьте, что при создании отзыва сумма и число оценок '
+            'произведения увеличиваются.'
+        )
+        assert self.get_title(admin_client, title_id)['rating'] == 6
+
+        response = user_client.patch(
+            f'{url}{review.json()["id"]}/', data={'score': 10}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert self.get_title(admin_client, title_id)['rating'] == 7, (
+            'Проверьте, что при изменении оценки в отзыве рейтинг '
+            'произведения пересчитывается.'
+        )
+
+        response = user_client.patch(
+            f'{url}{review.json()["id"]}/', data={'text': 'Отлично'}
+        )
+        title.refresh_from_db()
+        assert (title.score_sum, title.score_count) == (14, 2), (
+            'Проверьте, что изменение текста отзыва не меняет рейтинг.'
+        )
+
+        response = user_client.delete(f'{url}{review.json()["id"]}/')
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert self.get_title(admin_client, title_id)['rating'] == 4, (
+            'Проверьте, что при удалении отзыва рейтинг произведения '
+            'пересчитывается.'
+        )
+
+    def test_02_rating_follows_author_deletion(self, admin_client, user,
+                                               user_client):
+        from reviews.models import Title
+
+        titles, _, _ = create_titles(admin_client)
+        create_single_review(user_client, titles[0]['id'], 'Хорошо', 8)
+        user.delete()
+        title = Title.objects.get(pk=titles[0]['id'])
+        assert (title.score_sum, title.score_count) == (0, 0), (
+            'Проверьте, что каскадное удаление отзывов обновляет рейтинг.'
+        )
+        assert title.rating is None
+
+    def test_03_title_list_does_not_aggregate_reviews(self, client,
+                                                      admin_client,
+                                                      user_client):
+        titles, _, _ = create_titles(admin_client)
+        create_single_review(user_client, titles[0]['id'], 'Хорошо', 8)
+        with CaptureQueriesContext(connection) as context:
+            response = client.get('/api/v1/titles/')
+            client.get(f'/api/v1/titles/{titles[0]["id"]}/')
+        assert response.status_code == HTTPStatus.OK
+        assert not any(
+            'reviews_review' in query['sql']
+            for query in context.captured_queries
+        ), (
+            'Проверьте, что при чтении произведений рейтинг не '
+            'рассчитывается по таблице отзывов.'
+        )
+
+    def test_04_stale_review_keeps_rating(self, user):
+        from reviews.models import Review, Title
+
+        title = Title.objects.create(name='Сталкер', year=1979)
+        review = Review.objects.create(
+            title=title, author=user, text='Хорошо', score=5
+        )
+        first = Review.objects.get(pk=review.pk)
+        second = Review.objects.get(pk=review.pk)
+        first.score = 7
+        first.save()
+        second.score = 9
+        second.save()
+        title.refresh_from_db()
+        assert (title.score_sum, title.score_count) == (9, 1), (
+            'Проверьте, что изменение оценки считается от оценки в базе, '
+            'а не от загруженной раньше параллельного изменения.'
+        )
+
+    def test_05_refresh_ratings_fixes_drift(self):
+        from reviews.models import Title
+
+        call_command('import_csv', stdout=StringIO())
+        expected = dict(
+            Title.objects.values_list('pk', 'score_sum')
+        )
+        Title.objects.filter(pk__in=(1, 2, 30)).update(
+            score_sum=0, score_count=0
+        )
+
+        out = StringIO()
+        call_command('refresh_ratings', to_id=10, dry_run=True, stdout=out)
+        assert 'Найдено расхождений: 2.' in out.getvalue(), (
+            'Проверьте, что `refresh_ratings --dry-run` сообщает о '
+            'расхождениях только в заданном диапазоне id.'
+        )
+        assert Title.objects.get(pk=1).score_sum == 0, (
+            'Проверьте, что `refresh_ratings --dry-run` ничего не изменяет.'
+        )
+
+        out = StringIO()
+        call_command('refresh_ratings', stdout=out)
+        assert 'Исправлено: 3.' in out.getvalue()
+        assert dict(
+            Title.objects.values_list('pk', 'score_sum')
+        ) == expected, (
+            'Проверьте, что `refresh_ratings` восстанавливает сумму оценок '
+            'по отзывам.'
+        )
+        assert not Title.objects.drifted().exists()
@@ -0,0 +1,110 @@
+from http import HTTPStatus
+
+import pytest
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from tests.utils import create_single_comment, create_single_review
+
+
+def collect_pages(client, url):
+    results = []
+    pages = 0
+    while url:
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{url}` возвращает ответ со '
+            'статусом 200.'
+        )
+        data = response.json()
+        for key in ('next', 'previous', 'results'):
+            assert key in data, (
+                'Проверьте, что ответ с курсорной пагинацией содержит ключ '
+                f'`{key}`.'
+            )
+        assert 'count' not in data, (
+            'Проверьте, что ответ с курсорной пагинацией не содержит '
+            '`count`: подсчёт всех строк и есть то, от чего он избавляет.'
+        )
+        results.extend(data['results'])
+        pages += 1
+        url = data['next']
+    return results, pages
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11CursorPagination:
+
+    @pytest.fixture
+    def titles(self):
+        from reviews.models import Category, Title
+
+        category = Category.objects.create(name='Фильм', slug='films')
+        return [
+            Title.objects.create(
+                name=f'Произведение {number}', year=2000, category=category
+            )
+            for number in range(25)
+        ]
+
+    def test_01_titles_cursor_pagination(self, client, titles):
+        results, pages = collect_pages(
+            client, '/api/v1/titles/?pagination=cursor'
+        )
+        assert pages == 3
+        assert [title['id'] for title in results] == sorted(
+            title.pk for title in titles
+        ), (
+            'Проверьте, что курсорная пагинация `/api/v1/titles/` '
+            'возвращает каждое произведение ровно один раз.'
+        )
+
+    def test_02_offset_pagination_is_default(self, client, titles):
+        data = client.get('/api/v1/titles/').json()
+        assert data['count'] == len(titles), (
+            'Проверьте, что без параметра `pagination` используется '
+            'пагинация с ключом `count`.'
+        )
+
+    def test_03_reviews_and_comments_cursor_pagination(
+            self, client, admin_client, titles, django_user_model):
+        title_id = titles[0].pk
+        authors = [
+            django_user_model.objects.create_user(
+                username=f'author{number}', email=f'a{number}@yamdb.fake'
+            )
+            for number in range(12)
+        ]
+        review_ids = []
+        for author in authors:
+            author_client = APIClient()
+            author_client.credentials(
+                HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(author)}'
+            )
+            review_ids.append(create_single_review(
+                author_client, title_id, f'Отзыв {author}', 5
+            ).json()['id'])
+        for number in range(11):
+            create_single_comment(
+                admin_client, title_id, review_ids[0], f'Комментарий {number}'
+            )
+
+        reviews, pages = collect_pages(
+            client, f'/api/v1/titles/{title_id}/reviews/?pagination=cursor'
+        )
+        assert pages == 2
+        assert sorted(review['id'] for review in reviews) == sorted(
+            review_ids
+        ), (
+            'Проверьте, что курсорная пагинация отзывов возвращает каждый '
+            'отзыв ровно один раз.'
+        )
+        comments, pages = collect_pages(
+            client,
+            f'/api/v1/titles/{title_id}/reviews/{review_ids[0]}/comments/'
+            '?pagination=cursor'
+        )
+        assert pages == 2 and len({c['id'] for c in comments}) == 11, (
+            'Проверьте, что курсорная пагинация комментариев возвращает '
+            'каждый комментарий ровно один раз.'
+        )
@@ -0,0 +1,77 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+
+
+@pytest.fixture
+def create_category():
+    from reviews.models import Category
+
+    def create(number):
+        return Category.objects.create(
+            name=f'Категория {number}', slug=f'category-{number}'
+        )
+    return create
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12PaginationCount:
+    url = '/api/v1/categories/'
+
+    @override_settings(PAGINATION_COUNT_STRATEGY='exact')
+    def test_01_exact_count(self, client, create_category):
+        create_category(1)
+        assert client.get(self.url).json()['count'] == 1
+        create_category(2)
+        assert client.get(self.url).json()['count'] == 2, (
+            'Проверьте, что стратегия `exact` считает строки на каждый '
+            'запрос.'
+        )
+
+    @override_settings(PAGINATION_COUNT_STRATEGY='cached')
+    def test_02_cached_count_per_filter_set(self, client, create_category):
+        create_category(1)
+        assert client.get(self.url).json()['count'] == 1
+        create_category(2)
+        with CaptureQueriesContext(connection) as context:
+            data = client.get(self.url).json()
+        assert data['count'] == 1, (
+            'Проверьте, что стратегия `cached` берёт `count` из кеша.'
+        )
+        assert not any(
+            'COUNT(' in query['sql'] for query in context.captured_queries
+        ), 'Проверьте, что стратегия `cached` не выполняет COUNT(*).'
+        search = client.get(f'{self.url}?search=2').json()
+        assert search['count'] == 1 and len(search['results']) == 1, (
+            'Проверьте, что у каждого набора фильтров свой кеш `count`.'
+        )
+
+    @override_settings(
+        PAGINATION_COUNT_STRATEGY='estimated',
+        PAGINATION_COUNT_ESTIMATE_THRESHOLD=3,
+    )
+    def test_03_estimated_count_is_bounded(self, client, create_category):
+        for number in range(2):
+            create_category(number)
+        with CaptureQueriesContext(connection) as context:
+            data = client.get(self.url).json()
+        assert data['count'] == 2, (
+            'Проверьте, что стратегия `estimated` возвращает точное '
+            'значение, пока строк не больше порога.'
+        )
+        count_queries = [
+            query['sql'] for query in context.captured_queries
+            if 'COUNT(' in query['sql']
+        ]
+        assert count_queries and all(
+            'LIMIT 4' in sql for sql in count_queries
+        ), (
+            'Проверьте, что стратегия `estimated` считает строки не дальше '
+            'порога.'
+        )
+        for number in range(2, 6):
+            create_category(number)
+        assert client.get(self.url).json()['count'] == 6, (
+            'Проверьте, что при отсутствии статистики планировщика '
+            'стратегия `estimated` возвращает точное значение.'
+        )
@@ -0,0 +1,34 @@
+import pytest
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13TitleQueries:
+    # Подсчёт count, страница произведений с категориями, жанры страницы.
+    list_queries = 3
+    # Произведение с категорией и его жанры.
+    detail_queries = 2
+
+    @pytest.mark.parametrize('titles_count', (1, 10, 25))
+    def test_01_title_list_query_count(self, client, make_titles,
+                                       titles_count,
+                                       django_assert_num_queries):
+        make_titles(titles_count)
+        with django_assert_num_queries(self.list_queries):
+            response = client.get('/api/v1/titles/')
+        results = response.json()['results']
+        assert all(
+            title['category'] and title['genre'] for title in results
+        ), (
+            'Проверьте, что ответ `/api/v1/titles/` содержит категорию и '
+            'жанры каждого произведения.'
+        )
+
+    def test_02_title_detail_query_count(self, client, make_titles,
+                                         django_assert_num_queries):
+        from reviews.models import Title
+
+        make_titles(3)
+        title = Title.objects.order_by('pk').last()
+        with django_assert_num_queries(self.detail_queries):
+            response = client.get(f'/api/v1/titles/{title.pk}/')
+        assert len(response.json()['genre']) == 3
@@ -0,0 +1,66 @@
+import re
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+# Строка плана SQLite о полном проходе по таблице или по всему индексу.
+FULL_SCAN = re.compile(r'^SCAN (?:TABLE )?(reviews_\w+|users_\w+)')
+
+
+@pytest.fixture
+def titles(make_titles):
+    make_titles(12, name='Title {}', years=(2000, 2001, 2002))
+
+
+def full_scans(sql):
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+        plan = [row[-1] for row in cursor.fetchall()]
+    return [line for line in plan if FULL_SCAN.match(line)]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14TitleIndexes:
+
+    @pytest.mark.parametrize('query', (
+        'category=category-1',
+        'genre=genre-2',
+        'name_prefix=title 1',
+        'year=2001',
+        'category=category-1&year=2001',
+        'genre=genre-2&year=2001',
+        'category=category-1&genre=genre-2',
+        'category=category-1&genre=genre-2&name_prefix=tit&year=2001',
+    ))
+    def test_01_title_filters_use_indexes(self, client, titles, query):
+        if connection.vendor != 'sqlite':
+            pytest.skip('План запроса проверяется только для SQLite.')
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(f'/api/v1/titles/?{query}')
+        assert response.status_code == 200
+        assert response.json()['results'], (
+            f'Проверьте, что фильтр `/api/v1/titles/?{query}` находит '
+            'произведения.'
+        )
+        for executed in context.captured_queries:
+            scans = full_scans(executed['sql'])
+            assert not scans, (
+                f'Проверьте, что запрос `/api/v1/titles/?{query}` '
+                f'выполняется по индексам, а не полным проходом {scans}: '
+                f'{executed["sql"]}'
+            )
+
+    def test_02_name_filters(self, client, titles):
+        response = client.get('/api/v1/titles/?name_prefix=title 1')
+        names = {title['name'] for title in response.json()['results']}
+        assert names == {'Title 1', 'Title 10', 'Title 11'}, (
+            'Проверьте, что фильтр `name_prefix` ищет произведения по '
+            'началу названия без учёта регистра.'
+        )
+        response = client.get('/api/v1/titles/?name=LE 1')
+        names = {title['name'] for title in response.json()['results']}
+        assert names == {'Title 1', 'Title 10', 'Title 11'}, (
+            'Проверьте, что фильтр `name` ищет произведения по части '
+            'названия без учёта регистра.'
+        )
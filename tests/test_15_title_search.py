@@ -0,0 +1,102 @@
+import pytest
+
+
+@pytest.fixture
+def titles():
+    from reviews.models import Title
+
+    return {
+        name: Title.objects.create(name=name, year=1900, description=text)
+        for name, text in (
+            ('Война и мир', 'Роман Льва Толстого.'),
+            ('Мирный атом', 'Документальный фильм.'),
+            ('Мир', 'Мир, мир и ещё раз мир.'),
+            ('Анна Каренина', 'Ещё один роман Толстого.'),
+        )
+    }
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15TitleSearch:
+    url = '/api/v1/titles/'
+
+    def search(self, client, text):
+        response = client.get(self.url, {'search': text})
+        assert response.status_code == 200, (
+            f'Проверьте, что запрос `{self.url}?search={text}` возвращает '
+            'статус 200.'
+        )
+        return [title['name'] for title in response.json()['results']]
+
+    def test_01_search_name_and_description(self, client, titles):
+        assert set(self.search(client, 'толстого')) == {
+            'Война и мир', 'Анна Каренина'
+        }, (
+            'Проверьте, что параметр `search` ищет по описанию '
+            'произведения без учёта регистра.'
+        )
+        assert self.search(client, 'каренина') == ['Анна Каренина'], (
+            'Проверьте, что параметр `search` ищет по названию произведения.'
+        )
+
+    def test_02_search_matches_prefixes_of_all_words(self, client, titles):
+        assert set(self.search(client, 'мир')) == {
+            'Война и мир', 'Мирный атом', 'Мир'
+        }, 'Проверьте, что параметр `search` ищет слова по префиксу.'
+        assert self.search(client, 'ром тол ан') == ['Анна Каренина'], (
+            'Проверьте, что параметр `search` находит только произведения '
+            'со всеми словами запроса.'
+        )
+
+    def test_03_search_is_ranked(self, client, titles):
+        assert self.search(client, 'мир')[0] == 'Мир', (
+            'Проверьте, что результаты поиска упорядочены по релевантности.'
+        )
+
+    def test_04_search_ignores_query_syntax(self, client, titles):
+        assert self.search(client, '"*') == [], (
+            'Проверьте, что запрос без слов ничего не находит и не '
+            'приводит к ошибке.'
+        )
+        assert self.search(client, '"мир" OR анна') == [], (
+            'Проверьте, что синтаксис FTS5 в запросе экранируется, а слова '
+            'запроса ищутся все одновременно.'
+        )
+
+    def test_05_index_follows_changes(self, client, titles):
+        from reviews.models import Title
+
+        title = titles['Мирный атом']
+        title.name = 'Сталкер'
+        title.save()
+        Title.objects.bulk_create([Title(name='Сталкер 2', year=2000)])
+        assert set(self.search(client, 'сталкер')) == {
+            'Сталкер', 'Сталкер 2'
+        }, (
+            'Проверьте, что поисковый индекс обновляется при изменении и '
+            'массовом создании произведений.'
+        )
+        assert 'Мирный атом' not in self.search(client, 'атом')
+        title.delete()
+        assert self.search(client, 'сталкер') == ['Сталкер 2'], (
+            'Проверьте, что удалённые произведения исчезают из поиска.'
+        )
+
+    def test_06_search_without_index(self, client, titles, monkeypatch):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        # Индекс FTS5 есть только на SQLite: на других СУБД поиск идёт по
+        # подстрокам. В SQLite LIKE не различает регистр только у латиницы,
+        # поэтому слова запроса написаны так же, как в текстах.
+        monkeypatch.setattr(connection, 'vendor', 'postgresql')
+        with CaptureQueriesContext(connection) as context:
+            found = set(self.search(client, 'Толстого ман'))
+        assert found == {'Война и мир', 'Анна Каренина'}, (
+            'Проверьте, что без индекса FTS5 параметр `search` находит '
+            'произведения со всеми словами запроса в названии или описании.'
+        )
+        assert not any(
+            'reviews_title_fts' in query['sql']
+            for query in context.captured_queries
+        ), 'Проверьте, что без индекса FTS5 поиск не обращается к нему.'
@@ -0,0 +1,146 @@
+import pytest
+
+
+@pytest.fixture
+def texts(user, admin):
+    from reviews.models import Comment, Review, Title
+
+    title = Title.objects.create(name='Солярис', year=1972)
+    other = Title.objects.create(name='Зеркало', year=1975)
+    review = Review.objects.create(
+        title=title, author=user, score=9,
+        text=(
+            'Долгий и медленный фильм. ' * 20
+            + 'Океан планеты Солярис — главный герой. '
+            + 'Съёмки <b>в Японии</b> тоже хороши. ' * 20
+        ),
+    )
+    Review.objects.create(
+        title=other, author=user, score=7, text='Воспоминания о детстве.'
+    )
+    Review.objects.create(
+        title=title, author=admin, score=8, text='Про океан и память.'
+    )
+    Comment.objects.create(
+        review=review, author=admin, text='Согласен, океан прекрасен.'
+    )
+    Comment.objects.create(review=review, author=user, text='Спасибо!')
+    return {'title': title, 'other': other, 'review': review}
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16TextSearch:
+    reviews_url = '/api/v1/search/reviews/'
+    comments_url = '/api/v1/search/comments/'
+
+    def search(self, client, url, text, **params):
+        response = client.get(url, {'search': text, **params})
+        assert response.status_code == 200, (
+            f'Проверьте, что запрос `{url}?search={text}` возвращает статус '
+            '200.'
+        )
+        return response.json()
+
+    def count(self, client, url, text):
+        return self.search(client, url, text)['count']
+
+    def test_01_review_search(self, client, texts):
+        data = self.search(client, self.reviews_url, 'океа')
+        assert data['count'] == 2, (
+            'Проверьте, что поиск по отзывам находит слова по префиксу.'
+        )
+        found = data['results'][0]
+        assert set(found) == {
+            'id', 'title', 'author', 'score', 'pub_date', 'snippet'
+        }
+        results = self.search(client, self.reviews_url, 'детстве')['results']
+        assert [review['title'] for review in results] == [
+            texts['other'].pk
+        ], 'Проверьте, что поиск по отзывам возвращает их произведение.'
+
+    def test_02_snippets(self, client, texts):
+        data = self.search(client, self.reviews_url, 'солярис')
+        snippet = data['results'][0]['snippet']
+        assert '<mark>Солярис</mark>' in snippet, (
+            'Проверьте, что найденные слова во фрагменте обрамлены тегом '
+            '`<mark>`.'
+        )
+        assert len(snippet) < len(texts['review'].text) / 4, (
+            'Проверьте, что вместо всего текста отзыва возвращается '
+            'фрагмент вокруг найденных слов.'
+        )
+        snippet = self.search(client, self.reviews_url, 'японии')[
+            'results'
+        ][0]['snippet']
+        assert '&lt;b&gt;' in snippet and '<b>' not in snippet, (
+            'Проверьте, что текст фрагмента экранирован.'
+        )
+
+    def test_03_comment_search(self, client, texts):
+        results = self.search(client, self.comments_url, 'океан')['results']
+        found = [(comment['title'], comment['review']) for comment in results]
+        assert found == [(texts['title'].pk, texts['review'].pk)], (
+            'Проверьте, что поиск по комментариям возвращает произведение и '
+            'отзыв найденного комментария.'
+        )
+        assert results[0]['snippet'] == (
+            'Согласен, <mark>океан</mark> прекрасен.'
+        )
+
+    def test_04_pages(self, client, texts, user):
+        from reviews.models import Comment
+
+        Comment.objects.bulk_create(
+            Comment(review=texts['review'], author=user, text=f'Океан {n}')
+            for n in range(15)
+        )
+        first = self.search(client, self.comments_url, 'океан')
+        assert first['count'] == 16 and len(first['results']) == 10, (
+            'Проверьте, что результаты поиска разбиты на страницы.'
+        )
+        second = self.search(client, self.comments_url, 'океан', page=2)
+        assert len(second['results']) == 6
+
+    def test_05_index_follows_changes(self, client, texts):
+        review = texts['review']
+        review.text = 'Сталкер лучше.'
+        review.save()
+        assert self.count(client, self.reviews_url, 'солярис') == 0
+        assert self.count(client, self.reviews_url, 'сталкер') == 1, (
+            'Проверьте, что поисковый индекс обновляется при изменении '
+            'отзыва.'
+        )
+        review.delete()
+        assert self.count(client, self.reviews_url, 'сталкер') == 0, (
+            'Проверьте, что удалённые отзывы исчезают из поиска.'
+        )
+        assert self.count(client, self.comments_url, 'океан') == 0, (
+            'Проверьте, что комментарии удалённого отзыва исчезают из поиска.'
+        )
+
+    def test_06_empty_query(self, client, texts):
+        assert self.count(client, self.reviews_url, '') == 0
+
+    def test_07_search_without_index(self, client, texts, monkeypatch):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        from reviews.search import SNIPPET_FALLBACK_LENGTH
+
+        # Индекс FTS5 есть только на SQLite: на других СУБД поиск идёт по
+        # подстрокам. В SQLite LIKE не различает регистр только у латиницы,
+        # поэтому слова запроса написаны так же, как в текстах.
+        monkeypatch.setattr(connection, 'vendor', 'postgresql')
+        with CaptureQueriesContext(connection) as context:
+            reviews = self.search(client, self.reviews_url, 'Солярис')
+            comments = self.search(client, self.comments_url, 'океан')
+        assert reviews['count'] == 1 and comments['count'] == 1, (
+            'Проверьте, что без индекса FTS5 поиск по отзывам и комментариям '
+            'находит тексты со словами запроса.'
+        )
+        assert reviews['results'][0]['snippet'] == (
+            texts['review'].text[:SNIPPET_FALLBACK_LENGTH]
+        ), 'Проверьте, что без индекса FTS5 фрагмент — начало текста.'
+        assert not any(
+            '_fts' in query['sql'] for query in context.captured_queries
+        ), 'Проверьте, что без индекса FTS5 поиск не обращается к нему.'
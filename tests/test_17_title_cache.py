@@ -0,0 +1,156 @@
+import pytest
+
+
+@pytest.fixture
+def title(user):
+    from reviews.models import Category, Genre, Review, Title
+
+    category = Category.objects.create(name='Фильм', slug='movie')
+    title = Title.objects.create(name='Солярис', year=1972, category=category)
+    title.genre.set([
+        Genre.objects.create(name='Драма', slug='drama'),
+        Genre.objects.create(name='Фантастика', slug='sci-fi'),
+    ])
+    Review.objects.create(title=title, author=user, text='Да', score=8)
+    return title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17TitleCache:
+
+    def get(self, client, title, django_assert_num_queries, queries):
+        with django_assert_num_queries(queries):
+            response = client.get(f'/api/v1/titles/{title.pk}/')
+        assert response.status_code == 200
+        return response.json()
+
+    def test_01_detail_served_from_cache(self, client, title,
+                                         django_assert_num_queries):
+        first = self.get(client, title, django_assert_num_queries, 2)
+        second = self.get(client, title, django_assert_num_queries, 0)
+        assert first == second, (
+            'Проверьте, что повторный запрос `/api/v1/titles/{id}/` отдаёт '
+            'то же произведение из кеша, не обращаясь к базе данных.'
+        )
+
+    def test_02_missing_title(self, client, title):
+        response = client.get(f'/api/v1/titles/{title.pk + 100}/')
+        assert response.status_code == 404
+
+    def test_03_title_and_genres_change(self, admin_client, client, title,
+                                        django_assert_num_queries):
+        self.get(client, title, django_assert_num_queries, 2)
+        admin_client.patch(
+            f'/api/v1/titles/{title.pk}/',
+            data={'name': 'Сталкер', 'genre': ['drama']}, format='json',
+        )
+        data = self.get(client, title, django_assert_num_queries, 2)
+        assert data['name'] == 'Сталкер' and [
+            genre['slug'] for genre in data['genre']
+        ] == ['drama'], (
+            'Проверьте, что кеш произведения сбрасывается при изменении '
+            'произведения и его жанров.'
+        )
+        title.genre.remove(*title.genre.all())
+        assert self.get(client, title, django_assert_num_queries, 2)[
+            'genre'
+        ] == []
+
+    def test_04_category_and_genre_change(self, client, title,
+                                          django_assert_num_queries):
+        from reviews.models import Category, Genre
+
+        self.get(client, title, django_assert_num_queries, 2)
+        category = Category.objects.get(slug='movie')
+        category.name = 'Кино'
+        category.save()
+        assert self.get(client, title, django_assert_num_queries, 2)[
+            'category'
+        ]['name'] == 'Кино', (
+            'Проверьте, что кеш произведения сбрасывается при изменении '
+            'его категории.'
+        )
+        Genre.objects.get(slug='sci-fi').delete()
+        assert len(self.get(
+            client, title, django_assert_num_queries, 2
+        )['genre']) == 1, (
+            'Проверьте, что кеш произведения сбрасывается при удалении '
+            'его жанра.'
+        )
+        category.delete()
+        assert self.get(client, title, django_assert_num_queries, 2)[
+            'category'
+        ] is None
+
+    def test_05_reviews_change_rating(self, client, title, admin,
+                                      django_assert_num_queries):
+        from reviews.models import Review
+
+        assert self.get(client, title, django_assert_num_queries, 2)[
+            'rating'
+        ] == 8
+        review = Review.objects.create(
+            title=title, author=admin, text='Нет', score=2
+        )
+        assert self.get(client, title, django_assert_num_queries, 2)[
+            'rating'
+        ] == 5, (
+            'Проверьте, что кеш произведения сбрасывается при добавлении '
+            'отзыва.'
+        )
+        review.score = 4
+        review.save()
+        assert self.get(client, title, django_assert_num_queries, 2)[
+            'rating'
+        ] == 6
+        review.delete()
+        assert self.get(client, title, django_assert_num_queries, 2)[
+            'rating'
+        ] == 8, (
+            'Проверьте, что кеш произведения сбрасывается при удалении '
+            'отзыва.'
+        )
+
+    def test_06_bulk_rating_refresh(self, client, title,
+                                    django_assert_num_queries):
+        from reviews.models import Title
+
+        self.get(client, title, django_assert_num_queries, 2)
+        Title.objects.update(score_sum=0, score_count=0)
+        self.get(client, title, django_assert_num_queries, 0)
+        Title.objects.refresh_ratings()
+        # Общая версия ALL перечитывает и справочники категорий и жанров.
+        assert self.get(client, title, django_assert_num_queries, 4)[
+            'rating'
+        ] == 8, (
+            'Проверьте, что пересчёт рейтингов сбрасывает кеш произведений.'
+        )
+
+    def test_07_other_titles_stay_cached(self, client, title, user,
+                                         django_assert_num_queries):
+        from reviews.models import Review, Title
+
+        other = Title.objects.create(name='Зеркало', year=1975)
+        self.get(client, title, django_assert_num_queries, 2)
+        Review.objects.create(title=other, author=user, text='Да', score=9)
+        self.get(client, title, django_assert_num_queries, 0)
+
+    def test_08_versions_expire(self, client, title, settings):
+        import time
+
+        from django.core.cache import cache
+
+        from reviews.models import Title
+
+        settings.VERSIONS_TIMEOUT = 0.2
+        cache.clear()
+        assert client.get(f'/api/v1/titles/{title.pk}/').status_code == 200
+        # Изменение из другого процесса не трогает версии этого процесса.
+        Title.objects.filter(pk=title.pk).update(name='Сталкер')
+        time.sleep(0.3)
+        assert client.get(f'/api/v1/titles/{title.pk}/').json()[
+            'name'
+        ] == 'Сталкер', (
+            'Проверьте, что версии живут не дольше `VERSIONS_TIMEOUT` и '
+            'изменения из других процессов становятся видны.'
+        )
@@ -0,0 +1,136 @@
+import pytest
+
+
+@pytest.fixture
+def review(user):
+    from reviews.models import Category, Comment, Genre, Review, Title
+
+    category = Category.objects.create(name='Фильм', slug='movie')
+    Genre.objects.create(name='Драма', slug='drama')
+    title = Title.objects.create(name='Солярис', year=1972, category=category)
+    review = Review.objects.create(
+        title=title, author=user, text='Да', score=8
+    )
+    Comment.objects.create(review=review, author=user, text='Согласен')
+    return review
+
+
+def urls(review):
+    title = review.title
+    return (
+        '/api/v1/categories/',
+        '/api/v1/genres/',
+        '/api/v1/titles/',
+        f'/api/v1/titles/{title.pk}/',
+        f'/api/v1/titles/{title.pk}/reviews/',
+        f'/api/v1/titles/{title.pk}/reviews/{review.pk}/comments/',
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18ConditionalRequests:
+
+    def etag(self, client, url):
+        response = client.get(url)
+        assert response.status_code == 200
+        assert response.has_header('ETag') and response.has_header(
+            'Last-Modified'
+        ), f'Проверьте, что ответ `{url}` содержит ETag и Last-Modified.'
+        return response['ETag']
+
+    def assert_not_modified(self, client, url, etag):
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304, (
+            f'Проверьте, что `{url}` с совпадающим If-None-Match возвращает '
+            'статус 304.'
+        )
+
+    def assert_modified(self, client, url, etag, message):
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200 and response['ETag'] != etag, (
+            message
+        )
+
+    @pytest.mark.parametrize('index', range(6))
+    def test_01_not_modified_without_queries(self, client, review, index,
+                                             django_assert_num_queries):
+        url = urls(review)[index]
+        etag = self.etag(client, url)
+        with django_assert_num_queries(0):
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304 and not response.content, (
+            f'Проверьте, что `{url}` с совпадающим If-None-Match возвращает '
+            'пустой ответ 304, не обращаясь к базе данных.'
+        )
+        assert response['ETag'] == etag
+
+    def test_02_if_modified_since(self, client, review):
+        url = urls(review)[0]
+        last_modified = client.get(url)['Last-Modified']
+        response = client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        assert response.status_code == 304, (
+            'Проверьте, что запрос с If-Modified-Since, не раньше '
+            'Last-Modified, возвращает статус 304.'
+        )
+
+    def test_03_etag_depends_on_query(self, client, review):
+        assert self.etag(client, '/api/v1/titles/') != self.etag(
+            client, '/api/v1/titles/?year=1972'
+        ), 'Проверьте, что ETag зависит от параметров запроса.'
+
+    def test_04_dictionary_change(self, admin_client, client, review):
+        categories, genres, titles, detail = urls(review)[:4]
+        etags = {url: self.etag(client, url) for url in urls(review)}
+        response = admin_client.post(
+            categories, data={'name': 'Книга', 'slug': 'book'}
+        )
+        assert response.status_code == 201
+        for url in (categories, titles, detail):
+            self.assert_modified(
+                client, url, etags[url],
+                f'Проверьте, что ETag `{url}` меняется при изменении '
+                'категорий.',
+            )
+        self.assert_not_modified(client, genres, etags[genres])
+
+    def test_05_review_change(self, client, review, admin):
+        from reviews.models import Review
+
+        categories, _, titles, detail, reviews, comments = urls(review)
+        etags = {url: self.etag(client, url) for url in urls(review)}
+        Review.objects.create(
+            title=review.title, author=admin, text='Нет', score=2
+        )
+        for url in (titles, detail, reviews):
+            self.assert_modified(
+                client, url, etags[url],
+                f'Проверьте, что ETag `{url}` меняется при добавлении '
+                'отзыва.',
+            )
+        self.assert_not_modified(client, comments, etags[comments])
+        self.assert_not_modified(client, categories, etags[categories])
+
+    def test_06_comment_change(self, client, review, admin):
+        from reviews.models import Comment
+
+        *_, reviews, comments = urls(review)
+        etags = {url: self.etag(client, url) for url in urls(review)}
+        Comment.objects.create(review=review, author=admin, text='Нет')
+        self.assert_modified(
+            client, comments, etags[comments],
+            'Проверьте, что ETag комментариев меняется при добавлении '
+            'комментария.',
+        )
+        self.assert_not_modified(client, reviews, etags[reviews])
+
+    def test_07_author_rename(self, client, review, user):
+        *_, reviews, comments = urls(review)
+        etags = {url: self.etag(client, url) for url in urls(review)}
+        user.username = 'Renamed'
+        user.save()
+        for url in (reviews, comments):
+            self.assert_modified(
+                client, url, etags[url],
+                'Проверьте, что ETag отзывов и комментариев меняется при '
+                'изменении имени автора.',
+            )
@@ -0,0 +1,137 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.fixture
+def dictionaries():
+    from reviews.models import Category, Genre
+
+    Category.objects.create(name='Фильм', slug='movie')
+    Genre.objects.create(name='Драма', slug='drama')
+    Genre.objects.create(name='Комедия', slug='comedy')
+
+
+def dictionary_queries(context):
+    return [
+        query['sql'] for query in context.captured_queries
+        if '"reviews_category"' in query['sql']
+        or '"reviews_genre"' in query['sql']
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19Dictionaries:
+    url = '/api/v1/titles/'
+
+    def create_title(self, admin_client, category='movie',
+                     genre=('drama', 'comedy')):
+        return admin_client.post(self.url, data={
+            'name': 'Солярис', 'year': 1972, 'category': category,
+            'genre': list(genre),
+        }, format='json')
+
+    def test_01_write_resolves_slugs_in_memory(self, admin_client,
+                                               dictionaries):
+        with CaptureQueriesContext(connection) as context:
+            response = self.create_title(admin_client)
+        assert response.status_code == 201
+        data = response.json()
+        assert data['category'] == {'name': 'Фильм', 'slug': 'movie'}
+        assert [genre['slug'] for genre in data['genre']] == [
+            'drama', 'comedy'
+        ]
+        assert not dictionary_queries(context), (
+            'Проверьте, что слаги категории и жанров при создании '
+            'произведения ищутся без запросов к базе данных.'
+        )
+
+    def test_02_read_embeds_from_memory(self, admin_client, client,
+                                        dictionaries):
+        title_id = self.create_title(admin_client).json()['id']
+        for url in (self.url, f'{self.url}{title_id}/'):
+            with CaptureQueriesContext(connection) as context:
+                response = client.get(url)
+            assert response.status_code == 200
+            assert not dictionary_queries(context), (
+                f'Проверьте, что `{url}` берёт категории и жанры из '
+                'справочников процесса.'
+            )
+
+    def test_03_unknown_slug(self, admin_client, dictionaries):
+        response = self.create_title(admin_client, category='book')
+        assert response.status_code == 400 and 'category' in response.json()
+        response = self.create_title(admin_client, genre=('drama', 'horror'))
+        assert response.status_code == 400 and 'genre' in response.json()
+
+    def test_04_reload_after_admin_changes(self, admin_client, dictionaries):
+        response = admin_client.post(
+            '/api/v1/categories/', data={'name': 'Книга', 'slug': 'book'}
+        )
+        assert response.status_code == 201
+        response = self.create_title(admin_client, category='book')
+        assert response.status_code == 201, (
+            'Проверьте, что новая категория сразу доступна при создании '
+            'произведения.'
+        )
+        response = admin_client.delete('/api/v1/genres/comedy/')
+        assert response.status_code == 204
+        assert self.create_title(admin_client).status_code == 400, (
+            'Проверьте, что удалённый жанр сразу перестаёт приниматься.'
+        )
+
+    def test_05_reload_on_version_change(self, dictionaries):
+        from reviews.cache import CATEGORIES, touch
+        from reviews.dictionaries import categories
+        from reviews.models import Category
+
+        assert categories.get_by_slug('movie').name == 'Фильм'
+        # Изменение в другом процессе: строка меняется в базе без сигналов
+        # этого процесса, а версия справочника — в общем кеше.
+        Category.objects.filter(slug='movie').update(name='Кино')
+        assert categories.get_by_slug('movie').name == 'Фильм'
+        touch(CATEGORIES)
+        assert categories.get_by_slug('movie').name == 'Кино', (
+            'Проверьте, что справочник перечитывается при смене версии.'
+        )
+
+    def test_06_reload_after_bulk_import(self, client):
+        from io import StringIO
+
+        from django.core.management import call_command
+
+        from reviews.dictionaries import categories, genres
+
+        # Справочники загружены до импорта: пустые таблицы.
+        assert categories.get_by_slug('movie') is None
+        assert genres.get_by_slug('drama') is None
+        call_command('import_csv', stdout=StringIO())
+        data = client.get(f'{self.url}1/').json()
+        assert data['category'] is not None and data['genre'], (
+            'Проверьте, что справочники перечитываются после импорта CSV, '
+            'который меняет только общую версию `ALL`.'
+        )
+
+    def test_07_version_checked_once_per_response(self, admin_client,
+                                                  client, dictionaries,
+                                                  monkeypatch):
+        from reviews import dictionaries as module
+
+        for _ in range(5):
+            assert self.create_title(admin_client).status_code == 201
+        calls = []
+        versions = module.versions
+
+        def counting_versions(names):
+            calls.append(names)
+            return versions(names)
+
+        monkeypatch.setattr(module, 'versions', counting_versions)
+        assert client.get(self.url).status_code == 200
+        assert len(calls) == 2, (
+            'Проверьте, что версии справочников сверяются один раз на '
+            'ответ, а не для каждого произведения и жанра.'
+        )
+        calls.clear()
+        assert self.create_title(admin_client).status_code == 201
+        assert len(calls) <= 2
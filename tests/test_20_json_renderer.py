@@ -0,0 +1,87 @@
+import datetime
+import decimal
+import uuid
+from io import BytesIO
+
+import pytest
+from django.core.management import call_command
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import JSONRenderer
+
+PAYLOADS = (
+    {'count': 0, 'next': None, 'previous': None, 'results': []},
+    [{'id': 1, 'name': 'Война и мир', 'rating': None, 'genre': []}],
+    {'text': 'Строка\u2028с разделителями\u2029и "кавычками"\n\t\\'},
+    {'pub_date': datetime.datetime(
+        2021, 5, 1, 10, 30, 15, 123456, tzinfo=datetime.timezone.utc
+    ), 'date': datetime.date(2021, 5, 1), 'time': datetime.time(10, 30)},
+    {'decimal': decimal.Decimal('1.5'), 'uuid': uuid.UUID(int=1),
+     'lazy': gettext_lazy('Текст'), 'set': {1}, 'bytes': b'abc'},
+    {1: 'ключ-число', 'float': 0.1, 'big': 2 ** 70, 'bool': True},
+)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20JSONRenderer:
+
+    @pytest.mark.parametrize('payload', PAYLOADS)
+    def test_01_byte_exact(self, payload):
+        from api.renderers import FastJSONRenderer
+
+        assert FastJSONRenderer().render(payload) == JSONRenderer().render(
+            payload
+        ), (
+            'Проверьте, что FastJSONRenderer выводит те же байты, что и '
+            'стандартный JSONRenderer.'
+        )
+
+    def test_02_indent_falls_back(self):
+        from api.renderers import FastJSONRenderer
+
+        media_type = 'application/json; indent=4'
+        assert FastJSONRenderer().render(
+            PAYLOADS[1], media_type
+        ) == JSONRenderer().render(PAYLOADS[1], media_type)
+
+    def test_03_api_uses_fast_renderer(self, client, admin_client):
+        from rest_framework.settings import api_settings
+
+        from api.renderers import FastJSONParser, FastJSONRenderer
+
+        assert api_settings.DEFAULT_RENDERER_CLASSES[0] is FastJSONRenderer
+        assert api_settings.DEFAULT_PARSER_CLASSES[0] is FastJSONParser
+        response = admin_client.post(
+            '/api/v1/categories/', data={'name': 'Фильм', 'slug': 'movie'},
+            format='json',
+        )
+        assert response.status_code == 201
+        response = client.get('/api/v1/categories/')
+        assert response.content == JSONRenderer().render(response.json()), (
+            'Проверьте, что ответ API совпадает с выводом JSONRenderer.'
+        )
+
+    def test_04_parser(self):
+        from rest_framework.exceptions import ParseError
+
+        from api.renderers import FastJSONParser
+
+        assert FastJSONParser().parse(
+            BytesIO('{"name": "Мир", "genre": ["drama"]}'.encode())
+        ) == {'name': 'Мир', 'genre': ['drama']}
+        for body in (b'{"name": ', b'{"score": NaN}'):
+            with pytest.raises(ParseError):
+                FastJSONParser().parse(BytesIO(body))
+
+    def test_05_invalid_json_request(self, admin_client):
+        response = admin_client.post(
+            '/api/v1/categories/', data='{"name": ',
+            content_type='application/json',
+        )
+        assert response.status_code == 400, (
+            'Проверьте, что некорректный JSON в запросе возвращает статус 400.'
+        )
+
+    def test_06_benchmark_command(self, capsys):
+        call_command('benchmark_json', titles=20, repeat=2)
+        output = capsys.readouterr().out
+        assert 'FastJSONRenderer' in output and 'Ускорение' in output
@@ -0,0 +1,116 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.fixture
+def title(admin):
+    from reviews.models import Category, Genre, Review, Title
+
+    category = Category.objects.create(name='Фильм', slug='movie')
+    genre = Genre.objects.create(name='Драма', slug='drama')
+    title = Title.objects.create(
+        name='Солярис', year=1972, category=category,
+        description='Фильм Андрея Тарковского',
+    )
+    title.genre.add(genre)
+    Review.objects.create(
+        title=title, author=admin, text='Отлично', score=9
+    )
+    return title
+
+
+def title_queries(context):
+    return [
+        query['sql'] for query in context.captured_queries
+        if '"reviews_title"' in query['sql']
+        or '"reviews_genretitle"' in query['sql']
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21SparseFields:
+    url = '/api/v1/titles/'
+
+    def test_01_title_list(self, client, title):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(self.url, {'fields': 'name, id,rating'})
+        assert response.status_code == 200
+        assert response.json()['results'] == [
+            {'id': title.id, 'name': 'Солярис', 'rating': 9}
+        ], (
+            'Проверьте, что `?fields=` оставляет в ответе только '
+            'запрошенные поля.'
+        )
+        queries = title_queries(context)
+        assert not any('"reviews_genretitle"' in sql for sql in queries), (
+            'Проверьте, что жанры не загружаются, если поле genre не '
+            'запрошено.'
+        )
+        assert not any('"description"' in sql for sql in queries), (
+            'Проверьте, что из базы читаются только колонки запрошенных '
+            'полей.'
+        )
+
+    def test_02_title_list_with_relations(self, client, title):
+        response = client.get(self.url, {'fields': 'genre,category'})
+        assert response.status_code == 200
+        assert response.json()['results'] == [{
+            'genre': [{'name': 'Драма', 'slug': 'drama'}],
+            'category': {'name': 'Фильм', 'slug': 'movie'},
+        }]
+
+    def test_03_title_detail(self, client, title):
+        url = f'{self.url}{title.id}/'
+        full = client.get(url).json()
+        response = client.get(url, {'fields': 'year,name'})
+        assert response.status_code == 200
+        assert response.json() == {'name': 'Солярис', 'year': 1972}
+        assert client.get(url).json() == full, (
+            'Проверьте, что выборочные поля не портят закешированное '
+            'произведение.'
+        )
+        assert response['ETag'] != client.get(url)['ETag']
+
+    def test_04_unknown_field(self, client, title):
+        for url in (self.url, f'{self.url}{title.id}/'):
+            response = client.get(url, {'fields': 'name,password'})
+            assert response.status_code == 400, (
+                'Проверьте, что неизвестное поле в `?fields=` возвращает '
+                'статус 400.'
+            )
+            assert 'fields' in response.json()
+
+    def test_05_reviews(self, client, title):
+        url = f'{self.url}{title.id}/reviews/'
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url, {'fields': 'author,score'})
+        assert response.status_code == 200
+        assert response.json()['results'] == [
+            {'author': 'TestAdmin', 'score': 9}
+        ]
+        assert not any(
+            '"text"' in query['sql'] for query in context.captured_queries
+            if '"reviews_review"' in query['sql']
+        ), 'Проверьте, что текст отзыва не читается, если он не запрошен.'
+        for params in ({'pagination': 'cursor', 'fields': 'id'},
+                       {'fields': 'id'}):
+            response = client.get(url, params)
+            assert response.status_code == 200
+            assert response.json()['results'] == [
+                {'id': title.reviews.get().id}
+            ]
+
+    def test_06_users(self, admin_client, title):
+        response = admin_client.get(
+            '/api/v1/users/', {'fields': 'username,role'}
+        )
+        assert response.status_code == 200
+        assert response.json()['results'] == [
+            {'username': 'TestAdmin', 'role': 'admin'}
+        ]
+        response = admin_client.get(
+            '/api/v1/users/TestAdmin/', {'fields': 'email'}
+        )
+        assert response.status_code == 200
+        assert list(response.json()) == ['email']
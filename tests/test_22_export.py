@@ -0,0 +1,98 @@
+import json
+
+import pytest
+from django.db import connection
+
+
+@pytest.fixture
+def catalogue(admin, moderator):
+    from reviews.models import Category, Genre, Review, Title
+
+    category = Category.objects.create(name='Фильм', slug='movie')
+    drama = Genre.objects.create(name='Драма', slug='drama')
+    comedy = Genre.objects.create(name='Комедия', slug='comedy')
+    titles = [
+        Title.objects.create(name=f'Фильм {number}', year=2000 + number,
+                             category=category if number % 2 else None)
+        for number in range(5)
+    ]
+    titles[0].genre.add(comedy, drama)
+    Review.objects.create(title=titles[0], author=admin, text='Да', score=7)
+    Review.objects.create(
+        title=titles[0], author=moderator, text='Нет', score=4
+    )
+    titles[0].refresh_from_db()
+    return titles
+
+
+def read_lines(response):
+    assert response.streaming, (
+        'Проверьте, что выгрузка отдаётся через StreamingHttpResponse.'
+    )
+    content = b''.join(response.streaming_content).decode()
+    assert content.endswith('\n')
+    return [json.loads(line) for line in content.splitlines()]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test22Export:
+    url = '/api/v1/export/'
+
+    def test_01_admin_only(self, client, user_client, moderator_client):
+        assert client.get(self.url).status_code == 401
+        for other in (user_client, moderator_client):
+            assert other.get(self.url).status_code == 403, (
+                'Проверьте, что выгрузка доступна только администратору.'
+            )
+
+    def test_02_titles(self, admin_client, catalogue):
+        response = admin_client.get(self.url)
+        assert response.status_code == 200
+        assert response['Content-Type'] == 'application/x-ndjson'
+        lines = read_lines(response)
+        assert [line['id'] for line in lines] == [
+            title.id for title in catalogue
+        ]
+        assert lines[0] == {
+            'type': 'title', 'id': catalogue[0].id, 'name': 'Фильм 0',
+            'year': 2000, 'rating': 5, 'description': '',
+            'genre': [{'name': 'Драма', 'slug': 'drama'},
+                      {'name': 'Комедия', 'slug': 'comedy'}],
+            'category': None,
+        }, 'Проверьте поля произведения в выгрузке.'
+        assert lines[1]['category'] == {'name': 'Фильм', 'slug': 'movie'}
+        assert lines[0] == {
+            'type': 'title',
+            **admin_client.get(f'/api/v1/titles/{catalogue[0].id}/').json()
+        }, 'Проверьте, что произведение выгружается так же, как в API.'
+
+    def test_03_reviews(self, admin_client, catalogue):
+        lines = read_lines(admin_client.get(self.url, {'reviews': 'true'}))
+        reviews = [line for line in lines if line['type'] == 'review']
+        assert len(lines) == 7 and len(reviews) == 2, (
+            'Проверьте, что с параметром `?reviews=true` в выгрузку '
+            'добавляются отзывы.'
+        )
+        api_reviews = admin_client.get(
+            f'/api/v1/titles/{catalogue[0].id}/reviews/'
+        ).json()['results']
+        assert sorted(reviews, key=lambda review: review['id']) == sorted(
+            ({'type': 'review', 'title': catalogue[0].id, **review}
+             for review in api_reviews),
+            key=lambda review: review['id'],
+        )
+
+    def test_04_batches_in_snapshot(self, admin_client, catalogue, settings):
+        settings.EXPORT_BATCH_SIZE = 2
+        response = admin_client.get(self.url)
+        chunks = iter(response.streaming_content)
+        first = next(chunks)
+        assert first.count(b'\n') == 2, (
+            'Проверьте, что выгрузка отдаётся кусками по EXPORT_BATCH_SIZE '
+            'строк.'
+        )
+        assert connection.in_atomic_block, (
+            'Проверьте, что выгрузка читается в одной транзакции.'
+        )
+        assert [chunk.count(b'\n') for chunk in chunks] == [2, 1]
+        assert not connection.in_atomic_block
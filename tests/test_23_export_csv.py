@@ -0,0 +1,147 @@
+import csv
+from datetime import datetime, timezone
+from io import StringIO
+from pathlib import Path
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from tests.test_08_import import DATA_DIR
+
+EXPORTED_FILES = (
+    'users.csv', 'category.csv', 'genre.csv', 'titles.csv',
+    'genre_title.csv', 'review.csv', 'comments.csv',
+)
+
+
+def read_csv(path):
+    with open(path, encoding='utf-8', newline='') as csv_file:
+        reader = csv.DictReader(csv_file)
+        return reader.fieldnames, list(reader)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test23ExportCSV:
+
+    def test_01_round_trip(self, tmp_path):
+        call_command('import_csv', stdout=StringIO())
+        out = StringIO()
+        call_command('export_csv', str(tmp_path), chunk_size=10, stdout=out)
+
+        for filename in EXPORTED_FILES:
+            source_columns, source_rows = read_csv(Path(DATA_DIR) / filename)
+            columns, rows = read_csv(tmp_path / filename)
+            assert columns == source_columns, (
+                'Проверьте, что `export_csv` записывает колонки в порядке '
+                f'исходного `{filename}`.'
+            )
+            assert rows == sorted(
+                source_rows, key=lambda row: int(row['id'])
+            ), (
+                f'Проверьте, что `export_csv` выгружает в `{filename}` те '
+                'же строки, что были загружены.'
+            )
+            assert f'{filename}: {len(rows)} строк' in out.getvalue()
+
+    def test_02_export_loads_back(self, tmp_path, admin):
+        from reviews.models import Category, Review, Title
+
+        title = Title.objects.create(
+            name='Солярис', year=1972,
+            category=Category.objects.create(name='Фильм', slug='movie'),
+        )
+        Title.objects.create(name='Без категории', year=2000)
+        pub_date = datetime(2021, 5, 1, 10, 30, 15, 123456,
+                            tzinfo=timezone.utc)
+        Review.objects.filter(pk=Review.objects.create(
+            title=title, author=admin, text='Строка "1"\nстрока 2', score=8
+        ).pk).update(pub_date=pub_date)
+        call_command('export_csv', str(tmp_path), stdout=StringIO())
+
+        _, reviews = read_csv(tmp_path / 'review.csv')
+        assert reviews[0]['pub_date'] == '2021-05-01T10:30:15.123456Z'
+        assert reviews[0]['text'] == 'Строка "1"\nстрока 2'
+        _, titles = read_csv(tmp_path / 'titles.csv')
+        assert titles[1]['category'] == ''
+
+        Review.objects.all().delete()
+        Title.objects.all().delete()
+        Category.objects.all().delete()
+        admin.delete()
+        call_command('import_csv', path=tmp_path, stdout=StringIO())
+        review = Review.objects.get()
+        assert (review.pub_date, review.title.name) == (pub_date, 'Солярис'), (
+            'Проверьте, что выгрузка `export_csv` загружается командой '
+            '`import_csv` без потери данных.'
+        )
+        assert Title.objects.get(name='Без категории').category is None
+
+    def test_03_parts_join_into_file(self, tmp_path):
+        from reviews.csv_export import (export_file, join_parts, pk_bounds,
+                                        table_rows, write_rows)
+        from reviews.csv_import import header
+
+        call_command('import_csv', stdout=StringIO())
+        columns = header(Path(DATA_DIR) / 'review.csv')
+        bounds = pk_bounds('review.csv', 4)
+        assert len(bounds) == 4
+        assert all(
+            end == start for (_, end), (start, _) in zip(bounds, bounds[1:])
+        ), 'Проверьте, что диапазоны id частей идут без пропусков.'
+        parts = []
+        for number, part_bounds in enumerate(bounds):
+            parts.append(tmp_path / f'review.csv.part{number}')
+            write_rows(parts[-1], table_rows(
+                'review.csv', columns, 10, part_bounds
+            ))
+        join_parts(tmp_path / 'joined.csv', columns, parts)
+        (tmp_path / 'whole').mkdir()
+        export_file(tmp_path / 'whole' / 'review.csv', columns, 10)
+        assert (tmp_path / 'joined.csv').read_bytes() == (
+            tmp_path / 'whole' / 'review.csv'
+        ).read_bytes(), (
+            'Проверьте, что файл, собранный из частей, совпадает с '
+            'выгрузкой целиком.'
+        )
+        assert not any(part.exists() for part in parts)
+
+    def test_04_refuses_source_dir(self):
+        with pytest.raises(CommandError):
+            call_command('export_csv', DATA_DIR, stdout=StringIO())
+
+    def test_05_parallel_matches_sequential(self, tmp_path, monkeypatch):
+        import sqlite3
+
+        from django.db import connection
+
+        call_command('import_csv', stdout=StringIO())
+        # Процессы пула подключаются к базе родителя заново, а тестовая
+        # база SQLite живёт в памяти процесса: процессам достаётся её копия
+        # в файле.
+        database = tmp_path / 'db.sqlite3'
+        connection.ensure_connection()
+        with sqlite3.connect(database) as copy:
+            connection.connection.backup(copy)
+        copy.close()
+        monkeypatch.setitem(connection.settings_dict, 'NAME', str(database))
+
+        call_command(
+            'export_csv', str(tmp_path / 'sequential'), chunk_size=10,
+            stdout=StringIO(),
+        )
+        out = StringIO()
+        call_command(
+            'export_csv', str(tmp_path / 'parallel'), chunk_size=10,
+            workers=2, chunks=2, stdout=out,
+        )
+        for filename in EXPORTED_FILES:
+            assert (tmp_path / 'parallel' / filename).read_bytes() == (
+                tmp_path / 'sequential' / filename
+            ).read_bytes(), (
+                'Проверьте, что параллельная выгрузка `export_csv` совпадает '
+                f'с последовательной для `{filename}`.'
+            )
+            assert f'{filename}: ' in out.getvalue()
+        assert not list((tmp_path / 'parallel').glob('*.part*')), (
+            'Проверьте, что временные части файлов удаляются.'
+        )
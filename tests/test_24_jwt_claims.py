@@ -0,0 +1,168 @@
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+def user_queries(context):
+    return [
+        query['sql'] for query in context.captured_queries
+        if 'FROM "users_user"' in query['sql']
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test24JWTClaims:
+
+    def test_01_token_carries_claims(self, client, user):
+        from users.confirmation import confirmation_codes
+        from rest_framework_simplejwt.tokens import AccessToken
+
+        response = client.post('/api/v1/auth/token/', data={
+            'username': user.username,
+            'confirmation_code': confirmation_codes.make_code(user),
+        })
+        assert response.status_code == 200
+        payload = AccessToken(response.json()['token']).payload
+        assert payload['username'] == user.username
+        assert payload['role'] == 'user' and payload['ver'] == 0, (
+            'Проверьте, что `/auth/token/` выдаёт токен с именем, ролью и '
+            'версией токенов пользователя.'
+        )
+
+    def test_02_no_user_query(self, claims_client, admin, user):
+        from reviews.models import Title
+
+        title = Title.objects.create(name='Солярис', year=1972)
+        admin_client, user_client = claims_client(admin), claims_client(user)
+        cache.clear()
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.post(
+                '/api/v1/categories/', data={'name': 'Фильм', 'slug': 'movie'}
+            )
+            assert response.status_code == 201
+            response = user_client.post(
+                f'/api/v1/titles/{title.id}/reviews/',
+                data={'text': 'Отлично', 'score': 9},
+            )
+            assert response.status_code == 201
+        assert response.json()['author'] == user.username
+        assert len(user_queries(context)) == 2, (
+            'Проверьте, что версия токенов читается из базы только при '
+            'промахе кеша.'
+        )
+        review_id = response.json()['id']
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.patch(
+                f'/api/v1/titles/{title.id}/reviews/{review_id}/',
+                data={'score': 10},
+            )
+            assert response.status_code == 200
+            assert admin_client.get('/api/v1/categories/').status_code == 200
+        assert not user_queries(context), (
+            'Проверьте, что пользователь с токеном из `/auth/token/` не '
+            'загружается из базы на каждый запрос.'
+        )
+
+    def test_03_role_change_revokes(self, claims_client, admin_client, user):
+        old_client = claims_client(user)
+        assert old_client.get('/api/v1/users/').status_code == 403
+        response = admin_client.patch(
+            f'/api/v1/users/{user.username}/', data={'role': 'admin'}
+        )
+        assert response.status_code == 200
+        assert old_client.get('/api/v1/users/').status_code == 401, (
+            'Проверьте, что смена роли сразу отзывает выданные токены.'
+        )
+        user.refresh_from_db()
+        assert claims_client(user).get('/api/v1/users/').status_code == 200
+
+    def test_04_profile_change_keeps_token(
+        self, claims_client, admin_client, user
+    ):
+        user_client = claims_client(user)
+        response = admin_client.patch(
+            f'/api/v1/users/{user.username}/', data={'bio': 'Новая'}
+        )
+        assert response.status_code == 200
+        response = user_client.get('/api/v1/users/me/')
+        assert response.status_code == 200, (
+            'Проверьте, что изменение полей, которых нет в токене, не '
+            'отзывает его.'
+        )
+        assert response.json()['bio'] == 'Новая'
+        assert response.json()['email'] == user.email
+
+    def test_05_me_patch_keeps_profile(self, claims_client, user):
+        response = claims_client(user).patch(
+            '/api/v1/users/me/', data={'first_name': 'Анна'}
+        )
+        assert response.status_code == 200
+        user.refresh_from_db()
+        assert (user.first_name, user.bio) == ('Анна', 'user bio'), (
+            'Проверьте, что `PATCH /users/me/` с токеном из утверждений '
+            'не затирает остальные поля профиля.'
+        )
+
+    def test_06_delete_and_block_revoke(
+        self, claims_client, admin_client, user, moderator
+    ):
+        user_client, moderator_client = (
+            claims_client(user), claims_client(moderator)
+        )
+        assert user_client.get('/api/v1/users/me/').status_code == 200
+        response = admin_client.delete(f'/api/v1/users/{user.username}/')
+        assert response.status_code == 204
+        assert user_client.get('/api/v1/users/me/').status_code == 401, (
+            'Проверьте, что токены удалённого пользователя отзываются.'
+        )
+        moderator.is_active = False
+        moderator.save()
+        assert moderator_client.get('/api/v1/users/me/').status_code == 401
+
+    def test_07_revocation_from_other_process(
+        self, claims_client, user, settings
+    ):
+        import time
+
+        from django.core.cache import cache
+        from django.db.models import F
+
+        from users.models import User
+
+        settings.TOKEN_VERSION_TIMEOUT = 0.2
+        cache.clear()
+        user_client = claims_client(user)
+        assert user_client.get('/api/v1/users/me/').status_code == 200
+        # Другой процесс меняет роль: версия в базе растёт, а в локальном
+        # кеше этого процесса остаётся прежней.
+        User.objects.filter(pk=user.pk).update(
+            role='admin', token_version=F('token_version') + 1
+        )
+        time.sleep(0.3)
+        assert user_client.get('/api/v1/users/me/').status_code == 401, (
+            'Проверьте, что версия токенов в кеше живёт не дольше '
+            '`TOKEN_VERSION_TIMEOUT` и отзыв из другого процесса доходит '
+            'до этого.'
+        )
+
+
+def test_versions_cache_check(settings):
+    from reviews.checks import check_versions_cache
+
+    assert [
+        message.id for message in check_versions_cache(None)
+    ] == ['reviews.W001']
+    settings.TOKEN_VERSION_TIMEOUT = None
+    assert [
+        message.id for message in check_versions_cache(None)
+    ] == ['reviews.E001'], (
+        'Проверьте, что `check --deploy` не пропускает кеш версий процесса '
+        'без таймаутов.'
+    )
+    settings.CACHES = {**settings.CACHES, 'shared': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'versions',
+    }}
+    settings.VERSIONS_CACHE = 'shared'
+    assert check_versions_cache(None) == []
@@ -0,0 +1,85 @@
+import pytest
+from django.core.management import call_command
+from rest_framework.test import APIClient
+
+
+@pytest.fixture
+def decode_calls(monkeypatch):
+    from rest_framework_simplejwt.state import token_backend
+
+    calls = []
+    decode = token_backend.decode
+
+    def counting_decode(*args, **kwargs):
+        calls.append(args)
+        return decode(*args, **kwargs)
+
+    monkeypatch.setattr(token_backend, 'decode', counting_decode)
+    return calls
+
+
+def test_lru_evicts_and_expires():
+    from api.authentication import VerifiedTokenCache
+
+    tokens = VerifiedTokenCache(2)
+    tokens.put(b'a', 100, 'A')
+    tokens.put(b'b', 100, 'B')
+    assert tokens.get(b'a', 50) == 'A'
+    tokens.put(b'c', 100, 'C')
+    assert tokens.get(b'b', 50) is None, (
+        'Проверьте, что из заполненного кеша вытесняется давно не '
+        'использованный токен.'
+    )
+    assert tokens.get(b'a', 50) == 'A' and tokens.get(b'c', 50) == 'C'
+    assert tokens.get(b'a', 100) is None, (
+        'Проверьте, что токен не берётся из кеша после времени `exp`.'
+    )
+    assert list(tokens.entries) == [b'c']
+    disabled = VerifiedTokenCache(0)
+    disabled.put(b'a', 100, 'A')
+    assert disabled.get(b'a', 50) is None
+
+
+@pytest.mark.django_db(transaction=True)
+class Test25VerifiedTokens:
+
+    def test_01_verified_once(self, claims_client, user, decode_calls):
+        client = claims_client(user)
+        for _ in range(3):
+            assert client.get('/api/v1/users/me/').status_code == 200
+        assert len(decode_calls) == 1, (
+            'Проверьте, что подпись одного и того же токена проверяется '
+            'один раз.'
+        )
+        other = claims_client(user)
+        assert other.get('/api/v1/users/me/').status_code == 200
+        assert len(decode_calls) == 2
+
+    def test_02_invalid_not_cached(self, user, decode_calls):
+        from users.tokens import UserAccessToken
+
+        token = str(UserAccessToken.for_user(user))
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {token[:-2]}xx')
+        for _ in range(2):
+            assert client.get('/api/v1/users/me/').status_code == 401
+        assert len(decode_calls) == 2
+
+    def test_03_cached_token_still_revoked(
+        self, claims_client, admin_client, user
+    ):
+        client = claims_client(user)
+        assert client.get('/api/v1/users/me/').status_code == 200
+        response = admin_client.patch(
+            f'/api/v1/users/{user.username}/', data={'role': 'moderator'}
+        )
+        assert response.status_code == 200
+        assert client.get('/api/v1/users/me/').status_code == 401, (
+            'Проверьте, что кеш проверенных токенов не мешает отзыву '
+            'токена при смене роли.'
+        )
+
+    def test_04_benchmark_command(self, capsys):
+        call_command('benchmark_auth', requests=50, repeat=2)
+        output = capsys.readouterr().out
+        assert 'мкс на запрос' in output and 'Ускорение' in output
@@ -0,0 +1,184 @@
+import smtplib
+from datetime import timedelta
+from types import SimpleNamespace
+
+import pytest
+from django.core import mail
+from django.core.management import call_command
+from django.db import transaction
+from django.utils import timezone
+
+SIGNUP = {'username': 'outbox', 'email': 'outbox@yamdb.fake'}
+
+
+@pytest.fixture
+def worker(settings):
+    settings.EMAIL_OUTBOX_WORKER = True
+    return settings
+
+
+@pytest.fixture
+def failing_backend(monkeypatch):
+    from django.core.mail.backends.locmem import EmailBackend
+
+    def send_messages(self, messages):
+        raise ConnectionError('Сервер недоступен')
+
+    monkeypatch.setattr(EmailBackend, 'send_messages', send_messages)
+
+
+@pytest.fixture
+def smtp_server(settings, monkeypatch):
+    """Почтовый сервер SMTP, считающий соединения и письма."""
+    server = SimpleNamespace(opened=0, closed=0, sent=[], failing=set())
+
+    class SMTP:
+
+        def __init__(self, host, port, **kwargs):
+            server.opened += 1
+
+        def sendmail(self, from_addr, to_addrs, message):
+            for text in server.failing:
+                if text.encode() in message:
+                    server.failing.remove(text)
+                    raise smtplib.SMTPServerDisconnected('Разрыв')
+            server.sent.append(message)
+
+        def quit(self):
+            server.closed += 1
+
+    settings.EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
+    monkeypatch.setattr(smtplib, 'SMTP', SMTP)
+    return server
+
+
+@pytest.mark.django_db(transaction=True)
+class Test26Outbox:
+
+    def test_01_signup_enqueues(self, client, worker):
+        from users.models import OutgoingEmail
+
+        response = client.post('/api/v1/auth/signup/', data=SIGNUP)
+        assert response.status_code == 200
+        assert not mail.outbox, (
+            'Проверьте, что при включённом EMAIL_OUTBOX_WORKER регистрация '
+            'не отправляет письмо сама.'
+        )
+        email = OutgoingEmail.objects.get()
+        assert email.recipient == SIGNUP['email']
+        call_command('send_outbox', once=True)
+        assert len(mail.outbox) == 1 and mail.outbox[0].body == email.body
+        assert not OutgoingEmail.objects.exists(), (
+            'Проверьте, что отправленные письма удаляются из очереди.'
+        )
+
+    def test_02_immediate_without_worker(self, client):
+        from users.models import OutgoingEmail
+
+        response = client.post('/api/v1/auth/signup/', data=SIGNUP)
+        assert response.status_code == 200
+        assert len(mail.outbox) == 1
+        assert not OutgoingEmail.objects.exists()
+
+    def test_03_rollback_sends_nothing(self):
+        from users.models import OutgoingEmail
+        from users.outbox import enqueue_email
+
+        with pytest.raises(RuntimeError):
+            with transaction.atomic():
+                enqueue_email('Тема', 'Текст', SIGNUP['email'])
+                raise RuntimeError
+        assert not mail.outbox and not OutgoingEmail.objects.exists(), (
+            'Проверьте, что письмо из откаченной транзакции не отправляется.'
+        )
+
+    def test_04_retry_with_backoff(self, worker, failing_backend):
+        from users.models import OutgoingEmail
+        from users.outbox import due_emails, enqueue_email, send_emails
+
+        worker.EMAIL_OUTBOX_RETRY_DELAY = 60
+        enqueue_email('Тема', 'Текст', SIGNUP['email'])
+        assert send_emails(due_emails()) == (0, 1)
+        email = OutgoingEmail.objects.get()
+        assert email.attempts == 1 and 'ConnectionError' in email.last_error
+        delay = email.next_attempt - timezone.now()
+        assert timedelta(seconds=50) < delay <= timedelta(seconds=60), (
+            'Проверьте, что неудачная отправка откладывается на '
+            'EMAIL_OUTBOX_RETRY_DELAY секунд.'
+        )
+        assert send_emails(due_emails()) == (0, 0)
+        OutgoingEmail.objects.update(next_attempt=timezone.now())
+        send_emails(due_emails())
+        email.refresh_from_db()
+        assert email.attempts == 2
+        assert email.next_attempt - timezone.now() > timedelta(seconds=110)
+
+    def test_05_max_attempts(self, worker):
+        from users.models import OutgoingEmail
+        from users.outbox import due_emails
+
+        OutgoingEmail.objects.create(
+            recipient=SIGNUP['email'], subject='Тема', body='Текст',
+            attempts=worker.EMAIL_OUTBOX_MAX_ATTEMPTS,
+        )
+        call_command('send_outbox', once=True)
+        assert not mail.outbox and not due_emails().exists(), (
+            'Проверьте, что письма после EMAIL_OUTBOX_MAX_ATTEMPTS попыток '
+            'больше не отправляются.'
+        )
+
+    def test_06_batches_share_connection(self, worker, smtp_server):
+        from users.models import OutgoingEmail
+        from users.outbox import enqueue_email
+
+        for number in range(5):
+            enqueue_email('Тема', f'Письмо {number}', SIGNUP['email'])
+        call_command('send_outbox', once=True, batch_size=2)
+        assert len(smtp_server.sent) == 5 and all(
+            f'Письмо {number}'.encode() in message
+            for number, message in enumerate(smtp_server.sent)
+        ), 'Проверьте, что письма отправляются в порядке очереди.'
+        assert smtp_server.opened == 1, (
+            'Проверьте, что все пачки отправляются через одно соединение с '
+            'почтовым сервером.'
+        )
+        assert smtp_server.closed == 1
+        assert not OutgoingEmail.objects.exists()
+
+    def test_07_worker_by_default(self):
+        from api_yamdb import settings as project_settings
+
+        assert project_settings.EMAIL_OUTBOX_WORKER is True, (
+            'Проверьте, что по умолчанию письма отправляет `send_outbox`, '
+            'а не запрос регистрации.'
+        )
+
+    def test_08_inline_failure_stays_queued(self, client, monkeypatch,
+                                            failing_backend):
+        from users.models import OutgoingEmail
+
+        response = client.post('/api/v1/auth/signup/', data=SIGNUP)
+        assert response.status_code == 200
+        assert OutgoingEmail.objects.get().attempts == 1
+        # Почтовый сервер снова доступен.
+        monkeypatch.undo()
+        OutgoingEmail.objects.update(next_attempt=timezone.now())
+        call_command('send_outbox', once=True)
+        assert len(mail.outbox) == 1, (
+            'Проверьте, что письмо, не отправленное из запроса, остаётся в '
+            'очереди и отправляется `send_outbox`.'
+        )
+
+    def test_09_reconnect_after_error(self, worker, smtp_server):
+        from users.models import OutgoingEmail
+        from users.outbox import due_emails, enqueue_email, send_emails
+
+        for number in range(4):
+            enqueue_email('Тема', f'Письмо {number}', SIGNUP['email'])
+        smtp_server.failing.add('Письмо 1')
+        assert send_emails(due_emails()) == (3, 1)
+        assert (smtp_server.opened, smtp_server.closed) == (2, 2), (
+            'Проверьте, что после ошибки соединение открывается заново один '
+            'раз, а не для каждого следующего письма.'
+        )
+        assert OutgoingEmail.objects.get().body == 'Письмо 1'
@@ -0,0 +1,78 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+def user_writes(context):
+    return [
+        query['sql'] for query in context.captured_queries
+        if query['sql'].startswith(('INSERT', 'UPDATE', 'DELETE'))
+        and '"users_user"' in query['sql']
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test27ConfirmationCodes:
+
+    def test_01_code_without_storage(self, client, django_user_model):
+        from users.confirmation import confirmation_codes
+
+        data = {'username': 'stateless', 'email': 'stateless@yamdb.fake'}
+        response = client.post('/api/v1/auth/signup/', data=data)
+        assert response.status_code == 200
+        with CaptureQueriesContext(connection) as context:
+            response = client.post('/api/v1/auth/signup/', data=data)
+            assert response.status_code == 200
+        assert not user_writes(context), (
+            'Проверьте, что повторная регистрация не пишет в таблицу '
+            'пользователей.'
+        )
+        user = django_user_model.objects.get(username='stateless')
+        code = confirmation_codes.make_code(user)
+        assert code == confirmation_codes.make_code(user), (
+            'Проверьте, что в одном интервале выдаётся один и тот же код.'
+        )
+        response = client.post('/api/v1/auth/token/', data={
+            'username': user.username, 'confirmation_code': code,
+        })
+        assert response.status_code == 200 and 'token' in response.json()
+
+    def test_02_codes_differ(self, user, moderator):
+        from users.confirmation import (ConfirmationCodeGenerator,
+                                        confirmation_codes)
+
+        code = confirmation_codes.make_code(user)
+        assert code != confirmation_codes.make_code(moderator)
+        assert not confirmation_codes.check_code(moderator, code)
+        assert not ConfirmationCodeGenerator('другой').check_code(user, code)
+        for wrong in (code.upper(), code[:-1], 12345, None, ''):
+            assert not confirmation_codes.check_code(user, wrong)
+
+    def test_03_timeout(self, user, settings):
+        from users.confirmation import confirmation_codes
+
+        settings.CONFIRMATION_CODE_INTERVAL = 60
+        settings.CONFIRMATION_CODE_TIMEOUT = 120
+        current = confirmation_codes.interval()
+        for age in range(3):
+            code = confirmation_codes.make_code(user, current - age)
+            assert confirmation_codes.check_code(user, code)
+        code = confirmation_codes.make_code(user, current - 3)
+        assert not confirmation_codes.check_code(user, code), (
+            'Проверьте, что код не принимается после '
+            '`CONFIRMATION_CODE_TIMEOUT`.'
+        )
+
+    def test_04_user_change_invalidates(self, user):
+        from users.confirmation import confirmation_codes
+
+        code = confirmation_codes.make_code(user)
+        user.set_password('новый-пароль')
+        assert not confirmation_codes.check_code(user, code)
+        user.refresh_from_db()
+        user.role = 'moderator'
+        user.save()
+        assert not confirmation_codes.check_code(user, code), (
+            'Проверьте, что смена роли делает выданные коды '
+            'недействительными.'
+        )
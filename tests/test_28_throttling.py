@@ -0,0 +1,142 @@
+import pytest
+from django.core import mail
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+URL_SIGNUP = '/api/v1/auth/signup/'
+URL_TOKEN = '/api/v1/auth/token/'
+
+
+def signup_data(number):
+    return {'username': f'bot{number}', 'email': f'bot{number}@yamdb.fake'}
+
+
+def test_bucket_refill():
+    from api.throttling import LocalBuckets
+
+    buckets = LocalBuckets(10)
+    assert [buckets.take('a', 2, 1, 100) for _ in range(2)] == [0, 0]
+    assert buckets.take('a', 2, 1, 100) == 1, (
+        'Проверьте, что из пустой корзины запрос отклоняется со временем '
+        'ожидания до следующего токена.'
+    )
+    assert buckets.take('a', 2, 1, 101) == 0
+    assert buckets.take('b', 2, 1, 101) == 0
+    assert [buckets.take('a', 2, 1, 200) for _ in range(2)] == [0, 0]
+    small = LocalBuckets(1)
+    small.take('a', 1, 1, 100)
+    small.take('b', 1, 1, 100)
+    assert list(small.buckets) == ['b']
+
+
+@pytest.mark.django_db(transaction=True)
+class Test28Throttling:
+
+    def test_01_ip_bucket(self, client, settings):
+        from api.throttling import rejected_counts
+
+        settings.AUTH_THROTTLE_RATES = {'ip': '3/min', 'username': None}
+        for number in range(3):
+            response = client.post(URL_SIGNUP, data=signup_data(number))
+            assert response.status_code == 200
+        with CaptureQueriesContext(connection) as context:
+            response = client.post(URL_SIGNUP, data=signup_data(3))
+        assert response.status_code == 429, (
+            'Проверьте, что сверх ёмкости корзины IP-адреса запросы '
+            'отклоняются с кодом 429.'
+        )
+        assert 0 < int(response['Retry-After']) <= 20
+        assert not context.captured_queries and len(mail.outbox) == 3, (
+            'Проверьте, что отклонённый запрос не обращается к базе и не '
+            'отправляет письмо.'
+        )
+        response = client.post(URL_TOKEN, data={
+            'username': 'bot0', 'confirmation_code': '0' * 20,
+        })
+        assert response.status_code == 429
+        assert rejected_counts() == {'ip': 2, 'username': 0}
+
+    def test_02_username_bucket(self, client, settings):
+        from api.throttling import rejected_counts
+
+        settings.AUTH_THROTTLE_RATES = {'ip': None, 'username': '2/min'}
+        data = {'username': 'victim', 'confirmation_code': '0' * 20}
+        for _ in range(2):
+            assert client.post(URL_TOKEN, data=data).status_code == 404
+        assert client.post(URL_TOKEN, data=data).status_code == 429, (
+            'Проверьте, что запросы с одним именем пользователя '
+            'ограничиваются независимо от IP-адреса.'
+        )
+        response = client.post(URL_SIGNUP, data=signup_data(1))
+        assert response.status_code == 200
+        response = client.post(
+            URL_TOKEN, data=data, REMOTE_ADDR='10.0.0.2'
+        )
+        assert response.status_code == 429
+        assert rejected_counts() == {'ip': 0, 'username': 2}
+
+    def test_03_shared_cache(self, client, settings):
+        from api.throttling import local_buckets, rejected_counts
+
+        cache.clear()
+        settings.AUTH_THROTTLE_CACHE = 'default'
+        settings.AUTH_THROTTLE_RATES = {'ip': '1/min', 'username': None}
+        try:
+            assert client.post(
+                URL_SIGNUP, data=signup_data(1)
+            ).status_code == 200
+            local_buckets.clear()
+            assert client.post(
+                URL_SIGNUP, data=signup_data(2)
+            ).status_code == 429, (
+                'Проверьте, что при заданном `AUTH_THROTTLE_CACHE` корзины '
+                'хранятся в общем кеше.'
+            )
+            assert rejected_counts() == {'ip': 1, 'username': 0}
+            assert not local_buckets.buckets
+        finally:
+            cache.clear()
+
+    def test_04_counters_endpoint(self, admin_client, user_client, settings):
+        settings.AUTH_THROTTLE_RATES = {'ip': None, 'username': '1/min'}
+        data = {'username': 'victim', 'confirmation_code': '0' * 20}
+        for _ in range(3):
+            admin_client.post(URL_TOKEN, data=data)
+        url = '/api/v1/auth/throttling/'
+        assert user_client.get(url).status_code == 403
+        response = admin_client.get(url)
+        assert response.status_code == 200
+        assert response.json() == {'rejected': {'ip': 0, 'username': 2}}
+
+    def test_05_forwarded_for_ignored(self, client, settings):
+        settings.AUTH_THROTTLE_RATES = {'ip': '3/min', 'username': None}
+        statuses = [
+            client.post(
+                URL_SIGNUP, data=signup_data(number),
+                HTTP_X_FORWARDED_FOR=f'10.0.0.{number}',
+            ).status_code
+            for number in range(5)
+        ]
+        assert statuses == [200, 200, 200, 429, 429], (
+            'Проверьте, что корзина IP-адреса не обходится подменой '
+            'заголовка `X-Forwarded-For`.'
+        )
+
+    def test_06_rejected_before_authentication(self, client, user, settings):
+        from rest_framework_simplejwt.tokens import AccessToken
+
+        settings.AUTH_THROTTLE_RATES = {'ip': '1/min', 'username': None}
+        data = {'username': user.username, 'confirmation_code': '0' * 20}
+        assert client.post(URL_TOKEN, data=data).status_code == 400
+        # Токен без утверждений пользователя проверяется чтением из базы.
+        token = AccessToken.for_user(user)
+        with CaptureQueriesContext(connection) as context:
+            response = client.post(
+                URL_TOKEN, data=data, HTTP_AUTHORIZATION=f'Bearer {token}'
+            )
+        assert response.status_code == 429
+        assert not context.captured_queries, (
+            'Проверьте, что `/auth/token/` не аутентифицирует запрос и '
+            'отклоняет его до обращений к базе.'
+        )